@@ -0,0 +1,91 @@
+"""Pre-checked copies of timeline files, cached by content hash and checker version.
+
+Every consumer of a `timeline.json` (the projector, `validate_ids`,
+`validate_provenance`) parses the whole array and runs its per-event checks
+on each invocation, although the outcome only changes when the file's bytes
+or the checks themselves change. `load_compiled` keeps each consumer's
+outcome (checked events, or the findings a validator derives from them) as
+one `marshal` blob:
+
+	<cache_dir>/source.json                      mtime/size → content digest (skip re-hashing)
+	<cache_dir>/<digest>.<name>-v<version>.ctl   the compiled result
+
+A hit is one read plus one `marshal.loads`: no JSON parse and no checks. Any
+edit to the timeline changes the digest and bumping a consumer's *version*
+changes the file name, so neither can be served a stale result. Only plain
+data (dicts, lists, tuples, strings, numbers, booleans, None) can be stored.
+"""
+
+from __future__ import annotations
+
+import gc
+import marshal
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar, Union
+
+from core.validation_manifest import cached_file_digest
+
+FORMAT_VERSION = 1
+# marshal's format is only stable within one interpreter version, so that is part of the header.
+HEADER = f"PHICTL {FORMAT_VERSION} {sys.implementation.cache_tag} {marshal.version}\n".encode("ascii")
+SUFFIX = ".ctl"
+
+T = TypeVar("T")
+
+
+def compiled_cache_dir(cache_root: Path, timeline: Path) -> Path:
+	"""Cache directory for *timeline*: `characters/<slug>/timeline.json` → `<cache_root>/<slug>`."""
+	return Path(cache_root) / (timeline.parent.name if timeline.name == "timeline.json" else timeline.stem)
+
+
+def _decode(data: bytes) -> Any:
+	if not data.startswith(HEADER):
+		raise ValueError("compiled timeline was written by another format or interpreter version")
+	# A large timeline is one allocation burst of containers; cyclic GC passes during it are pure overhead.
+	enabled = gc.isenabled()
+	gc.disable()
+	try:
+		return marshal.loads(memoryview(data)[len(HEADER) :])
+	except (EOFError, TypeError) as exc:
+		raise ValueError(f"compiled timeline is truncated or corrupt ({exc})") from None
+	finally:
+		if enabled:
+			gc.enable()
+
+
+def load_compiled(
+	timeline: Path, cache_dir: Path, *, name: str, version: Union[int, str], compile: Callable[[], T]
+) -> T:
+	"""*compile()*'s result for *timeline* as it is on disk now, from the cache when possible.
+
+	A result derived from another consumer's checks should fold that checker's
+	version into its own (e.g. ``"1.3"``) so bumping either one invalidates it.
+
+	On a miss (or an unreadable cached copy) *compile* runs and its result is
+	written atomically; older copies for the same *name* are removed. If
+	*compile* raises, nothing is cached and the exception propagates.
+	"""
+	digest = cached_file_digest(timeline, cache_dir / "source.json")
+	target = cache_dir / f"{digest}.{name}-v{version}{SUFFIX}"
+	if target.exists():
+		try:
+			return _decode(target.read_bytes())
+		except ValueError:
+			pass  # rebuilt below
+	value = compile()
+	descriptor, temp_name = tempfile.mkstemp(prefix=".temp.", dir=cache_dir)
+	try:
+		with os.fdopen(descriptor, "wb") as handle:
+			handle.write(HEADER)
+			handle.write(marshal.dumps(value))
+		os.replace(temp_name, target)
+	finally:
+		Path(temp_name).unlink(missing_ok=True)
+	for stale in cache_dir.glob(f"*.{name}-v*{SUFFIX}"):
+		if stale != target:
+			stale.unlink(missing_ok=True)
+	return value
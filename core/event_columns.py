@@ -0,0 +1,253 @@
+"""Columnar, array-backed copy of a character `timeline.json`.
+
+Each event becomes one row across a handful of `array` columns:
+
+* `scene` / `clock`: packed book scene and epistemic scene (`scene_key`)
+* `order`: the event's `order`
+* `type`: code into the interned `types` table
+* `node` / `skill` / `from_node` / `to_node`: codes into the interned `nodes` table (-1 when absent)
+* `payload_offsets`: row offsets into `payloads`, the side table holding each event's full JSON
+
+Filters such as "all `skill_evolved` events for `sn.meditation.*` between two
+scenes" run over the integer columns (prefixes are matched once per distinct
+node, not once per event) and decode only the payloads of matching rows.
+
+`load_columns` keeps a binary copy under a cache directory, keyed by the
+timeline's content digest and the caller's checker version, so later runs
+skip JSON parsing and per-event checks entirely.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from core import json_codec
+from core.validation_manifest import cached_file_digest
+
+FORMAT_VERSION = 1
+MAGIC = b"PHIEVC\n"
+CACHE_SUFFIX = ".evc"
+NO_NODE = -1
+NODE_COLUMNS = ("node", "skill", "from_node", "to_node")
+INT_COLUMNS = ("scene", "clock", "order", "type", *NODE_COLUMNS, "by_scene", "by_clock")
+SCENE_ID = re.compile(r"[0-9]{2}\.[0-9]{2}\.[0-9]{2}")
+
+
+@lru_cache(maxsize=None)  # a book has far fewer scenes than events, so the format check runs once per scene
+def scene_key(scene_id: str) -> int:
+	"""`BB.CC.SS` → packed int (`BB<<16 | CC<<8 | SS`); orders exactly like the dotted string.
+
+	Raises ValueError for anything else, which would otherwise pack to a wrong key or fail obscurely.
+	"""
+	if not (isinstance(scene_id, str) and SCENE_ID.fullmatch(scene_id)):
+		raise ValueError(f"scene id must be BB.CC.SS, got {scene_id!r}")
+	return int(scene_id[0:2]) << 16 | int(scene_id[3:5]) << 8 | int(scene_id[6:8])
+
+
+class EventColumns:
+	"""Timeline events as parallel integer columns plus a payload side table."""
+
+	def __init__(
+		self,
+		columns: dict[str, array],
+		*,
+		event_ids: list[str],
+		types: list[str],
+		nodes: list[str],
+		payload_offsets: array,
+		payloads: bytes,
+	) -> None:
+		self.columns = columns
+		self.event_ids = event_ids
+		self.types = types
+		self.nodes = nodes
+		self.payload_offsets = payload_offsets
+		self.payloads = payloads
+		self._sorted_keys: dict[str, array] = {}
+
+	def __len__(self) -> int:
+		return len(self.event_ids)
+
+	@classmethod
+	def from_events(cls, events: Iterable[dict[str, Any]]) -> "EventColumns":
+		"""Build columns from already-checked events (file order is kept as row order)."""
+		columns = {name: array("i") for name in INT_COLUMNS[:-2]}
+		event_ids: list[str] = []
+		type_codes: dict[str, int] = {}
+		node_codes: dict[str, int] = {}
+		offsets, chunks, total = array("q", [0]), [], 0
+
+		def node_code(value: Any) -> int:
+			if not isinstance(value, str) or not value:
+				return NO_NODE
+			return node_codes.setdefault(value, len(node_codes))
+
+		for event in events:
+			scene_id = event["scene_id"]
+			epistemic = (event.get("epistemic_at") or {}).get("scene_id") or scene_id
+			columns["scene"].append(scene_key(scene_id))
+			columns["clock"].append(scene_key(epistemic))
+			columns["order"].append(event["order"])
+			columns["type"].append(type_codes.setdefault(event.get("type") or "", len(type_codes)))
+			for name in NODE_COLUMNS:
+				columns[name].append(node_code(event.get(f"{name}_id")))
+			event_ids.append(event["event_id"])
+			chunk = json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+			chunks.append(chunk)
+			total += len(chunk)
+			offsets.append(total)
+
+		for name, key_column in (("by_scene", "scene"), ("by_clock", "clock")):
+			keys, order = columns[key_column], columns["order"]
+			columns[name] = array("i", sorted(range(len(event_ids)), key=lambda i: (keys[i], order[i], event_ids[i])))
+		return cls(
+			columns,
+			event_ids=event_ids,
+			types=list(type_codes),
+			nodes=list(node_codes),
+			payload_offsets=offsets,
+			payloads=b"".join(chunks),
+		)
+
+	# ----- rows -----
+
+	def event(self, row: int) -> dict[str, Any]:
+		"""Decode one row's full event from the payload side table."""
+		return json_codec.loads(self.payloads[self.payload_offsets[row] : self.payload_offsets[row + 1]])
+
+	def events(self, rows: Iterable[int]) -> list[dict[str, Any]]:
+		return [self.event(row) for row in rows]
+
+	def order(self, view: str = "reader") -> array:
+		"""Rows sorted by (scene, order, event_id); `view="character"` sorts on the epistemic clock."""
+		return self.columns["by_clock" if view == "character" else "by_scene"]
+
+	def sorted_keys(self, view: str = "reader") -> array:
+		"""Packed scene keys in `order(view)` order (ascending, for bisecting)."""
+		if view not in self._sorted_keys:
+			keys = self.columns["clock" if view == "character" else "scene"]
+			self._sorted_keys[view] = array("i", [keys[row] for row in self.order(view)])
+		return self._sorted_keys[view]
+
+	def select(
+		self,
+		*,
+		types: Optional[Iterable[str]] = None,
+		node_prefix: Optional[str] = None,
+		first: Optional[str] = None,
+		last: Optional[str] = None,
+		view: str = "reader",
+	) -> list[int]:
+		"""Rows (in `view` order) matching every given filter.
+
+		*first*/*last* bound the view's clock (inclusive) by bisecting the sorted
+		keys; *types* and *node_prefix* are resolved to code sets once and then
+		tested per row. A prefix matches any of `node_id`, `skill_id`,
+		`from_node_id` or `to_node_id`.
+		"""
+		keys = self.sorted_keys(view)
+		start = bisect_left(keys, scene_key(first)) if first else 0
+		stop = bisect_right(keys, scene_key(last)) if last else len(keys)
+		rows: Sequence[int] = self.order(view)[start:stop]
+		if types is not None:
+			wanted = set(types)
+			codes = {code for code, name in enumerate(self.types) if name in wanted}
+			type_column = self.columns["type"]
+			rows = [row for row in rows if type_column[row] in codes]
+		if node_prefix is not None:
+			codes = {code for code, node in enumerate(self.nodes) if node.startswith(node_prefix)}
+			node_columns = [self.columns[name] for name in NODE_COLUMNS]
+			rows = [row for row in rows if any(column[row] in codes for column in node_columns)]
+		return list(rows)
+
+	# ----- binary form -----
+
+	def to_bytes(self) -> bytes:
+		blobs = [self.columns[name].tobytes() for name in INT_COLUMNS]
+		blobs.append(self.payload_offsets.tobytes())
+		header = {
+			"version": FORMAT_VERSION,
+			"byteorder": sys.byteorder,
+			"rows": len(self),
+			"event_ids": self.event_ids,
+			"types": self.types,
+			"nodes": self.nodes,
+			"columns": [[name, self.columns[name].typecode, len(blob)] for name, blob in zip(INT_COLUMNS, blobs)]
+			+ [["payload_offsets", self.payload_offsets.typecode, len(blobs[-1])]],
+		}
+		encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+		return b"".join([MAGIC, len(encoded).to_bytes(8, "little"), encoded, *blobs, self.payloads])
+
+	@classmethod
+	def from_bytes(cls, data: bytes) -> "EventColumns":
+		"""Inverse of `to_bytes`; raises `ValueError` for foreign, stale or truncated data."""
+		if not data.startswith(MAGIC):
+			raise ValueError("not an event column file")
+		start = len(MAGIC) + 8
+		end = start + int.from_bytes(data[len(MAGIC) : start], "little")
+		header = json_codec.loads(data[start:end])
+		if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+			raise ValueError("event column file was written by another format version or platform")
+		columns: dict[str, array] = {}
+		for name, typecode, size in header["columns"]:
+			column = array(typecode)
+			column.frombytes(data[end : end + size])
+			columns[name] = column
+			end += size
+		offsets = columns.pop("payload_offsets")
+		payloads = data[end:]
+		if len(offsets) != header["rows"] + 1 or len(payloads) != offsets[-1]:
+			raise ValueError("event column file is truncated")
+		return cls(
+			columns,
+			event_ids=header["event_ids"],
+			types=header["types"],
+			nodes=header["nodes"],
+			payload_offsets=offsets,
+			payloads=payloads,
+		)
+
+
+def load_columns(
+	timeline: Path,
+	cache_dir: Path,
+	read_events: Callable[[], Iterable[dict[str, Any]]],
+	*,
+	version: Union[int, str],
+) -> EventColumns:
+	"""Columns for *timeline*, from `cache_dir/<digest>-v<version>.evc` when it matches the file's content.
+
+	*version* is that of the checks *read_events* applies; bump it whenever they
+	change so columns built under the old checks are not reused. On a miss,
+	*read_events* (which should check each event) is consumed, the binary copy
+	is written atomically and older copies are removed.
+	"""
+	digest = cached_file_digest(timeline, cache_dir / "source.json")
+	target = cache_dir / f"{digest}-v{version}{CACHE_SUFFIX}"
+	if target.exists():
+		try:
+			return EventColumns.from_bytes(target.read_bytes())
+		except ValueError:
+			pass  # rebuilt below
+	columns = EventColumns.from_events(read_events())
+	descriptor, temp_name = tempfile.mkstemp(prefix=".temp.", dir=cache_dir)
+	try:
+		with os.fdopen(descriptor, "wb") as handle:
+			handle.write(columns.to_bytes())
+		os.replace(temp_name, target)
+	finally:
+		Path(temp_name).unlink(missing_ok=True)
+	for stale in cache_dir.glob(f"*{CACHE_SUFFIX}"):
+		if stale != target:
+			stale.unlink(missing_ok=True)
+	return columns
@@ -0,0 +1,203 @@
+"""Change detection for long-running tools (inotify on Linux, polling elsewhere).
+
+`open_watcher(roots)` returns an object whose `wait(timeout)` blocks until one
+or more matching files under *roots* change and returns their paths. The
+inotify backend is driven through `ctypes`, so no third-party package is
+required; when inotify is unavailable (non-Linux, exhausted watch limits) a
+polling backend compares `mtime_ns`/size snapshots instead.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional, Protocol
+
+DEFAULT_SUFFIX = ".json"
+DEFAULT_POLL_INTERVAL = 0.5
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Watcher(Protocol):
+	def wait(self, timeout: Optional[float] = None) -> set[Path]: ...
+
+	def close(self) -> None: ...
+
+
+def _iter_directories(roots: Iterable[Path]) -> Iterable[Path]:
+	for root in roots:
+		if not root.is_dir():
+			continue
+		yield root
+		for dirpath, dirnames, _ in os.walk(root):
+			dirnames.sort()
+			for name in dirnames:
+				yield Path(dirpath) / name
+
+
+class PollingWatcher:
+	"""Portable fallback: rescan *roots* every *interval* seconds and diff file signatures."""
+
+	def __init__(
+		self, roots: Iterable[Path], *, suffix: str = DEFAULT_SUFFIX, interval: float = DEFAULT_POLL_INTERVAL
+	) -> None:
+		self.roots = [Path(root) for root in roots]
+		self.suffix = suffix
+		self.interval = interval
+		self._snapshot = self._scan()
+
+	def _scan(self) -> dict[Path, tuple[int, int]]:
+		snapshot: dict[Path, tuple[int, int]] = {}
+		for directory in _iter_directories(self.roots):
+			try:
+				entries = list(os.scandir(directory))
+			except FileNotFoundError:
+				continue
+			for entry in entries:
+				if entry.name.endswith(self.suffix) and entry.is_file():
+					try:
+						stat = entry.stat()
+					except FileNotFoundError:
+						continue
+					snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+		return snapshot
+
+	def poll(self) -> set[Path]:
+		current = self._scan()
+		previous, self._snapshot = self._snapshot, current
+		changed = {path for path, signature in current.items() if previous.get(path) != signature}
+		changed.update(path for path in previous if path not in current)
+		return changed
+
+	def wait(self, timeout: Optional[float] = None) -> set[Path]:
+		deadline = None if timeout is None else time.monotonic() + timeout
+		while True:
+			changed = self.poll()
+			if changed:
+				return changed
+			remaining = None if deadline is None else deadline - time.monotonic()
+			if remaining is not None and remaining <= 0:
+				return set()
+			time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+	def close(self) -> None:
+		self._snapshot = {}
+
+
+class InotifyWatcher:
+	"""Recursive inotify watch over *roots* (Linux only)."""
+
+	def __init__(self, roots: Iterable[Path], *, suffix: str = DEFAULT_SUFFIX) -> None:
+		library = ctypes.util.find_library("c")
+		if library is None:
+			raise OSError("libc not found")
+		self._libc = ctypes.CDLL(library, use_errno=True)
+		if not hasattr(self._libc, "inotify_init1"):
+			raise OSError("inotify is not available on this platform")
+		self.suffix = suffix
+		self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+		if self._fd < 0:
+			raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+		self._directories: dict[int, Path] = {}
+		try:
+			for directory in _iter_directories(Path(root) for root in roots):
+				self._add_watch(directory)
+		except OSError:
+			self.close()
+			raise
+
+	def _add_watch(self, directory: Path) -> None:
+		descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+		if descriptor < 0:
+			raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+		self._directories[descriptor] = directory
+
+	def _read_events(self) -> tuple[set[Path], bool]:
+		changed: set[Path] = set()
+		overflowed = False
+		while True:
+			try:
+				payload = os.read(self._fd, 64 * 1024)
+			except BlockingIOError:
+				return changed, overflowed
+			offset = 0
+			while offset < len(payload):
+				descriptor, mask, _cookie, length = _EVENT_HEADER.unpack_from(payload, offset)
+				offset += _EVENT_HEADER.size
+				name = payload[offset : offset + length].rstrip(b"\0")
+				offset += length
+				if mask & IN_Q_OVERFLOW:
+					overflowed = True
+					continue
+				directory = self._directories.get(descriptor)
+				if mask & IN_IGNORED:
+					self._directories.pop(descriptor, None)
+					continue
+				if directory is None or not name:
+					continue
+				path = directory / os.fsdecode(name)
+				if mask & IN_ISDIR:
+					if mask & (IN_CREATE | IN_MOVED_TO):
+						# New directory: watch it and report whatever already landed inside.
+						for subdirectory in _iter_directories([path]):
+							self._add_watch(subdirectory)
+						changed.update(child for child in path.rglob(f"*{self.suffix}"))
+					continue
+				# Files are reported once written or renamed into place, not on creation.
+				if path.name.endswith(self.suffix) and not mask & IN_CREATE:
+					changed.add(path)
+
+	def wait(self, timeout: Optional[float] = None) -> set[Path]:
+		"""Block until matching files change; an empty set means the timeout expired.
+
+		A kernel queue overflow is reported as every watched directory, so the
+		caller re-checks everything rather than missing an edit.
+		"""
+		readable, _, _ = select.select([self._fd], [], [], timeout)
+		if not readable:
+			return set()
+		changed, overflowed = self._read_events()
+		if overflowed:
+			changed = {path for directory in self._directories.values() for path in directory.glob(f"*{self.suffix}")}
+		return changed
+
+	def close(self) -> None:
+		if self._fd >= 0:
+			os.close(self._fd)
+			self._fd = -1
+
+
+def open_watcher(
+	roots: Iterable[Path],
+	*,
+	suffix: str = DEFAULT_SUFFIX,
+	poll_interval: float = DEFAULT_POLL_INTERVAL,
+	force_polling: bool = False,
+) -> Watcher:
+	"""Return an inotify watcher when the platform supports it, else a polling one."""
+	roots = [Path(root) for root in roots]
+	if not force_polling:
+		try:
+			return InotifyWatcher(roots, suffix=suffix)
+		except (OSError, AttributeError):
+			pass
+	return PollingWatcher(roots, suffix=suffix, interval=poll_interval)
@@ -0,0 +1,210 @@
+"""Opt-in per-phase timing and I/O counters for tools (`--profile`, `--metrics-out`).
+
+A tool wraps its work in `session(...)` and its stages in `phase("name")`.
+While a session is active, shared readers (`schema_utils.read_json`,
+`json_stream.iter_json_array`, validator compilation) report files read, bytes
+read, JSON parse time and validator build time into every open phase. With
+no active session `phase` is a shared no-op context and the hooks cost one
+global lookup, so uninstrumented runs are unaffected.
+
+Phases nest; nested phases are reported as `outer/inner` and their numbers
+are included in the outer phase. Re-entering a phase name (e.g. one phase per
+query) accumulates into the same entry and bumps its `calls` count. With
+`--profile` (or `--profile-out DIR`), every top-level phase also runs under
+`cProfile` and is dumped to `DIR/<tool>.<phase>.pstats`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Optional
+
+try:
+	import resource
+except ModuleNotFoundError:  # pragma: no cover - Windows
+	resource = None  # type: ignore[assignment]
+
+from core.io_safe import REPO_ROOT, write_json_atomic
+
+DEFAULT_PROFILE_DIR = REPO_ROOT / ".cache" / "profiles"
+COUNTERS = ("files_read", "bytes_read", "json_parse_s", "validators_built", "validator_build_s")
+
+_ACTIVE: Optional["Metrics"] = None
+_NO_PHASE = nullcontext()
+
+
+def peak_rss_mib() -> Optional[float]:
+	"""Peak resident set size of this process so far, in MiB (None where unavailable)."""
+	if resource is None:
+		return None
+	max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# ru_maxrss is KiB on Linux and bytes on macOS.
+	return round(max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024, 1)
+
+
+class Metrics:
+	"""Counters and phase timings for one tool run."""
+
+	def __init__(self, tool: str, *, profile_dir: Optional[Path] = None) -> None:
+		self.tool = tool
+		self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+		self.started_at = datetime.now(timezone.utc)
+		self._wall_start = time.perf_counter()
+		self._cpu_start = time.process_time()
+		self.totals: dict[str, float] = dict.fromkeys(COUNTERS, 0)
+		self.phases: dict[str, dict[str, Any]] = {}
+		self._open: list[dict[str, Any]] = []
+		self._profilers: dict[str, cProfile.Profile] = {}
+
+	def add(self, **amounts: float) -> None:
+		"""Add to the run totals and to every currently open phase."""
+		for name, amount in amounts.items():
+			self.totals[name] += amount
+			for entry in self._open:
+				entry[name] += amount
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[dict[str, Any]]:
+		path = "/".join([*(entry["name"] for entry in self._open), name])
+		entry = self.phases.get(path)
+		if entry is None:
+			entry = {"name": path, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, **dict.fromkeys(COUNTERS, 0)}
+			self.phases[path] = entry
+		entry["calls"] += 1
+		# cProfile cannot nest, so only top-level phases are profiled.
+		profiler = self._profiler(path) if not self._open and self.profile_dir is not None else None
+		self._open.append(entry)
+		wall_start, cpu_start = time.perf_counter(), time.process_time()
+		if profiler is not None:
+			profiler.enable()
+		try:
+			yield entry
+		finally:
+			if profiler is not None:
+				profiler.disable()
+			entry["wall_s"] += time.perf_counter() - wall_start
+			entry["cpu_s"] += time.process_time() - cpu_start
+			entry["peak_rss_mib"] = peak_rss_mib()
+			self._open.pop()
+
+	def _profiler(self, path: str) -> cProfile.Profile:
+		if path not in self._profilers:
+			self._profilers[path] = cProfile.Profile()
+		return self._profilers[path]
+
+	def dump_profiles(self) -> dict[str, str]:
+		"""Write one `.pstats` file per profiled phase; return phase → file path."""
+		if self.profile_dir is None:
+			return {}
+		self.profile_dir.mkdir(parents=True, exist_ok=True)
+		written = {}
+		for path, profiler in self._profilers.items():
+			target = self.profile_dir / f"{self.tool}.{path.replace('/', '.')}.pstats"
+			profiler.dump_stats(str(target))
+			written[path] = str(target)
+		return written
+
+	def report(self) -> dict[str, Any]:
+		profiles = self.dump_profiles()
+		phases = []
+		for path, entry in self.phases.items():
+			phase = {key: round(value, 6) if isinstance(value, float) else value for key, value in entry.items()}
+			if path in profiles:
+				phase["profile"] = profiles[path]
+			phases.append(phase)
+		return {
+			"tool": self.tool,
+			"argv": sys.argv[1:],
+			"started_at": self.started_at.isoformat(timespec="seconds"),
+			"wall_s": round(time.perf_counter() - self._wall_start, 6),
+			"cpu_s": round(time.process_time() - self._cpu_start, 6),
+			"peak_rss_mib": peak_rss_mib(),
+			"totals": {key: round(value, 6) if isinstance(value, float) else value for key, value in self.totals.items()},
+			"phases": phases,
+		}
+
+
+def active() -> Optional[Metrics]:
+	return _ACTIVE
+
+
+def phase(name: str) -> ContextManager[Any]:
+	"""Time *name* in the active session (a no-op when no session is active)."""
+	return _ACTIVE.phase(name) if _ACTIVE is not None else _NO_PHASE
+
+
+def record_read(nbytes: int, parse_seconds: float = 0.0) -> None:
+	"""Count one file read (and the time spent parsing it) in the active session."""
+	if _ACTIVE is not None:
+		_ACTIVE.add(files_read=1, bytes_read=nbytes, json_parse_s=parse_seconds)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+	group = parser.add_argument_group("instrumentation")
+	group.add_argument(
+		"--metrics-out",
+		type=Path,
+		default=None,
+		metavar="PATH",
+		help="Write per-phase wall/CPU time, I/O counters and peak RSS to PATH as JSON.",
+	)
+	group.add_argument(
+		"--profile",
+		action="store_true",
+		help=f"Print a phase summary and dump cProfile stats per phase into {DEFAULT_PROFILE_DIR}.",
+	)
+	group.add_argument(
+		"--profile-out",
+		type=Path,
+		default=None,
+		metavar="DIR",
+		help="Like --profile, but dump the cProfile stats into DIR.",
+	)
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+	totals = report["totals"]
+	print(
+		f"⏱️  {report['tool']}: {report['wall_s']:.3f}s wall, {report['cpu_s']:.3f}s CPU, "
+		f"{totals['files_read']} file(s) / {totals['bytes_read'] / 1024:.1f} KiB read, "
+		f"parse {totals['json_parse_s']:.3f}s, {totals['validators_built']} validator(s) "
+		f"built in {totals['validator_build_s']:.3f}s, peak RSS {report['peak_rss_mib']} MiB",
+		file=sys.stderr,
+	)
+	for entry in report["phases"]:
+		print(
+			f"   {entry['name']:<28} {entry['wall_s']:>9.3f}s wall {entry['cpu_s']:>9.3f}s CPU "
+			f"{entry['files_read']:>7} file(s) x{entry['calls']}",
+			file=sys.stderr,
+		)
+
+
+@contextmanager
+def session(tool: str, args: argparse.Namespace) -> Iterator[Optional[Metrics]]:
+	"""Activate instrumentation for the duration of a tool run when the CLI asked for it."""
+	global _ACTIVE
+	metrics_out = getattr(args, "metrics_out", None)
+	profile_dir = getattr(args, "profile_out", None)
+	if profile_dir is None and getattr(args, "profile", False):
+		profile_dir = DEFAULT_PROFILE_DIR
+	if metrics_out is None and profile_dir is None:
+		yield None
+		return
+	previous, _ACTIVE = _ACTIVE, Metrics(tool, profile_dir=profile_dir)
+	metrics = _ACTIVE
+	try:
+		yield metrics
+	finally:
+		_ACTIVE = previous
+		report = metrics.report()
+		if metrics_out is not None:
+			write_json_atomic(metrics_out, report)
+		if profile_dir is not None:
+			_print_summary(report)
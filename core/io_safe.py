@@ -7,6 +7,8 @@ import tempfile
 from pathlib import Path
 from typing import Any, Optional, Union
 
+from core import json_codec
+
 
 def open_directory_descriptor(path: Path) -> int:
 	"""Return an open dir fd for fsync; caller must close."""
@@ -28,7 +30,7 @@ def write_json_atomic(
 	path: Target file path.
 	data: JSON-serialisable payload.
 	backup: When True, keep a timestamp-less `.bak` copy of the previous file.
-	ensure_ascii: Pass-through to `json.dump`.
+	ensure_ascii: Pass-through to `json_codec.dump` (same semantics as `json.dump`).
 	indent: Indentation applied to the serialised JSON payload.
 	"""
 	path = Path(path)
@@ -41,7 +43,7 @@ def write_json_atomic(
 		temp_file_descriptor, temp_name = tempfile.mkstemp(prefix=".temp.", dir=path.parent)
 		temp_path = Path(temp_name)
 		with os.fdopen(temp_file_descriptor, "w", encoding="utf-8", newline="") as temp_file_handle:
-			json.dump(data, temp_file_handle, indent=indent, ensure_ascii=ensure_ascii)
+			json_codec.dump(data, temp_file_handle, indent=indent, ensure_ascii=ensure_ascii)
 			temp_file_handle.flush()
 			os.fsync(temp_file_handle.fileno())
 			# file descriptor is closed by context manager; mark descriptor as handled
@@ -85,3 +87,199 @@ def write_json_atomic_safe(
 	schema = load_schema(schema_path)
 	validate_instance(data, schema)
 	write_json_atomic(path, data, backup=backup, ensure_ascii=ensure_ascii, indent=indent)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WRITE_JOURNAL_DIR = REPO_ROOT / ".cache" / "write_journal"
+JOURNAL_COMMIT_MARKER = {"state": "committing"}
+
+
+def _fsync_directories(directories: set[Path]) -> None:
+	for directory in sorted(directories):
+		directory_descriptor = open_directory_descriptor(directory)
+		try:
+			os.fsync(directory_descriptor)
+		finally:
+			os.close(directory_descriptor)
+
+
+def _read_journal(journal_path: Path) -> tuple[list[dict[str, str]], bool]:
+	"""Return (staged entries, commit marker present); a torn trailing line is ignored."""
+	entries: list[dict[str, str]] = []
+	committing = False
+	with journal_path.open(encoding="utf-8") as journal_handle:
+		for line in journal_handle:
+			try:
+				record = json.loads(line)
+			except json.JSONDecodeError:
+				break
+			if record == JOURNAL_COMMIT_MARKER:
+				committing = True
+			elif isinstance(record, dict) and "target" in record and "temp" in record:
+				entries.append(record)
+	return entries, committing
+
+
+def _replay_journal(journal_path: Path) -> str:
+	"""Finish or undo one interrupted batch; return "forward" or "back"."""
+	entries, committing = _read_journal(journal_path)
+	if committing:
+		# Every temp file was fsynced before the marker was written: finish the renames.
+		for entry in entries:
+			temp_path = Path(entry["temp"])
+			if temp_path.exists():
+				os.replace(temp_path, entry["target"])
+		_fsync_directories({Path(entry["target"]).parent for entry in entries})
+		outcome = "forward"
+	else:
+		for entry in entries:
+			Path(entry["temp"]).unlink(missing_ok=True)
+		outcome = "back"
+	journal_path.unlink(missing_ok=True)
+	return outcome
+
+
+def _journal_owner_alive(journal_path: Path) -> bool:
+	"""Journals are named `<pid>-<id>.jsonl`; leave those of running processes alone."""
+	try:
+		pid = int(journal_path.name.split("-", 1)[0])
+	except ValueError:
+		return False
+	if pid == os.getpid():
+		return True
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:
+		return True
+	return True
+
+
+def recover_write_journals(journal_dir: Union[str, Path] = WRITE_JOURNAL_DIR) -> dict[str, str]:
+	"""Roll interrupted `WriteBatch` commits forward (or merely staged ones back).
+
+	Returns a mapping of journal file name → "forward" / "back". Journals owned
+	by a live process are skipped. Safe to call repeatedly; `WriteBatch` calls
+	it before starting a new batch.
+	"""
+	journal_dir = Path(journal_dir)
+	if not journal_dir.is_dir():
+		return {}
+	return {
+		journal_path.name: _replay_journal(journal_path)
+		for journal_path in sorted(journal_dir.glob("*.jsonl"))
+		if not _journal_owner_alive(journal_path)
+	}
+
+
+class WriteBatch:
+	"""Stage several JSON writes and publish them together.
+
+	Usage:
+		with WriteBatch() as batch:
+			batch.write_json(skills_path, skills)
+			batch.write_json(timeline_path, timeline)
+
+	Payloads are written to temp files next to their targets while staging,
+	and each temp file is appended to a journal. On a clean exit the temp
+	files are fsynced as a group, a commit marker is made durable, every temp
+	file is renamed into place and each touched directory is fsynced once —
+	N + D + 2 fsyncs instead of 2 × N. If the block raises, nothing is
+	renamed. A crash mid-rename is rolled forward by `recover_write_journals`
+	on the next start; a crash while staging is rolled back.
+	"""
+
+	def __init__(self, journal_dir: Union[str, Path] = WRITE_JOURNAL_DIR) -> None:
+		self.journal_dir = Path(journal_dir)
+		self.journal_path = self.journal_dir / f"{os.getpid()}-{id(self):x}.jsonl"
+		self._journal_handle: Optional[Any] = None
+		self._entries: dict[Path, Path] = {}
+		self._backups: list[Path] = []
+		self.committed = False
+
+	def __enter__(self) -> "WriteBatch":
+		recover_write_journals(self.journal_dir)
+		return self
+
+	def __exit__(self, exc_type, exc, traceback) -> None:
+		if exc_type is None:
+			self.commit()
+		else:
+			self.rollback()
+
+	def _journal(self, record: dict[str, str]) -> None:
+		if self._journal_handle is None:
+			self.journal_dir.mkdir(parents=True, exist_ok=True)
+			self._journal_handle = self.journal_path.open("a", encoding="utf-8")
+		self._journal_handle.write(json.dumps(record) + "\n")
+		self._journal_handle.flush()
+
+	def _close_journal(self) -> None:
+		if self._journal_handle is not None:
+			self._journal_handle.close()
+			self._journal_handle = None
+		self.journal_path.unlink(missing_ok=True)
+
+	def write_json(
+		self,
+		path: Union[str, Path],
+		data: Any,
+		*,
+		backup: bool = False,
+		ensure_ascii: bool = False,
+		indent: Union[int, str] = "\t",
+	) -> None:
+		"""Stage *data* for *path*; arguments match `write_json_atomic`. Later writes to a path win."""
+		if self.committed:
+			raise RuntimeError("WriteBatch already committed")
+		target = Path(path).absolute()
+		target.parent.mkdir(parents=True, exist_ok=True)
+		temp_file_descriptor, temp_name = tempfile.mkstemp(prefix=".temp.", dir=target.parent)
+		temp_path = Path(temp_name)
+		previous_temp = self._entries.pop(target, None)
+		self._entries[target] = temp_path
+		# Journal the temp before filling it so an interrupted stage can be cleaned up.
+		self._journal({"target": str(target), "temp": str(temp_path)})
+		with os.fdopen(temp_file_descriptor, "w", encoding="utf-8", newline="") as temp_file_handle:
+			json_codec.dump(data, temp_file_handle, indent=indent, ensure_ascii=ensure_ascii)
+		if previous_temp is not None:
+			previous_temp.unlink(missing_ok=True)
+		if backup and target.exists() and target not in self._backups:
+			self._backups.append(target)
+
+	def commit(self) -> None:
+		if self.committed:
+			return
+		self.committed = True
+		if not self._entries:
+			self._close_journal()
+			return
+		for temp_path in self._entries.values():
+			temp_file_descriptor = os.open(temp_path, os.O_RDONLY)
+			try:
+				os.fsync(temp_file_descriptor)
+			finally:
+				os.close(temp_file_descriptor)
+		for target in self._backups:
+			backup_path = target.with_suffix(target.suffix + ".bak")
+			with target.open("rb") as original_file, backup_path.open("wb") as backup_file:
+				backup_file.write(original_file.read())
+		# Point of no return: once the marker is durable, recovery rolls forward.
+		self._journal(JOURNAL_COMMIT_MARKER)
+		os.fsync(self._journal_handle.fileno())
+		_fsync_directories({self.journal_dir})
+		for target, temp_path in self._entries.items():
+			os.replace(temp_path, target)
+		_fsync_directories({target.parent for target in self._entries})
+		self._close_journal()
+
+	def rollback(self) -> None:
+		"""Discard every staged write (nothing has been renamed yet)."""
+		if self.committed:
+			return
+		self.committed = True
+		for temp_path in self._entries.values():
+			temp_path.unlink(missing_ok=True)
+		self._entries.clear()
+		self._close_journal()
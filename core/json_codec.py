@@ -0,0 +1,129 @@
+"""JSON encode/decode with an optional native backend.
+
+When `orjson` is installed it is used for both directions; otherwise (or with
+`PHI_JSON_CODEC=stdlib` in the environment) the stdlib `json` module is used.
+Either way the results are identical to what the repo has always produced:
+
+* `loads` returns the same objects as `json.loads`. Inputs orjson refuses
+  (NaN/Infinity literals, lone surrogates) or would read differently
+  (integers beyond 64 bits) are parsed by the stdlib.
+* `dumps` returns exactly the text of `json.dumps(obj, indent=..., ensure_ascii=...)`.
+  orjson's two-space indentation is rewritten to the requested indent, and
+  documents whose floats stdlib would print in exponent form (or as
+  NaN/Infinity) are encoded by the stdlib instead.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from typing import Any, Union
+
+try:
+	import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+	orjson = None  # type: ignore[assignment]
+
+BACKEND = "orjson" if orjson is not None and os.environ.get("PHI_JSON_CODEC", "").lower() != "stdlib" else "stdlib"
+
+Indent = Union[int, str, None]
+
+# json.dumps(ensure_ascii=True) escapes DEL (U+007F) as well as everything above it.
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+# Integers outside the 64-bit range have 19+ digits; mapping every digit to "0" turns the check into a substring test.
+_DIGITS_TO_ZERO = bytes.maketrans(b"0123456789", b"0" * 10)
+_LONG_DIGIT_RUN = b"0" * 19
+
+
+def loads(data: Union[bytes, str]) -> Any:
+	"""Parse a JSON document (bytes are decoded as strict UTF-8, as `read_text` would)."""
+	if BACKEND == "orjson":
+		raw = data.encode("utf-8", "surrogatepass") if isinstance(data, str) else bytes(data)
+		# orjson reads integers beyond 64 bits as floats; any 19+ digit run goes to the stdlib.
+		if _LONG_DIGIT_RUN not in raw.translate(_DIGITS_TO_ZERO):
+			try:
+				return orjson.loads(raw)
+			except orjson.JSONDecodeError:
+				pass
+	if isinstance(data, (bytes, bytearray, memoryview)):
+		data = bytes(data).decode("utf-8")
+	return json.loads(data)
+
+
+def _float_needs_stdlib(value: float) -> bool:
+	# repr() switches to exponent notation outside [1e-4, 1e16); orjson does not.
+	return not math.isfinite(value) or (value != 0 and not 1e-4 <= abs(value) < 1e16)
+
+
+def _needs_stdlib(obj: Any) -> bool:
+	"""True when orjson's output would differ from `json.dumps` (float formatting only).
+
+	One flat pass over an explicit stack: containers are expanded with C-level
+	`extend` and each leaf costs a single type dispatch (no recursion, no
+	per-container generator), since this runs before every orjson encode.
+	"""
+	stack = [obj]
+	pop, push = stack.pop, stack.extend
+	while stack:
+		value = pop()
+		kind = type(value)
+		if kind is str or kind is int or kind is bool or value is None:
+			continue
+		if kind is dict:
+			push(value.values())
+		elif kind is list or kind is tuple:
+			push(value)
+		elif kind is float:
+			if _float_needs_stdlib(value):
+				return True
+		elif isinstance(value, float):
+			if _float_needs_stdlib(value):
+				return True
+		elif isinstance(value, dict):
+			push(value.values())
+		elif isinstance(value, (list, tuple)):
+			push(value)
+	return False
+
+
+def _reindent(encoded: bytes, unit: bytes) -> bytes:
+	"""Rewrite orjson's two-space indentation as *unit* per level.
+
+	orjson escapes tabs inside strings, so a raw tab can only be indentation we
+	wrote: first level becomes a tab, and each pass widens every line by one more.
+	"""
+	encoded = encoded.replace(b"\n  ", b"\n\t")
+	while b"\t  " in encoded:
+		encoded = encoded.replace(b"\t  ", b"\t\t")
+	return encoded if unit == b"\t" else encoded.replace(b"\t", unit)
+
+
+def _escape_non_ascii(match: re.Match[str]) -> str:
+	code_point = ord(match.group(0))
+	if code_point < 0x10000:
+		return f"\\u{code_point:04x}"
+	code_point -= 0x10000
+	return f"\\u{0xD800 | (code_point >> 10):04x}\\u{0xDC00 | (code_point & 0x3FF):04x}"
+
+
+def dumps(obj: Any, *, indent: Indent = "\t", ensure_ascii: bool = False) -> str:
+	"""Serialise *obj* exactly as `json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)` would."""
+	if BACKEND == "orjson" and indent is not None and not _needs_stdlib(obj):
+		try:
+			encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+		except TypeError:
+			# Non-str keys, >64-bit integers, lone surrogates, unknown types, ...
+			encoded = None
+		if encoded is not None:
+			unit = (" " * indent if isinstance(indent, int) else indent).encode("utf-8")
+			if unit != b"  ":
+				encoded = _reindent(encoded, unit)
+			text = encoded.decode("utf-8")
+			return _NON_ASCII.sub(_escape_non_ascii, text) if ensure_ascii else text
+	return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def dump(obj: Any, handle: Any, *, indent: Indent = "\t", ensure_ascii: bool = False) -> None:
+	handle.write(dumps(obj, indent=indent, ensure_ascii=ensure_ascii))
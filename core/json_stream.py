@@ -0,0 +1,274 @@
+"""Incremental reader for files whose top level is a JSON array.
+
+`iter_json_array` yields one element at a time, together with its index and
+the byte offset where it starts, while holding at most one element plus one
+read chunk in memory. It is built on `json.JSONDecoder.raw_decode`, so each
+element is decoded by the same C scanner `json.loads` uses.
+
+An element that does not fit in the current window is not re-decoded after
+every read: a resumable bracket/string scan finds where it ends, and the
+element is decoded once that end is in memory. A malformed element is
+therefore reported as soon as its closing bracket has been read, not after
+the rest of the file.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+from core import instrumentation
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_MAX_ELEMENT_SIZE = 1 << 28  # characters; a larger element is treated as malformed
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+_STRUCTURE = re.compile(r'["{}\[\]]')
+# Raw control characters are invalid inside JSON strings, so a newline means the string never closed.
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_SCALAR_END = re.compile(r"[,\]\s]")
+
+
+class NotAJSONArrayError(ValueError):
+	"""Raised when the document's first non-whitespace character is not `[`."""
+
+
+class JSONStreamError(ValueError):
+	"""Malformed input, reported with the absolute byte offset where parsing stopped."""
+
+	def __init__(self, message: str, offset: int) -> None:
+		super().__init__(f"{message} at byte offset {offset}")
+		self.offset = offset
+
+
+class ArrayElement(NamedTuple):
+	index: int
+	offset: int
+	value: Any
+
+
+class _Buffer:
+	"""Decoded text window over a UTF-8 file that tracks absolute byte offsets."""
+
+	def __init__(self, handle: Any, chunk_size: int) -> None:
+		self._handle = handle
+		self._chunk_size = chunk_size
+		self._decoder = codecs.getincrementaldecoder("utf-8")()
+		self.text = ""
+		self.pos = 0
+		self.consumed_bytes = 0
+		self.bytes_read = 0
+		self._mark = 0
+		self._mark_bytes = 0
+		self.eof = False
+
+	def fill(self, size: int = 0) -> bool:
+		"""Append another chunk (at least *size* bytes); return False once the file is exhausted."""
+		if self.eof:
+			return False
+		chunk = self._handle.read(max(size, self._chunk_size))
+		self.eof = not chunk
+		self.bytes_read += len(chunk)
+		self.text += self._decoder.decode(chunk, final=self.eof)
+		return not self.eof or bool(self.text)
+
+	def compact(self, threshold: int = 0) -> None:
+		"""Drop consumed text (once more than *threshold* chars) so the window stays small."""
+		if self.pos > threshold:
+			self.consumed_bytes = self.offset()
+			self.text = self.text[self.pos :]
+			self.pos = 0
+			self._mark = 0
+			self._mark_bytes = 0
+
+	def peek(self) -> str:
+		"""Return the next non-whitespace character ("" at end of input) without consuming it."""
+		while True:
+			while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+				self.pos += 1
+			if self.pos < len(self.text):
+				return self.text[self.pos]
+			self.compact()
+			if not self.fill():
+				return ""
+
+	def offset(self) -> int:
+		"""Absolute byte offset of `pos`, encoding only the text read since the last call."""
+		if self.pos != self._mark:
+			self._mark_bytes += len(self.text[self._mark : self.pos].encode("utf-8"))
+			self._mark = self.pos
+		return self.consumed_bytes + self._mark_bytes
+
+
+class _ElementScan:
+	"""Resumable scan for the end of the element starting at *start*.
+
+	`advance` only looks at text it has not seen before, so scanning an element
+	that arrives over many reads stays linear in its size.
+	"""
+
+	__slots__ = ("pos", "closers", "in_string", "scalar", "end")
+
+	def __init__(self, text: str, start: int) -> None:
+		first = text[start]
+		self.pos = start + 1
+		self.closers: list[str] = []
+		self.in_string = first == '"'
+		self.scalar = first not in '"{['
+		self.end: Optional[int] = None
+		if first in "{[":
+			self.closers.append("}" if first == "{" else "]")
+		elif self.scalar:
+			self.pos = start
+
+	def advance(self, text: str) -> Optional[int]:
+		"""Return the element's end index once it is in *text* (None: read more).
+
+		Raises ValueError on mismatched brackets or a string that cannot close.
+		"""
+		if self.scalar:
+			match = _SCALAR_END.search(text, self.pos)
+			if match is None:
+				self.pos = len(text)
+				return None
+			self.end = match.start()
+			return self.end
+		pos = self.pos
+		closers = self.closers
+		while True:
+			if self.in_string:
+				match = _STRING_SPECIAL.search(text, pos)
+				if match is None:
+					self.pos = len(text)
+					return None
+				char = match.group()
+				if char == "\\":
+					if match.end() >= len(text):
+						self.pos = match.start()  # the escaped character is still to come
+						return None
+					pos = match.end() + 1
+					continue
+				if char != '"':
+					raise ValueError("control character in string")
+				self.in_string = False
+				pos = match.end()
+				if not closers:
+					self.end = pos
+					return pos
+				continue
+			match = _STRUCTURE.search(text, pos)
+			if match is None:
+				self.pos = len(text)
+				return None
+			char = match.group()
+			pos = match.end()
+			if char == '"':
+				self.in_string = True
+			elif char == "{":
+				closers.append("}")
+			elif char == "[":
+				closers.append("]")
+			else:
+				if closers.pop() != char:
+					raise ValueError(f"mismatched {char!r}")
+				if not closers:
+					self.end = pos
+					return pos
+
+
+def _read_element(scan: _ElementScan, buffer: _Buffer, max_size: int) -> bool:
+	"""Read until *scan* finds the element's end; False if the input ends (or breaks) first."""
+	while True:
+		try:
+			if scan.advance(buffer.text) is not None:
+				return True
+		except ValueError:
+			return False
+		pending = len(buffer.text) - buffer.pos
+		if pending > max_size:
+			raise _error(f"Array element exceeds {max_size} characters", buffer)
+		# Read at least as much again as is pending, so a huge element costs O(size) copies overall.
+		if not buffer.fill(pending):
+			return False
+
+
+def iter_json_array(
+	path: Union[str, Path],
+	*,
+	chunk_size: int = DEFAULT_CHUNK_SIZE,
+	max_element_size: int = DEFAULT_MAX_ELEMENT_SIZE,
+) -> Iterator[ArrayElement]:
+	"""Yield `(index, byte offset, value)` for each element of the JSON array in *path*.
+
+	Raises `NotAJSONArrayError` if the document is not an array and
+	`JSONStreamError` on malformed input, including any single element larger
+	than *max_element_size* characters.
+	"""
+	decoder = json.JSONDecoder()
+	metrics = instrumentation.active()
+	parse_seconds = 0.0
+	with Path(path).open("rb") as handle:
+		buffer = _Buffer(handle, chunk_size)
+		try:
+			if buffer.peek() == "\ufeff":
+				buffer.pos += 1
+			if buffer.peek() != "[":
+				raise NotAJSONArrayError(f"{path}: top-level JSON value is not an array")
+			buffer.pos += 1
+			index = 0
+			while True:
+				token = buffer.peek()
+				if token == "]":
+					buffer.pos += 1
+					break
+				if token == "":
+					raise _error("Unterminated array", buffer)
+				if index:
+					if token != ",":
+						raise _error("Expecting ',' delimiter", buffer)
+					buffer.pos += 1
+					token = buffer.peek()
+				if token == "":
+					raise _error("Unterminated array", buffer)
+				buffer.compact(chunk_size)
+				offset = buffer.offset()
+				scan: Optional[_ElementScan] = None
+				while True:
+					started = time.perf_counter() if metrics is not None else 0.0
+					try:
+						value, end = decoder.raw_decode(buffer.text, buffer.pos)
+					except json.JSONDecodeError:
+						# Either the element is cut off by the window or it is broken: scan for
+						# its end, then decode exactly once more.
+						if scan is None:
+							scan = _ElementScan(buffer.text, buffer.pos)
+							if _read_element(scan, buffer, max_element_size):
+								continue
+						raise _error("Malformed array element", buffer) from None
+					finally:
+						if metrics is not None:
+							parse_seconds += time.perf_counter() - started
+					# A number running into the end of the window (e.g. "12", "0." or "1e+")
+					# may continue in the next chunk.
+					tail = buffer.text[end:]
+					if not buffer.eof and len(tail) <= 2 and not tail.strip(_NUMBER_CHARS):
+						buffer.fill()
+						continue
+					break
+				buffer.pos = end
+				yield ArrayElement(index, offset, value)
+				index += 1
+			if buffer.peek() != "":
+				raise _error("Extra data", buffer)
+		finally:
+			if metrics is not None:
+				metrics.add(files_read=1, bytes_read=buffer.bytes_read, json_parse_s=parse_seconds)
+
+
+def _error(message: str, buffer: _Buffer) -> JSONStreamError:
+	return JSONStreamError(message, buffer.offset())
@@ -0,0 +1,100 @@
+"""Shared in-memory cache of parsed record files.
+
+Validators that walk the same `records/` tree (metadata, tags, provenance,
+IDs) can share one `RecordStore` so every JSON file is discovered and parsed
+once per run. Entries are keyed by absolute path and re-parsed only when the
+file's `mtime_ns` or size changes.
+
+Parsed documents are shared between callers: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Union
+
+from core.json_stream import ArrayElement, NotAJSONArrayError, iter_json_array
+from core.schema_utils import read_json
+
+PathLike = Union[str, Path]
+
+
+class RecordStore:
+	"""Parse each JSON file at most once per (mtime, size) and memoise discovery."""
+
+	def __init__(self) -> None:
+		self._documents: dict[str, tuple[int, int, Any]] = {}
+		self._listings: dict[tuple[str, str], list[Path]] = {}
+		self.parses = 0
+		self.hits = 0
+
+	@staticmethod
+	def _key(path: PathLike) -> str:
+		return os.path.abspath(path)
+
+	def load(self, path: PathLike) -> Any:
+		"""Return the parsed JSON at *path* (`{}` when the file is missing, like `read_json`)."""
+		key = self._key(path)
+		try:
+			stat = os.stat(key)
+		except FileNotFoundError:
+			self._documents.pop(key, None)
+			return {}
+		cached = self._documents.get(key)
+		if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+			self.hits += 1
+			return cached[2]
+		data = read_json(key)
+		self._documents[key] = (stat.st_mtime_ns, stat.st_size, data)
+		self.parses += 1
+		return data
+
+	def iter_array(self, path: PathLike) -> Iterator[ArrayElement]:
+		"""Yield the elements of a JSON array file one at a time.
+
+		Files this store has already parsed are served from memory (with an
+		offset of -1); anything else is streamed with `iter_json_array` and not
+		cached, so very large timelines never have to be held in full.
+		"""
+		key = self._key(path)
+		cached = self._documents.get(key)
+		if cached is not None:
+			stat = os.stat(key)
+			if cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+				self.hits += 1
+				if not isinstance(cached[2], list):
+					raise NotAJSONArrayError(f"{path}: top-level JSON value is not an array")
+				for index, value in enumerate(cached[2]):
+					yield ArrayElement(index, -1, value)
+				return
+		yield from iter_json_array(key)
+
+	def glob(self, root: PathLike, pattern: str = "*.json") -> list[Path]:
+		"""Sorted recursive listing of *root* matching *pattern*, discovered once per store.
+
+		Paths are returned relative to *root* exactly as the caller spelled it, so
+		relative and absolute callers share one listing without changing messages.
+		"""
+		root_path = Path(root)
+		key = (self._key(root_path), pattern)
+		listing = self._listings.get(key)
+		if listing is None:
+			listing = []
+			if root_path.exists():
+				listing = [path.relative_to(root_path) for path in sorted(root_path.rglob(pattern))]
+			self._listings[key] = listing
+		return [root_path / relative for relative in listing]
+
+	def invalidate_listings(self) -> None:
+		"""Forget memoised `glob` results so added or removed files are discovered again."""
+		self._listings.clear()
+
+	def invalidate(self, path: PathLike | None = None) -> None:
+		"""Forget one parsed file, or everything (including listings) when *path* is None."""
+		if path is None:
+			self._documents.clear()
+			self._listings.clear()
+		else:
+			self._documents.pop(self._key(path), None)
@@ -0,0 +1,198 @@
+"""Single-pass rule dispatch over parsed record documents.
+
+Validators register rules against key names (`tags`, `source_ref`, `canon`)
+on a `RuleEngine`; `RuleEngine.walk` then visits each document once,
+in document order, and calls every rule whose key it meets. Locations are
+tracked as `Pointer` chains and only formatted into strings when a rule asks
+for one, so clean documents never pay for pointer construction.
+
+The records validators register their rules on the shared `RECORD_RULES`
+engine when they subscribe, each under its own *channel*, and read documents
+through a `SharedWalk`: the first validator to ask about a file walks it once
+for every subscribed channel, and the others pick up the findings that walk
+already collected. Registering is idempotent, so a validator may subscribe on
+every run; rules are never registered at import time, because a tool run as
+`__main__` and imported again under its package name would register twice.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+PointerPart = Union[str, int]
+
+
+class Pointer:
+	"""Lazily-rendered location of a node: a parent link plus the key/index used to reach it."""
+
+	__slots__ = ("parent", "key")
+
+	def __init__(self, parent: Optional["Pointer"] = None, key: Optional[PointerPart] = None) -> None:
+		self.parent = parent
+		self.key = key
+
+	def child(self, key: PointerPart) -> "Pointer":
+		return Pointer(self, key)
+
+	def parts(self) -> list[PointerPart]:
+		parts: list[PointerPart] = []
+		node: Optional[Pointer] = self
+		while node is not None and node.parent is not None:
+			parts.append(node.key)  # type: ignore[arg-type]
+			node = node.parent
+		parts.reverse()
+		return parts
+
+	def slash(self) -> str:
+		"""`a/b/0` form used by the metadata validator."""
+		return "/".join(str(part) for part in self.parts())
+
+	def dotted(self, root: str = "") -> str:
+		"""`a.b[0]` form; *root* prefixes pointers that start with an index (or are empty)."""
+		rendered = root
+		started = False
+		for part in self.parts():
+			if isinstance(part, int):
+				rendered = f"{rendered}[{part}]"
+			else:
+				rendered = f"{rendered}.{part}" if started else str(part)
+			started = True
+		return rendered
+
+	def __str__(self) -> str:
+		return self.slash()
+
+
+ROOT = Pointer()
+
+Rule = Callable[[Any, Pointer, Any], None]
+ContextFactory = Callable[[Path], Any]
+
+
+class RuleEngine:
+	"""Dispatch key-name rules during one depth-first walk of a document."""
+
+	def __init__(self) -> None:
+		self._rules: dict[str, list[tuple[Rule, Optional[str]]]] = {}
+		self._descend: dict[str, bool] = {}
+
+	def on(self, key: str, rule: Rule, *, descend: bool = False, channel: Optional[str] = None) -> "RuleEngine":
+		"""Call ``rule(value, pointer, context)`` for every dict entry named *key*.
+
+		With ``descend=False`` (the default) the walk does not continue into the
+		matched value; if any rule for *key* asks to descend, the walk does.
+
+		A rule registered on a *channel* expects the walk's context to be a
+		mapping and receives ``context[channel]`` instead; it is skipped for
+		documents walked without that channel.
+
+		Registering the same *rule* for the same *key* and *channel* again is a no-op.
+		"""
+		key_rules = self._rules.setdefault(key, [])
+		if not any(known is rule and known_channel == channel for known, known_channel in key_rules):
+			key_rules.append((rule, channel))
+		self._descend[key] = self._descend.get(key, False) or descend
+		return self
+
+	@property
+	def keys(self) -> list[str]:
+		return sorted(self._rules)
+
+	def walk(self, document: Any, context: Any = None, pointer: Pointer = ROOT) -> None:
+		"""Visit *document* once, firing rules in document order.
+
+		*pointer* locates *document* inside a larger tree when a rule re-enters
+		the walk on a sub-document.
+		"""
+		rules = self._rules
+		descend = self._descend
+		# Entries are (node, pointer, matched rules or None). Scalars are never
+		# pushed, and pointers are linked objects rather than strings.
+		stack: list[tuple[Any, Pointer, Optional[list[tuple[Rule, Optional[str]]]]]] = [(document, pointer, None)]
+		while stack:
+			node, pointer, matched = stack.pop()
+			if matched is not None:
+				for rule, channel in matched:
+					if channel is None:
+						rule(node, pointer, context)
+						continue
+					target = context.get(channel)
+					if target is not None:
+						rule(node, pointer, target)
+				continue
+			if isinstance(node, dict):
+				pending: list[tuple[Any, Pointer, Optional[list[tuple[Rule, Optional[str]]]]]] = []
+				for key, value in node.items():
+					key_rules = rules.get(key)
+					if key_rules is None:
+						if isinstance(value, (dict, list)):
+							pending.append((value, Pointer(pointer, key), None))
+						continue
+					child = Pointer(pointer, key)
+					pending.append((value, child, key_rules))
+					if descend[key] and isinstance(value, (dict, list)):
+						pending.append((value, child, None))
+				stack.extend(reversed(pending))
+			elif isinstance(node, list):
+				stack.extend(
+					(item, Pointer(pointer, index), None)
+					for index, item in reversed(list(enumerate(node)))
+					if isinstance(item, (dict, list))
+				)
+
+
+# Every records validator registers its rules here (when it subscribes), each under its own channel.
+RECORD_RULES = RuleEngine()
+
+
+class SharedWalk:
+	"""Walk each record document once on behalf of every subscribed validator.
+
+	Validators `subscribe` a channel with the files they will ask about and a
+	factory for their per-file context. The first `context` call for a file
+	loads it through *load* and walks it with a fresh context for every channel
+	subscribed to that file; each channel then collects its own context once.
+	"""
+
+	def __init__(self, load: Callable[[Path], Any], engine: RuleEngine = RECORD_RULES) -> None:
+		self._load = load
+		self._engine = engine
+		self._subscribers: dict[str, tuple[set[str], ContextFactory]] = {}
+		self._pending: dict[str, dict[str, Any]] = {}
+		self._walked: set[str] = set()
+		self.walks = 0
+
+	@property
+	def engine(self) -> RuleEngine:
+		return self._engine
+
+	def subscribed(self, channel: str) -> bool:
+		return channel in self._subscribers
+
+	def subscribe(self, channel: str, paths: Iterable[Path], factory: ContextFactory) -> None:
+		"""Walk *paths* for *channel*, with ``factory(path)`` as the per-file context."""
+		self._subscribers[channel] = ({os.path.abspath(path) for path in paths}, factory)
+
+	def context(self, channel: str, path: Path) -> Any:
+		"""*channel*'s context for *path*, after the (shared) walk of that file."""
+		key = os.path.abspath(path)
+		contexts = self._pending.get(key)
+		if contexts is None or channel not in contexts:
+			fresh = {channel: self._subscribers[channel][1](path)}
+			if key not in self._walked:
+				# First visit: fill every other subscriber's context in the same walk.
+				self._walked.add(key)
+				for name, (paths, factory) in self._subscribers.items():
+					if name != channel and key in paths:
+						fresh[name] = factory(path)
+			self._engine.walk(self._load(path), fresh)
+			self.walks += 1
+			contexts = self._pending.setdefault(key, {})
+			contexts.update(fresh)
+		result = contexts.pop(channel)
+		if not contexts:
+			del self._pending[key]
+		return result
@@ -0,0 +1,249 @@
+"""Lazy `$id` → schema registry for every document under `schemas/`.
+
+Schema files are indexed by `$id` the first time a lookup happens and each
+document is only read from disk when a validator actually needs it. A
+pre-resolved bundle (all documents in one JSON file) can be written with
+`tools/bundle_schemas.py`; when present and fresh it replaces the ~35
+individual reads on cold start.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+from core import json_codec
+
+try:
+	from referencing import Registry, Resource
+	from referencing.jsonschema import DRAFT202012
+except ModuleNotFoundError:  # pragma: no cover - dependency guard
+	Registry = None  # type: ignore[assignment]
+	Resource = None  # type: ignore[assignment]
+	DRAFT202012 = None  # type: ignore[assignment]
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_ROOT = REPO_ROOT / "schemas"
+SCHEMA_BASE_URI = "https://primal-hunter.local/schemas/"
+SCHEMA_BUNDLE_PATH = REPO_ROOT / ".cache" / "schema_bundle.json"
+SCHEMA_GLOB = "*.schema.json"
+BUNDLE_FORMAT_VERSION = 1
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+	stat = path.stat()
+	return stat.st_mtime_ns, stat.st_size
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+	stack = [node]
+	while stack:
+		current = stack.pop()
+		if isinstance(current, dict):
+			for key, value in current.items():
+				if key == "$ref" and isinstance(value, str):
+					yield value
+				else:
+					stack.append(value)
+		elif isinstance(current, list):
+			stack.extend(current)
+
+
+class SchemaRegistry:
+	"""Index schema documents by `$id` and load them on first use."""
+
+	def __init__(self, root: Path = SCHEMA_ROOT, base_uri: str = SCHEMA_BASE_URI) -> None:
+		self.root = Path(root)
+		self.base_uri = base_uri
+		self._paths: Optional[dict[str, Path]] = None
+		self._documents: dict[str, dict[str, Any]] = {}
+		self._signatures: dict[str, tuple[int, int]] = {}
+		self._scanned_ids = False
+
+	# ----- discovery -----
+
+	def _index(self) -> dict[str, Path]:
+		"""Map `$id` → path using the `<base_uri><relative path>` convention (no file reads)."""
+		if self._paths is None:
+			paths: dict[str, Path] = {}
+			if self.root.exists():
+				for path in sorted(self.root.rglob(SCHEMA_GLOB)):
+					paths[self.base_uri + path.relative_to(self.root).as_posix()] = path
+			self._paths = paths
+		return self._paths
+
+	def _scan_declared_ids(self) -> None:
+		"""Fallback for schemas whose `$id` does not follow the path convention."""
+		if self._scanned_ids:
+			return
+		self._scanned_ids = True
+		index = self._index()
+		for path in list(index.values()):
+			signature = _file_signature(path)
+			document = self._read(path)
+			declared = document.get("$id") if isinstance(document, dict) else None
+			if isinstance(declared, str) and declared not in index:
+				index[declared] = path
+				if declared not in self._documents:
+					self._documents[declared] = document
+					self._signatures[declared] = signature
+
+	def uris(self) -> list[str]:
+		self._scan_declared_ids()
+		return sorted(self._index())
+
+	def path_for(self, uri: str) -> Optional[Path]:
+		uri = uri.split("#", 1)[0]
+		path = self._index().get(uri)
+		if path is None:
+			self._scan_declared_ids()
+			path = self._index().get(uri)
+		return path
+
+	# ----- loading -----
+
+	@staticmethod
+	def _read(path: Path) -> dict[str, Any]:
+		return json_codec.loads(path.read_bytes())
+
+	def get(self, uri: str) -> dict[str, Any]:
+		"""Return the schema document registered under *uri* (fragment ignored)."""
+		uri = uri.split("#", 1)[0]
+		document = self._documents.get(uri)
+		if document is not None:
+			return document
+		path = self.path_for(uri)
+		if path is None:
+			raise KeyError(f"No schema registered for {uri}")
+		signature = _file_signature(path)
+		document = self._read(path)
+		self._documents[uri] = document
+		self._signatures[uri] = signature
+		return document
+
+	def loaded_uris(self) -> list[str]:
+		return sorted(self._documents)
+
+	def _resource(self, uri: str) -> Resource:
+		return Resource.from_contents(self.get(uri), default_specification=DRAFT202012)
+
+	def registry_for(self, schema: dict[str, Any]) -> Registry:
+		"""Build a `referencing.Registry` holding every document *schema* transitively `$ref`s.
+
+		Documents are loaded lazily the first time a schema that needs them is
+		compiled; anything unexpected is still retrieved on demand.
+		"""
+		if Registry is None:
+			raise RuntimeError("referencing package is required for schema validation")
+		resources = [(uri, self._resource(uri)) for uri in self.referenced_uris(schema)]
+		return Registry(retrieve=self._resource).with_resources(resources)
+
+	def referenced_uris(self, schema: dict[str, Any]) -> list[str]:
+		"""Return the registered documents *schema* depends on through `$ref`, transitively."""
+		own_id = schema.get("$id") if isinstance(schema, dict) else None
+		found: dict[str, None] = {}
+		pending = [schema]
+		while pending:
+			for ref in _iter_refs(pending.pop()):
+				target = ref.split("#", 1)[0]
+				if not target or target == own_id or target in found or self.path_for(target) is None:
+					continue
+				found[target] = None
+				pending.append(self.get(target))
+		return list(found)
+
+	def dependency_signature(self, schema: dict[str, Any]) -> tuple[tuple[str, int, int], ...]:
+		"""`(uri, mtime_ns, size)` for every document *schema* `$ref`s, as they are on disk now.
+
+		Documents whose file changed since they were loaded are dropped and
+		re-read first, so the result (and any validator compiled afterwards)
+		reflects the current files. A deleted file resets the whole registry.
+		"""
+		while True:
+			uris = self.referenced_uris(schema)
+			stale = []
+			for uri in uris:
+				try:
+					if _file_signature(self._index()[uri]) != self._signatures.get(uri):
+						stale.append(uri)
+				except (KeyError, FileNotFoundError):
+					self.clear()
+					stale.append(uri)
+					break
+			if not stale:
+				return tuple((uri, *self._signatures[uri]) for uri in uris)
+			for uri in stale:
+				self._documents.pop(uri, None)
+				self._signatures.pop(uri, None)
+
+	def clear(self) -> None:
+		"""Forget loaded documents and the `$id` index (e.g. after schema edits)."""
+		self._paths = None
+		self._documents.clear()
+		self._signatures.clear()
+		self._scanned_ids = False
+
+	# ----- bundles -----
+
+	def bundle(self) -> dict[str, Any]:
+		"""Return every schema plus the file signatures used to detect staleness."""
+		schemas: dict[str, Any] = {}
+		sources: dict[str, dict[str, Any]] = {}
+		for uri in self.uris():
+			path = self._index()[uri]
+			mtime_ns, size = _file_signature(path)
+			schemas[uri] = self.get(uri)
+			sources[uri] = {
+				"path": path.relative_to(self.root).as_posix(),
+				"mtime_ns": mtime_ns,
+				"size": size,
+			}
+		return {
+			"format": BUNDLE_FORMAT_VERSION,
+			"base_uri": self.base_uri,
+			"sources": sources,
+			"schemas": schemas,
+		}
+
+	def write_bundle(self, path: Path = SCHEMA_BUNDLE_PATH) -> Path:
+		from core.io_safe import write_json_atomic
+
+		write_json_atomic(path, self.bundle())
+		return Path(path)
+
+	@classmethod
+	def from_bundle(cls, bundle_path: Path = SCHEMA_BUNDLE_PATH, root: Path = SCHEMA_ROOT) -> "SchemaRegistry":
+		"""Load a registry pre-populated from a bundle file.
+
+		Entries whose source file changed since the bundle was written are
+		skipped and fall back to lazy loading from disk.
+		"""
+		registry = cls(root)
+		bundle = json_codec.loads(Path(bundle_path).read_bytes())
+		if bundle.get("format") != BUNDLE_FORMAT_VERSION or bundle.get("base_uri") != registry.base_uri:
+			return registry
+		for uri, source in bundle.get("sources", {}).items():
+			path = registry.root / source["path"]
+			try:
+				signature = _file_signature(path)
+			except FileNotFoundError:
+				continue
+			if signature == (source["mtime_ns"], source["size"]) and uri in bundle["schemas"]:
+				registry._documents[uri] = bundle["schemas"][uri]
+				registry._signatures[uri] = signature
+		return registry
+
+
+_DEFAULT_REGISTRY: Optional[SchemaRegistry] = None
+
+
+def default_registry() -> SchemaRegistry:
+	"""Return the process-wide registry, seeded from the schema bundle when one exists."""
+	global _DEFAULT_REGISTRY
+	if _DEFAULT_REGISTRY is None:
+		if SCHEMA_BUNDLE_PATH.exists():
+			_DEFAULT_REGISTRY = SchemaRegistry.from_bundle(SCHEMA_BUNDLE_PATH)
+		else:
+			_DEFAULT_REGISTRY = SchemaRegistry()
+	return _DEFAULT_REGISTRY
@@ -1,62 +1,39 @@
+import hashlib
 import json
+import time
 import warnings
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Union
 
 try:
-	from jsonschema import Draft202012Validator, RefResolver, ValidationError
+	from jsonschema import Draft202012Validator, ValidationError
 except ModuleNotFoundError as exc:  # pragma: no cover - dependency guard
 	Draft202012Validator = None  # type: ignore[assignment]
-	RefResolver = None  # type: ignore[assignment]
 	ValidationError = Exception  # type: ignore[assignment]
 	_JSONSCHEMA_IMPORT_ERROR = exc
 else:
 	_JSONSCHEMA_IMPORT_ERROR = None
 
+from core import instrumentation, json_codec
 from core.io_safe import write_json_atomic as _write_json_atomic
+from core.schema_registry import default_registry
 
-_SCHEMA_ROOT = Path(__file__).resolve().parents[1] / "schemas"
-_SHARED_SCHEMA_URIS = {
-	"https://primal-hunter.local/schemas/shared/granted_by.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "granted_by.schema.json",
-	"https://primal-hunter.local/schemas/shared/flavor.schema.json": _SCHEMA_ROOT / "shared" / "flavor.schema.json",
-	"https://primal-hunter.local/schemas/shared/resource_block.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "resource_block.schema.json",
-	"https://primal-hunter.local/schemas/shared/tags.schema.json": _SCHEMA_ROOT / "shared" / "tags.schema.json",
-	"https://primal-hunter.local/schemas/shared/provenance.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "provenance.schema.json",
-	"https://primal-hunter.local/schemas/shared/source_ref.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "source_ref.schema.json",
-	"https://primal-hunter.local/schemas/shared/id.schema.json": _SCHEMA_ROOT / "shared" / "id.schema.json",
-	"https://primal-hunter.local/schemas/shared/param_rule.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "param_rule.schema.json",
-	"https://primal-hunter.local/schemas/shared/record_log.schema.json": _SCHEMA_ROOT
-	/ "shared"
-	/ "record_log.schema.json",
-	"https://primal-hunter.local/schemas/timeline_event.schema.json": _SCHEMA_ROOT / "timeline_event.schema.json",
-	"https://primal-hunter.local/schemas/skill_node.schema.json": _SCHEMA_ROOT / "skill_node.schema.json",
-}
-
-_SHARED_SCHEMA_STORE = {}
 _JSONSCHEMA_AVAILABLE = Draft202012Validator is not None
 _WARNED_JSONSCHEMA_MISSING = False
 
-
-def _load_shared_store() -> dict[str, Any]:
-	store: dict[str, Any] = {}
-	for uri, path in _SHARED_SCHEMA_URIS.items():
-		if path.exists():
-			with path.open(encoding="utf-8") as handle:
-				store[uri] = json.load(handle)
-	return store
-
-
-_SHARED_SCHEMA_STORE = _load_shared_store()
+# Compiled validators are cached process-wide. Keys are either
+# ("path", resolved_path, mtime_ns, size, dependencies) for schemas loaded from
+# disk, where dependencies are the (uri, mtime_ns, size) of every `$ref`'d
+# document, or ("schema", $id, content_digest) for in-memory schema dicts.
+# A dict seen before is recognised by identity, so its digest is computed once;
+# the dict is held in _SCHEMA_KEYS so its id() cannot be reused meanwhile.
+_VALIDATOR_CACHE_SIZE = 64
+_VALIDATOR_CACHE: "OrderedDict[tuple, Any]" = OrderedDict()
+_PATH_CACHE_KEYS: dict[Path, tuple] = {}
+_SCHEMA_KEYS: "OrderedDict[int, tuple[dict[str, Any], tuple]]" = OrderedDict()
 
 
 def _warn_jsonschema_missing() -> None:
@@ -75,13 +52,120 @@ def _warn_jsonschema_missing() -> None:
 def _build_validator(schema: dict[str, Any]) -> Draft202012Validator:
 	if not _JSONSCHEMA_AVAILABLE:
 		raise RuntimeError("jsonschema package is required for schema validation") from _JSONSCHEMA_IMPORT_ERROR
-	resolver = RefResolver.from_schema(schema, store=_SHARED_SCHEMA_STORE)
-	return Draft202012Validator(schema, resolver=resolver)
+	if instrumentation.active() is None:
+		return Draft202012Validator(schema, registry=default_registry().registry_for(schema))
+	started = time.perf_counter()
+	validator = Draft202012Validator(schema, registry=default_registry().registry_for(schema))
+	instrumentation.active().add(validators_built=1, validator_build_s=time.perf_counter() - started)
+	return validator
+
+
+def _schema_digest(schema: dict[str, Any]) -> str:
+	encoded = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+	return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _schema_key(schema: dict[str, Any]) -> tuple:
+	entry = _SCHEMA_KEYS.get(id(schema))
+	if entry is not None and entry[0] is schema:
+		_SCHEMA_KEYS.move_to_end(id(schema))
+		return entry[1]
+	key = ("schema", schema.get("$id"), _schema_digest(schema))
+	_SCHEMA_KEYS[id(schema)] = (schema, key)
+	while len(_SCHEMA_KEYS) > _VALIDATOR_CACHE_SIZE:
+		_SCHEMA_KEYS.popitem(last=False)
+	return key
+
+
+def _cache_get(key: tuple) -> Any:
+	validator = _VALIDATOR_CACHE.get(key)
+	if validator is not None:
+		_VALIDATOR_CACHE.move_to_end(key)
+	return validator
+
+
+def _cache_put(key: tuple, validator: Any) -> None:
+	_VALIDATOR_CACHE[key] = validator
+	_VALIDATOR_CACHE.move_to_end(key)
+	while len(_VALIDATOR_CACHE) > _VALIDATOR_CACHE_SIZE:
+		_VALIDATOR_CACHE.popitem(last=False)
+
+
+def _get_path_validator(schema_path: Path) -> Draft202012Validator:
+	resolved = schema_path.resolve()
+	stat = resolved.stat()
+	previous_key = _PATH_CACHE_KEYS.get(resolved)
+	if previous_key is not None and previous_key[2:4] == (stat.st_mtime_ns, stat.st_size):
+		validator = _VALIDATOR_CACHE.get(previous_key)
+		schema = validator.schema if validator is not None else load_schema(resolved)
+	else:
+		schema = load_schema(resolved)
+	key = ("path", resolved, stat.st_mtime_ns, stat.st_size, default_registry().dependency_signature(schema))
+	if previous_key is not None and previous_key != key:
+		# The schema file or a document it `$ref`s changed on disk; drop the stale compiled validator.
+		_VALIDATOR_CACHE.pop(previous_key, None)
+	validator = _cache_get(key)
+	if validator is None:
+		validator = _build_validator(schema)
+		_cache_put(key, validator)
+	_PATH_CACHE_KEYS[resolved] = key
+	return validator
+
+
+def get_validator(schema: Union[dict[str, Any], str, Path]) -> Draft202012Validator:
+	"""Return a compiled validator for *schema*, reusing a cached one when possible.
+
+	Schemas given as paths are keyed by file identity (path, mtime, size) plus
+	that of every document they `$ref`, so editing the schema or a shared
+	fragment recompiles it on the next call. Schema dicts are keyed by their
+	`$id` plus a digest of their content, computed once per dict object; mutate
+	a schema dict in place and it keeps its old validator.
+	"""
+	if not _JSONSCHEMA_AVAILABLE:
+		raise RuntimeError("jsonschema package is required for schema validation") from _JSONSCHEMA_IMPORT_ERROR
+	if isinstance(schema, (str, Path)):
+		return _get_path_validator(Path(schema))
+	key = _schema_key(schema)
+	validator = _cache_get(key)
+	if validator is None:
+		validator = _build_validator(schema)
+		_cache_put(key, validator)
+	return validator
+
+
+def clear_validator_cache() -> None:
+	"""Drop every cached compiled validator (mainly useful in tests)."""
+	_VALIDATOR_CACHE.clear()
+	_PATH_CACHE_KEYS.clear()
+	_SCHEMA_KEYS.clear()
+
+
+@dataclass(frozen=True)
+class SchemaIssue:
+	"""A single schema violation reported by `validate_many`."""
+
+	index: int
+	path: tuple[Union[str, int], ...]
+	message: str
+
+	@property
+	def pointer(self) -> str:
+		return "/".join(map(str, self.path)) or "<root>"
+
+
+def _parse_file(path: Path) -> Any:
+	payload = path.read_bytes()
+	if instrumentation.active() is None:
+		return json_codec.loads(payload)
+	started = time.perf_counter()
+	data = json_codec.loads(payload)
+	instrumentation.record_read(len(payload), time.perf_counter() - started)
+	return data
 
 
 def read_json(path: Union[str, Path]) -> Any:
 	path_obj = Path(path)
-	return json.loads(path_obj.read_text(encoding="utf-8")) if path_obj.exists() else {}
+	return _parse_file(path_obj) if path_obj.exists() else {}
 
 
 def write_json_atomic(path: Union[str, Path], data: Any) -> None:
@@ -92,17 +176,39 @@ def load_schema(path: Union[str, Path]) -> dict[str, Any]:
 	return read_json(path)
 
 
-def validate_instance(instance: Any, schema: dict[str, Any]) -> None:
-	if not _JSONSCHEMA_AVAILABLE:
-		_warn_jsonschema_missing()
-		return
-	validator = _build_validator(schema)
+def _raise_for_errors(validator: Draft202012Validator, instance: Any) -> None:
 	errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
 	if errors:
 		msg = "\n".join(f"- {'/'.join(map(str, e.path)) or '<root>'}: {e.message}" for e in errors)
 		raise ValueError(f"Schema validation failed:\n{msg}")
 
 
+def validate_instance(instance: Any, schema: dict[str, Any]) -> None:
+	if not _JSONSCHEMA_AVAILABLE:
+		_warn_jsonschema_missing()
+		return
+	_raise_for_errors(get_validator(schema), instance)
+
+
+def validate_many(
+	instances: Iterable[Any], schema: Union[dict[str, Any], str, Path]
+) -> list[list[SchemaIssue]]:
+	"""Validate every instance against one compiled validator.
+
+	Returns one list of `SchemaIssue` per instance (empty when the instance is
+	valid), in input order.
+	"""
+	if not _JSONSCHEMA_AVAILABLE:
+		_warn_jsonschema_missing()
+		return [[] for _ in instances]
+	validator = get_validator(schema)
+	results: list[list[SchemaIssue]] = []
+	for index, instance in enumerate(instances):
+		errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
+		results.append([SchemaIssue(index, tuple(error.path), error.message) for error in errors])
+	return results
+
+
 def validate_json_schema(data_path: Path, schema_path: Path) -> list[ValidationError]:
 	data_path = Path(data_path)
 	schema_path = Path(schema_path)
@@ -117,8 +223,7 @@ def validate_json_schema(data_path: Path, schema_path: Path) -> list[ValidationE
 		return []
 
 	data = read_json(data_path)
-	schema = load_schema(schema_path)
-	validator = _build_validator(schema)
+	validator = get_validator(schema_path)
 	return sorted(validator.iter_errors(data), key=lambda e: e.path)
 
 
@@ -130,12 +235,10 @@ def validate_json_file(data: Any, schema_path: Path) -> None:
 	if not _JSONSCHEMA_AVAILABLE:
 		_warn_jsonschema_missing()
 		return
-	schema = load_schema(schema_path)
-	validate_instance(data, schema)
+	_raise_for_errors(get_validator(schema_path), data)
 
 
 def load_json(path: Path) -> dict:
 	if path.stat().st_size == 0:
 		return {}
-	with path.open("r", encoding="utf-8") as handle:
-		return json.load(handle)
+	return _parse_file(path)
@@ -0,0 +1,167 @@
+"""Content-hash manifest used to skip unchanged work between validation runs.
+
+The manifest records two things:
+
+* `files`: a digest per input file, plus the `mtime_ns`/`size` it was taken at
+  so unchanged files are never re-read just to be hashed.
+* `units`: one entry per unit of validation work (e.g. "schema check of
+  records/skills.json"). Each entry stores the digest of the unit's own file
+  (`content`), a digest of its cross-file inputs (`deps`), the findings it
+  produced and any scene ids it cites (`scene_refs`).
+
+A unit is reused only when both digests still match; otherwise it is
+recomputed and its new entry replaces the old one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+from core import json_codec
+from core.io_safe import write_json_atomic
+
+MANIFEST_VERSION = 1
+MISSING_DIGEST = "missing"
+
+DepsFunction = Callable[[list[str]], str]
+
+
+def digest_bytes(*chunks: bytes) -> str:
+	hasher = hashlib.blake2b(digest_size=16)
+	for chunk in chunks:
+		hasher.update(chunk)
+		hasher.update(b"\0")
+	return hasher.hexdigest()
+
+
+def digest_values(values: Iterable[Any]) -> str:
+	"""Digest a sequence of JSON-serialisable values (order matters)."""
+	return digest_bytes(*(json.dumps(value, sort_keys=True, default=str).encode("utf-8") for value in values))
+
+
+def cached_file_digest(path: Path, pointer: Path) -> str:
+	"""Digest of *path*, re-hashed only when its mtime/size differ from those recorded in *pointer*."""
+	stat = Path(path).stat()
+	if pointer.exists():
+		try:
+			known = json_codec.loads(pointer.read_bytes())
+		except json.JSONDecodeError:
+			known = {}
+		if (known.get("mtime_ns"), known.get("size")) == (stat.st_mtime_ns, stat.st_size):
+			return known["digest"]
+	digest = digest_bytes(Path(path).read_bytes())
+	write_json_atomic(pointer, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest})
+	return digest
+
+
+def _no_deps(scene_refs: list[str]) -> str:
+	return ""
+
+
+class ValidationManifest:
+	"""Track file digests and cached unit results for incremental validation."""
+
+	def __init__(
+		self,
+		path: Optional[Path] = None,
+		previous: Optional[dict[str, Any]] = None,
+		*,
+		reuse: bool = True,
+		tracking: bool = True,
+	) -> None:
+		self.path = Path(path) if path is not None else None
+		self.tracking = tracking
+		if not (isinstance(previous, dict) and previous.get("version") == MANIFEST_VERSION and reuse):
+			previous = {}
+		self._previous_files: dict[str, dict[str, Any]] = previous.get("files", {})
+		self._previous_units: dict[str, dict[str, Any]] = previous.get("units", {})
+		self.files: dict[str, dict[str, Any]] = {}
+		self.units: dict[str, dict[str, Any]] = {}
+		self.reused = 0
+		self.computed_units: list[str] = []
+
+	@classmethod
+	def load(cls, path: Path, *, reuse: bool = True) -> "ValidationManifest":
+		previous: dict[str, Any] = {}
+		if reuse and Path(path).exists():
+			try:
+				previous = json_codec.loads(Path(path).read_bytes())
+			except json.JSONDecodeError:
+				previous = {}
+		return cls(path, previous, reuse=reuse)
+
+	@classmethod
+	def disabled(cls) -> "ValidationManifest":
+		"""A manifest that never hashes, never reuses and never writes."""
+		return cls(tracking=False)
+
+	# ----- files -----
+
+	def file_digest(self, path: Path) -> str:
+		if not self.tracking:
+			return ""
+		key = str(path)
+		current = self.files.get(key)
+		if current is not None:
+			return current["digest"]
+		try:
+			stat = Path(path).stat()
+		except FileNotFoundError:
+			return MISSING_DIGEST
+		previous = self._previous_files.get(key)
+		if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+			digest = previous["digest"]
+		else:
+			digest = digest_bytes(Path(path).read_bytes())
+		self.files[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+		return digest
+
+	# ----- units -----
+
+	def lookup(self, unit: str, content: str, deps: DepsFunction = _no_deps) -> Optional[dict[str, Any]]:
+		"""Return the previous result for *unit* if its content and dependency digests still match."""
+		if not self.tracking:
+			return None
+		entry = self.units.get(unit) or self._previous_units.get(unit)
+		if entry is None or entry.get("content") != content:
+			return None
+		if entry.get("deps") != deps(entry.get("scene_refs", [])):
+			return None
+		self.units[unit] = entry
+		self.reused += 1
+		return entry
+
+	def record(
+		self,
+		unit: str,
+		content: str,
+		deps: DepsFunction = _no_deps,
+		*,
+		errors: list[str],
+		scene_refs: Iterable[str] = (),
+		**extra: Any,
+	) -> dict[str, Any]:
+		scene_refs = sorted(set(scene_refs))
+		entry = {"content": content, "deps": deps(scene_refs), "errors": errors, "scene_refs": scene_refs, **extra}
+		self.computed_units.append(unit)
+		if self.tracking:
+			self.units[unit] = entry
+		return entry
+
+	@property
+	def computed(self) -> int:
+		return len(self.computed_units)
+
+	# ----- persistence -----
+
+	def to_dict(self) -> dict[str, Any]:
+		return {"version": MANIFEST_VERSION, "files": self.files, "units": self.units}
+
+	def save(self) -> None:
+		if self.path is None or not self.tracking:
+			return
+		write_json_atomic(self.path, self.to_dict())
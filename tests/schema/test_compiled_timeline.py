@@ -0,0 +1,51 @@
+import json
+import os
+from pathlib import Path
+
+from core.compiled_timeline import HEADER, compiled_cache_dir, load_compiled
+from tools.validate_ids import collect_event_id_findings
+
+
+def test_load_compiled_skips_compile_until_the_timeline_or_version_changes(tmp_path: Path) -> None:
+	timeline = tmp_path / "characters" / "hero" / "timeline.json"
+	timeline.parent.mkdir(parents=True)
+	timeline.write_text(json.dumps([{"event_id": "ev.hero.01.01.01.a", "order": 1}]), encoding="utf-8")
+	cache_dir = compiled_cache_dir(tmp_path / "cache", timeline)
+	assert cache_dir == tmp_path / "cache" / "hero"
+	calls = []
+
+	def compile():
+		calls.append(1)
+		return [(event["event_id"], event["order"]) for event in json.loads(timeline.read_text(encoding="utf-8"))]
+
+	first = load_compiled(timeline, cache_dir, name="ids", version=1, compile=compile)
+	assert load_compiled(timeline, cache_dir, name="ids", version=1, compile=compile) == first
+	assert first == [("ev.hero.01.01.01.a", 1)] and len(calls) == 1
+
+	load_compiled(timeline, cache_dir, name="ids", version=2, compile=compile)
+	assert len(calls) == 2 and len(list(cache_dir.glob("*.ids-v*.ctl"))) == 1
+
+	timeline.write_text("[]", encoding="utf-8")
+	os.utime(timeline, ns=(1, 1))
+	assert load_compiled(timeline, cache_dir, name="ids", version=2, compile=compile) == []
+	assert len(calls) == 3
+
+	(target,) = cache_dir.glob("*.ctl")
+	target.write_bytes(HEADER + b"\xff")  # corrupt copies are rebuilt, not trusted
+	assert load_compiled(timeline, cache_dir, name="ids", version=2, compile=compile) == []
+	assert len(calls) == 4
+
+
+def test_event_id_findings_from_the_compiled_cache_match_a_fresh_check(tmp_path: Path) -> None:
+	records_root = tmp_path / "records"
+	for hero, ids in {"hero": ["ev.hero.01.01.01.a", "bad id"], "sidekick": ["ev.hero.01.01.01.a", None]}.items():
+		path = records_root / "characters" / hero / "timeline.json"
+		path.parent.mkdir(parents=True)
+		path.write_text(json.dumps([{"event_id": event_id} for event_id in ids]), encoding="utf-8")
+
+	fresh = collect_event_id_findings(records_root, use_cache=False)
+	assert collect_event_id_findings(records_root) == fresh
+	assert collect_event_id_findings(records_root) == fresh
+	assert len(list((tmp_path / ".cache" / "compiled_timelines").glob("*/*.validate_ids-v*.ctl"))) == 2
+	errors, warnings = fresh
+	assert len(errors) == 2 and "duplicate" in errors[1] and len(warnings) == 1
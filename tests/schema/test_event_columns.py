@@ -0,0 +1,69 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from core.event_columns import EventColumns, load_columns, scene_key
+
+
+def _event(n: int, scene_id: str, kind: str, node: str, **extra) -> dict:
+	ref = {"type": "scene", "scene_id": scene_id, "line_start": n, "line_end": n + 1}
+	return {"event_id": f"ev.t.{n:03d}", "scene_id": scene_id, "order": n, "type": kind, "source_ref": [ref], **extra, **node}
+
+
+EVENTS = [
+	_event(3, "01.02.01", "skill_evolved", {"node_id": "sn.meditation.tier_2"}, epistemic_at={"scene_id": "01.01.01"}),
+	_event(1, "01.01.01", "skill_acquired", {"node_id": "sn.meditation.tier_1"}, notes="Säule ✓"),
+	_event(2, "01.01.02", "skill_evolved", {"skill_id": "sn.archery.tier_1"}),
+	_event(4, "01.03.01", "skill_upgraded", {"from_node_id": "sn.meditation.tier_2", "to_node_id": "sn.calm.tier_1"}),
+	_event(5, "02.01.01", "skill_evolved", {"node_id": "sn.meditation.tier_3"}),
+]
+
+
+def test_scene_keys_sort_like_scene_ids() -> None:
+	scenes = ["02.01.01", "01.10.01", "01.02.10", "01.02.09", "10.00.00"]
+	assert sorted(scenes, key=scene_key) == sorted(scenes)
+	for bad in ("1.2.3", "01-02-03", "01.02.03x", "01.02.031", "", None):
+		with pytest.raises(ValueError, match="BB.CC.SS"):
+			scene_key(bad)
+
+
+def test_select_matches_a_scan_over_event_dicts_and_survives_bytes_round_trip() -> None:
+	columns = EventColumns.from_bytes(EventColumns.from_events(EVENTS).to_bytes())
+	assert columns.events(range(len(EVENTS))) == EVENTS
+
+	rows = columns.select(types=["skill_evolved"], node_prefix="sn.meditation.", first="01.01.01", last="01.02.01")
+	assert [columns.event_ids[row] for row in rows] == ["ev.t.003"]
+	assert columns.event_ids[columns.select(node_prefix="sn.calm.")[0]] == "ev.t.004"
+	assert [columns.event_ids[row] for row in columns.select(node_prefix="sn.archery.")] == ["ev.t.002"]
+	reader = [columns.event_ids[row] for row in columns.select()]
+	character = [columns.event_ids[row] for row in columns.select(view="character", last="01.01.01")]
+	assert reader == ["ev.t.001", "ev.t.002", "ev.t.003", "ev.t.004", "ev.t.005"]
+	assert character == ["ev.t.001", "ev.t.003"]
+
+
+def test_load_columns_reuses_the_binary_cache_until_the_timeline_changes(tmp_path: Path) -> None:
+	timeline = tmp_path / "timeline.json"
+	timeline.write_text(json.dumps(EVENTS), encoding="utf-8")
+	reads = []
+
+	def read_events():
+		reads.append(1)
+		return json.loads(timeline.read_text(encoding="utf-8"))
+
+	cache_dir = tmp_path / "cache"
+	assert len(load_columns(timeline, cache_dir, read_events, version=1)) == 5
+	assert len(load_columns(timeline, cache_dir, read_events, version=1)) == 5
+	assert len(reads) == 1
+
+	timeline.write_text(json.dumps(EVENTS[:2]), encoding="utf-8")
+	os.utime(timeline, ns=(1, 1))
+	assert len(load_columns(timeline, cache_dir, read_events, version=1)) == 2
+	assert len(reads) == 2
+	assert len(list(cache_dir.glob("*.evc"))) == 1
+
+	# New checks invalidate columns built under the old ones.
+	assert len(load_columns(timeline, cache_dir, read_events, version=2)) == 2
+	assert len(reads) == 3
+	assert [path.name.endswith("-v2.evc") for path in cache_dir.glob("*.evc")] == [True]
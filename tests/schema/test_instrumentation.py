@@ -0,0 +1,52 @@
+import argparse
+import json
+from pathlib import Path
+
+from core import instrumentation
+from core.json_stream import iter_json_array
+from core.schema_utils import read_json
+
+
+def test_session_reports_phases_and_read_counters(tmp_path: Path) -> None:
+	record = tmp_path / "record.json"
+	record.write_text('{"a": 1}', encoding="utf-8")
+	timeline = tmp_path / "timeline.json"
+	timeline.write_text("[1, 2, 3]", encoding="utf-8")
+	metrics_out = tmp_path / "metrics.json"
+	args = argparse.Namespace(metrics_out=metrics_out, profile=False, profile_out=tmp_path / "profiles")
+
+	with instrumentation.session("demo", args):
+		with instrumentation.phase("load"):
+			read_json(record)
+			with instrumentation.phase("stream"):
+				assert [element.value for element in iter_json_array(timeline)] == [1, 2, 3]
+		with instrumentation.phase("load"):
+			read_json(record)
+	assert instrumentation.active() is None
+
+	report = json.loads(metrics_out.read_text(encoding="utf-8"))
+	phases = {phase["name"]: phase for phase in report["phases"]}
+	assert list(phases) == ["load", "load/stream"]
+	assert (phases["load"]["calls"], phases["load"]["files_read"]) == (2, 3)
+	assert phases["load/stream"]["bytes_read"] == len("[1, 2, 3]")
+	assert report["totals"]["files_read"] == 3
+	assert Path(phases["load"]["profile"]).exists()
+	assert "profile" not in phases["load/stream"]
+
+
+def test_phase_is_a_no_op_without_a_session() -> None:
+	args = argparse.Namespace(metrics_out=None, profile=False, profile_out=None)
+	with instrumentation.session("demo", args) as metrics:
+		assert metrics is None
+		with instrumentation.phase("anything"):
+			instrumentation.record_read(10)
+	assert instrumentation.active() is None
+
+
+def test_profile_flag_does_not_consume_positionals() -> None:
+	parser = argparse.ArgumentParser()
+	parser.add_argument("keywords", nargs="+")
+	instrumentation.add_arguments(parser)
+	args = parser.parse_args(["--profile", "Fireball"])
+	assert args.keywords == ["Fireball"]
+	assert args.profile and args.profile_out is None
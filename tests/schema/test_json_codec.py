@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from core import json_codec
+
+DOCUMENTS = [
+	{"skill_id": "sk.meditation", "tags": ["calm", "mana"], "notes": "tab\there  two  spaces\nnewline", "rank": None},
+	{"nested": [[{"deep": [1, 2.5, -0.0, 1e-05, 1e16, 12345678901234567890]}]], "empty": {}, "list": []},
+	["Meditation ✓", "😀", {"unicode_ключ": True}],
+	{"nan": float("nan"), "inf": float("-inf")},
+	{"del": "a\x7fb", "\x7f": ["\x7e\x7f\x80"], "small": [2.5e-05, -7.1e-05, 0.0001], "none": None},
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+@pytest.mark.parametrize("indent", ["\t", 2, 4])
+def test_dumps_matches_stdlib_byte_for_byte(document: object, ensure_ascii: bool, indent: object) -> None:
+	expected = json.dumps(document, indent=indent, ensure_ascii=ensure_ascii)
+	assert json_codec.dumps(document, indent=indent, ensure_ascii=ensure_ascii) == expected
+
+
+def test_loads_matches_stdlib_including_big_integers() -> None:
+	text = json.dumps({"id": 123456789012345678901234567890, "value": 0.1, "name": "Jake ✓"}, ensure_ascii=False)
+	assert json_codec.loads(text.encode("utf-8")) == json.loads(text)
+	assert json_codec.loads(text) == json.loads(text)
+	assert type(json_codec.loads(text.encode("utf-8"))["id"]) is int
+
+
+def test_loads_rejects_invalid_utf8_like_read_text() -> None:
+	with pytest.raises(UnicodeDecodeError):
+		json_codec.loads(b'{"name": "\xff"}')
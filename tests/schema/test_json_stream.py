@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from core.json_stream import JSONStreamError, NotAJSONArrayError, iter_json_array
+
+
+def test_iter_json_array_matches_json_loads_across_chunk_boundaries(tmp_path: Path) -> None:
+	events = [{"event_id": f"ev.hero.01.01.01.e{index}", "note": "Meditation ✓", "value": index * 0.5} for index in range(6)]
+	events.append(12345678901234567890)
+	raw = json.dumps(events, indent="\t", ensure_ascii=False).encode("utf-8")
+	path = tmp_path / "timeline.json"
+	path.write_bytes(raw)
+
+	for chunk_size in (1, 3, 64):
+		elements = list(iter_json_array(path, chunk_size=chunk_size))
+		assert [element.value for element in elements] == events
+		assert [element.index for element in elements] == list(range(len(events)))
+		for element in elements:
+			decoded, _ = json.JSONDecoder().raw_decode(raw[element.offset :].decode("utf-8"))
+			assert decoded == element.value
+
+
+@pytest.mark.parametrize(
+	("text", "error"),
+	[('{"event_id": 1}', NotAJSONArrayError), ("[1, 2", JSONStreamError), ('[{"a": }]', JSONStreamError)],
+)
+def test_iter_json_array_reports_bad_documents(tmp_path: Path, text: str, error: type) -> None:
+	path = tmp_path / "timeline.json"
+	path.write_text(text, encoding="utf-8")
+	with pytest.raises(error):
+		list(iter_json_array(path, chunk_size=2))
+
+
+def test_split_elements_decode_once_and_broken_ones_fail_early(tmp_path: Path, monkeypatch) -> None:
+	import core.json_stream as json_stream
+
+	decodes: list[int] = []
+	bytes_read: list[int] = []
+
+	class CountingDecoder(json.JSONDecoder):
+		def raw_decode(self, s, idx=0):
+			decodes.append(idx)
+			return super().raw_decode(s, idx)
+
+	original_fill = json_stream._Buffer.fill
+
+	def tracking_fill(self, size=0):
+		filled = original_fill(self, size)
+		bytes_read.append(self.bytes_read)
+		return filled
+
+	monkeypatch.setattr(json_stream.json, "JSONDecoder", CountingDecoder)
+	monkeypatch.setattr(json_stream._Buffer, "fill", tracking_fill)
+
+	big = {"notes": [f"line {index} \\ \"quoted\" [x]" for index in range(2000)]}
+	path = tmp_path / "timeline.json"
+	path.write_text(json.dumps([big, "tail"]), encoding="utf-8")
+	assert [element.value for element in iter_json_array(path, chunk_size=16)] == [big, "tail"]
+	assert len(decodes) <= 3  # optimistic attempt, one decode of the whole element, then "tail"
+
+	filler = ", ".join(['"padding padding padding"'] * 5000)
+	path.write_text('[{"a": [1}, ' + filler + "]", encoding="utf-8")
+	bytes_read.clear()
+	with pytest.raises(JSONStreamError) as excinfo:
+		list(iter_json_array(path, chunk_size=16))
+	assert excinfo.value.offset == 1
+	assert max(bytes_read) < 64
@@ -0,0 +1,65 @@
+from core.record_walker import RuleEngine, SharedWalk
+
+
+def test_rules_fire_once_in_document_order_with_lazy_pointers() -> None:
+	document = {
+		"alpha": {"tags": ["a"], "source_ref": [{"source_ref": {"scene_id": "01.01.01"}}]},
+		"entries": [{"tags": ["b"]}, {"nested": {"tags": "not-a-list"}}],
+	}
+	seen: list[tuple[str, str]] = []
+	engine = (
+		RuleEngine()
+		.on("tags", lambda value, pointer, out: out.append(("tags", pointer.slash())))
+		.on("source_ref", lambda value, pointer, out: out.append(("ref", pointer.dotted("<root>"))), descend=True)
+	)
+	engine.walk(document, seen)
+
+	assert seen == [
+		("tags", "alpha/tags"),
+		("ref", "alpha.source_ref"),
+		("ref", "alpha.source_ref[0].source_ref"),
+		("tags", "entries/0/tags"),
+		("tags", "entries/1/nested/tags"),
+	]
+
+
+def test_dotted_pointer_prefixes_root_only_for_leading_index() -> None:
+	pointers: list[str] = []
+	RuleEngine().on("tags", lambda value, pointer, out: out.append(pointer.dotted("<root>"))).walk(
+		[{"tags": []}], pointers
+	)
+	assert pointers == ["<root>[0].tags"]
+
+
+def test_shared_walk_visits_each_document_once_for_every_channel(tmp_path) -> None:
+	document = {"entry": {"tags": ["a"], "links": [{"type": "related_to"}]}}
+	path = tmp_path / "record.json"
+	engine = (
+		RuleEngine()
+		.on("tags", lambda value, pointer, out: out.append(pointer.slash()), channel="tags")
+		.on("links", lambda value, pointer, out: out.append(pointer.dotted()), channel="links")
+	)
+	loads: list[object] = []
+	walk = SharedWalk(lambda p: loads.append(p) or document, engine)
+	walk.subscribe("tags", [path], lambda p: [])
+	walk.subscribe("links", [tmp_path / "." / "record.json"], lambda p: [])
+
+	assert walk.context("links", path) == ["entry.links"]
+	assert walk.context("tags", path) == ["entry/tags"]
+	assert (walk.walks, len(loads)) == (1, 1)
+	# A channel asking again (or about a file it did not subscribe to) walks just for itself.
+	assert walk.context("tags", path) == ["entry/tags"]
+	assert walk.walks == 2
+
+
+def test_registering_the_same_rule_twice_is_a_no_op() -> None:
+	seen = []
+	engine = RuleEngine()
+
+	def rule(value, pointer, context):
+		seen.append((context, value))
+
+	for _ in range(2):
+		engine.on("tags", rule, channel="a").on("tags", rule, channel="b")
+	engine.walk({"tags": ["x"]}, {"a": "A", "b": "B"})
+	assert seen == [("A", ["x"]), ("B", ["x"])]
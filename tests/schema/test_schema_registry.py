@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from jsonschema import Draft202012Validator
+
+from core.schema_registry import SCHEMA_BASE_URI, SchemaRegistry
+
+TIMELINE_EVENT_URI = SCHEMA_BASE_URI + "timeline_event.schema.json"
+SOURCE_REF_URI = SCHEMA_BASE_URI + "shared/source_ref.schema.json"
+
+
+def test_registry_indexes_every_schema_without_loading() -> None:
+	registry = SchemaRegistry()
+	uris = registry.uris()
+	assert TIMELINE_EVENT_URI in uris
+	assert SOURCE_REF_URI in uris
+	assert registry.get(SOURCE_REF_URI)["$id"] == SOURCE_REF_URI
+
+
+def test_registry_for_loads_only_referenced_documents() -> None:
+	registry = SchemaRegistry()
+	schema = json.loads(Path("schemas/character_timeline.schema.json").read_text(encoding="utf-8"))
+	validator = Draft202012Validator(schema, registry=registry.registry_for(schema))
+	assert TIMELINE_EVENT_URI in registry.loaded_uris()
+	assert SCHEMA_BASE_URI + "skills.schema.json" not in registry.loaded_uris()
+
+	event = {"event_id": "ev.jake.01.02.01.acquire_meditation", "scene_id": "01.02.01", "order": 1}
+	assert list(validator.iter_errors([event]))
+
+
+def test_bundle_round_trip_and_staleness(tmp_path: Path) -> None:
+	schema_root = tmp_path / "schemas"
+	(schema_root / "shared").mkdir(parents=True)
+	fragment = {"$id": SCHEMA_BASE_URI + "shared/name.schema.json", "type": "string"}
+	(schema_root / "shared" / "name.schema.json").write_text(json.dumps(fragment), encoding="utf-8")
+
+	bundle_path = SchemaRegistry(schema_root).write_bundle(tmp_path / "bundle.json")
+	bundled = SchemaRegistry.from_bundle(bundle_path, schema_root)
+	assert bundled.loaded_uris() == [fragment["$id"]]
+
+	(schema_root / "shared" / "name.schema.json").write_text(json.dumps({**fragment, "minLength": 1}), encoding="utf-8")
+	stale = SchemaRegistry.from_bundle(bundle_path, schema_root)
+	assert stale.loaded_uris() == []
+	assert stale.get(fragment["$id"])["minLength"] == 1
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from core import schema_utils
+from core.schema_registry import SchemaRegistry
+from core.schema_utils import clear_validator_cache, get_validator, validate_many
+
+SCHEMA = {
+	"$id": "https://primal-hunter.local/schemas/test/cache.schema.json",
+	"type": "object",
+	"required": ["name"],
+	"properties": {"name": {"type": "string"}, "rank": {"type": "integer"}},
+}
+
+
+def test_get_validator_reuses_compiled_validator_for_equal_schemas() -> None:
+	clear_validator_cache()
+	first = get_validator(SCHEMA)
+	second = get_validator(json.loads(json.dumps(SCHEMA)))
+	assert first is second
+
+
+def test_path_validator_is_rebuilt_when_schema_file_changes(tmp_path: Path) -> None:
+	clear_validator_cache()
+	schema_path = tmp_path / "cache.schema.json"
+	schema_path.write_text(json.dumps(SCHEMA), encoding="utf-8")
+	first = get_validator(schema_path)
+	assert get_validator(schema_path) is first
+
+	schema_path.write_text(json.dumps({**SCHEMA, "required": ["name", "rank"]}), encoding="utf-8")
+	second = get_validator(schema_path)
+	assert second is not first
+	assert list(second.iter_errors({"name": "Meditation"}))
+	assert len(schema_utils._VALIDATOR_CACHE) == 1
+
+
+def test_validator_cache_evicts_least_recently_used(monkeypatch) -> None:
+	clear_validator_cache()
+	monkeypatch.setattr(schema_utils, "_VALIDATOR_CACHE_SIZE", 2)
+	schemas = [{**SCHEMA, "title": f"schema {index}"} for index in range(3)]
+	first = get_validator(schemas[0])
+	get_validator(schemas[1])
+	get_validator(schemas[0])
+	get_validator(schemas[2])
+	assert len(schema_utils._VALIDATOR_CACHE) == 2
+	assert get_validator(schemas[0]) is first
+
+
+def test_validate_many_reports_errors_per_instance() -> None:
+	results = validate_many([{"name": "Identify"}, {"rank": "one"}, {"name": "Archer", "rank": 2}], SCHEMA)
+	assert [len(issues) for issues in results] == [0, 2, 0]
+	assert {issue.pointer for issue in results[1]} == {"<root>", "rank"}
+	assert all(issue.index == 1 for issue in results[1])
+
+
+def test_schema_dict_is_digested_once_per_object(monkeypatch) -> None:
+	clear_validator_cache()
+	calls = []
+	digest = schema_utils._schema_digest
+	monkeypatch.setattr(schema_utils, "_schema_digest", lambda schema: calls.append(1) or digest(schema))
+	schema = json.loads(json.dumps(SCHEMA))
+	first = get_validator(schema)
+	for _ in range(5):
+		assert get_validator(schema) is first
+	assert len(calls) == 1
+
+
+def test_path_validator_is_rebuilt_when_a_referenced_schema_changes(tmp_path: Path, monkeypatch) -> None:
+	clear_validator_cache()
+	base = "https://primal-hunter.local/schemas/"
+	registry = SchemaRegistry(tmp_path, base)
+	monkeypatch.setattr(schema_utils, "default_registry", lambda: registry)
+	shared = tmp_path / "shared" / "name.schema.json"
+	shared.parent.mkdir()
+	shared.write_text(json.dumps({"$id": base + "shared/name.schema.json", "type": "string"}), encoding="utf-8")
+	schema_path = tmp_path / "record.schema.json"
+	schema_path.write_text(
+		json.dumps({"$id": base + "record.schema.json", "properties": {"name": {"$ref": base + "shared/name.schema.json"}}}),
+		encoding="utf-8",
+	)
+	first = get_validator(schema_path)
+	assert get_validator(schema_path) is first
+	assert not list(first.iter_errors({"name": "Meditation"}))
+
+	shared.write_text(json.dumps({"$id": base + "shared/name.schema.json", "type": "integer"}), encoding="utf-8")
+	second = get_validator(schema_path)
+	assert second is not first
+	assert list(second.iter_errors({"name": "Meditation"}))
+	assert len(schema_utils._VALIDATOR_CACHE) == 1
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from core.io_safe import WriteBatch, recover_write_journals
+
+DEAD_PID = 2**22 + 12345  # above Linux pid_max, so never a live process
+
+
+def test_batch_publishes_all_files_or_none(tmp_path: Path) -> None:
+	journal_dir = tmp_path / "journal"
+	first, second = tmp_path / "a.json", tmp_path / "nested" / "b.json"
+	first.write_text('{"old": true}', encoding="utf-8")
+
+	with pytest.raises(RuntimeError):
+		with WriteBatch(journal_dir) as batch:
+			batch.write_json(first, {"new": True})
+			raise RuntimeError("abort")
+	assert json.loads(first.read_text(encoding="utf-8")) == {"old": True}
+	assert not list(tmp_path.glob(".temp.*"))
+
+	with WriteBatch(journal_dir) as batch:
+		batch.write_json(first, {"new": 1})
+		batch.write_json(second, [1, 2])
+		batch.write_json(first, {"new": 2})
+	assert json.loads(first.read_text(encoding="utf-8")) == {"new": 2}
+	assert json.loads(second.read_text(encoding="utf-8")) == [1, 2]
+	assert not list(tmp_path.rglob(".temp.*")) and not list(journal_dir.glob("*"))
+
+
+def test_recovery_rolls_committed_batches_forward_and_staged_ones_back(tmp_path: Path) -> None:
+	journal_dir = tmp_path / "journal"
+	journal_dir.mkdir()
+	targets = [tmp_path / "a.json", tmp_path / "b.json"]
+	temps = [tmp_path / ".temp.a", tmp_path / ".temp.b"]
+	for temp in temps:
+		temp.write_text('"new"', encoding="utf-8")
+	targets[0].write_text('"new"', encoding="utf-8")  # first rename happened before the crash
+	temps[0].unlink()
+	targets[1].write_text('"old"', encoding="utf-8")
+	lines = [json.dumps({"target": str(target), "temp": str(temp)}) for target, temp in zip(targets, temps)]
+	(journal_dir / f"{DEAD_PID}-1.jsonl").write_text("\n".join([*lines, '{"state": "committing"}']) + "\n")
+
+	staged_temp = tmp_path / ".temp.c"
+	staged_temp.write_text("{", encoding="utf-8")
+	staged_line = json.dumps({"target": str(tmp_path / "c.json"), "temp": str(staged_temp)})
+	(journal_dir / f"{DEAD_PID}-2.jsonl").write_text(staged_line + "\n{\"tar")
+
+	assert recover_write_journals(journal_dir) == {f"{DEAD_PID}-1.jsonl": "forward", f"{DEAD_PID}-2.jsonl": "back"}
+	assert [json.loads(target.read_text(encoding="utf-8")) for target in targets] == ["new", "new"]
+	assert not staged_temp.exists() and not (tmp_path / "c.json").exists()
+	assert not list(journal_dir.iterdir())
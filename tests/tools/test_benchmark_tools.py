@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from tools import benchmark_tools
+from tools.benchmark_tools import compare, measure
+from tools.projector import project
+from tools.synth_corpus import Scale, generate
+from tools.validate_all_metadata import collect_validation_errors
+
+
+def test_synthetic_corpus_is_schema_valid_and_projectable(tmp_path: Path, monkeypatch) -> None:
+	scale = Scale(books=1, chapters=3, scenes=2, events=120, tags=40, characters=2)
+	summary = generate(tmp_path / "corpus", scale, seed=7)
+	assert summary["counts"]["scenes"] == 6
+	assert len(list((tmp_path / "corpus" / "chapters").rglob("*.md"))) == 3
+
+	monkeypatch.chdir(tmp_path / "corpus")
+	assert collect_validation_errors() == []
+	state = project(summary["samples"]["character"], summary["samples"]["last_scene"], repo_root=Path("."))
+	assert state["skills"]
+
+
+def test_compare_flags_only_regressions_past_tolerance() -> None:
+	baseline = {"tools": {"fast": {"wall_s": 1.0, "peak_rss_mib": 100.0}, "slow": {"wall_s": 1.0, "peak_rss_mib": 100.0}}}
+	results = {
+		"fast": {"wall_s": 1.2, "peak_rss_mib": 110.0},
+		"slow": {"wall_s": 1.3, "peak_rss_mib": 140.0},
+		"new": {"wall_s": 9.0, "peak_rss_mib": 900.0},
+	}
+	regressions = compare(results, baseline, tolerance=0.25, rss_tolerance=0.25)
+	assert len(regressions) == 2
+	assert all(message.startswith("slow:") for message in regressions)
+
+
+def test_compare_checks_cold_wall_time_when_both_sides_have_it() -> None:
+	baseline = {"tools": {"tool": {"wall_s": 1.0, "cold_wall_s": 2.0}, "old": {"wall_s": 1.0}}}
+	results = {"tool": {"wall_s": 1.0, "cold_wall_s": 3.0}, "old": {"wall_s": 1.0, "cold_wall_s": 9.0}}
+	assert compare(results, baseline, tolerance=0.25) == [
+		"tool: cold wall 3.000s > 2.500s (baseline 2.000s +25%)"
+	]
+
+
+def test_measure_runs_once_cold_before_the_warm_rounds(tmp_path: Path, monkeypatch) -> None:
+	(tmp_path / ".cache" / "compiled_timelines").mkdir(parents=True)
+	walls = iter([5.0, 1.5, 1.0])
+	seen_cache: list[bool] = []
+
+	def fake_run(spec, corpus):
+		seen_cache.append((corpus / ".cache").exists())
+		(corpus / ".cache").mkdir(exist_ok=True)
+		return {"wall_s": next(walls), "peak_rss_mib": 10.0, "exit_code": 0, "output_tail": ""}
+
+	monkeypatch.setattr(benchmark_tools, "run_once", fake_run)
+	result = measure(benchmark_tools.ToolSpec("demo", [], units=10), tmp_path, rounds=2)
+	assert seen_cache == [False, True, True]
+	assert (result["cold_wall_s"], result["wall_s"], result["per_second"]) == (5.0, 1.0, 10.0)
@@ -1,6 +1,11 @@
+import json
 from pathlib import Path
 
+import pytest
+
+from tools import export_rag_bundle
 from tools.export_rag_bundle import BUNDLE_FILENAMES, main as export_main
+from tools.synth_corpus import Scale, generate
 
 
 def test_export_rag_bundle_generates_outputs(tmp_path: Path) -> None:
@@ -12,3 +17,105 @@ def test_export_rag_bundle_generates_outputs(tmp_path: Path) -> None:
 		assert path.exists()
 		lines = path.read_text(encoding="utf-8").strip().splitlines()
 		assert lines and all(line.strip() for line in lines)
+
+
+def test_export_streams_rows_and_leaves_no_partial_bundle_on_failure(tmp_path: Path, monkeypatch) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=2, scenes=2, events=60, tags=10, characters=2), seed=7)
+	output_dir = tmp_path / "bundles"
+	monkeypatch.setattr(export_rag_bundle, "WRITE_BATCH_ROWS", 7)
+	assert export_main(["--records-root", str(root / "records"), "--output-dir", str(output_dir), "--no-validate"]) == 0
+	rows = [json.loads(line) for line in (output_dir / BUNDLE_FILENAMES["mechanics"]).read_text(encoding="utf-8").splitlines()]
+	assert len({row["id"] for row in rows}) == len(rows) > 7
+
+	entries = export_rag_bundle._iter_timeline_entries(root / "records")
+	first = next(export_rag_bundle._build_mechanics_rows(entries))
+	assert first == rows[0]  # builders are lazy generators over streamed events
+
+	timeline = root / "records" / "characters" / "synth_01" / "timeline.json"
+	timeline.write_text(timeline.read_text(encoding="utf-8")[:-10], encoding="utf-8")
+	before = {path.name: path.read_bytes() for path in output_dir.iterdir()}
+	with pytest.raises(ValueError):
+		export_main(["--records-root", str(root / "records"), "--output-dir", str(output_dir), "--no-validate"])
+	assert {path.name: path.read_bytes() for path in output_dir.iterdir()} == before
+
+
+def test_incremental_export_keeps_row_ids_and_emits_only_the_delta(tmp_path: Path) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=2, scenes=2, events=60, tags=10, characters=1), seed=7)
+	output_dir = tmp_path / "bundles"
+	argv = ["--records-root", str(root / "records"), "--output-dir", str(output_dir), "--no-validate"]
+
+	def mechanics() -> dict[str, dict]:
+		lines = (output_dir / BUNDLE_FILENAMES["mechanics"]).read_text(encoding="utf-8").splitlines()
+		return {row["id"]: row for row in map(json.loads, lines)}
+
+	def delta(name: str) -> list[dict]:
+		return [json.loads(line) for line in (output_dir / export_rag_bundle.DELTA_FILENAMES[name]).read_text(encoding="utf-8").splitlines()]
+
+	assert export_main(argv) == 0
+	before = mechanics()
+	timeline = root / "records" / "characters" / "synth_00" / "timeline.json"
+	events = json.loads(timeline.read_text(encoding="utf-8"))
+	with_notes = [index for index, event in enumerate(events) if event.get("notes")]
+	edited = events[with_notes[5]]
+	events.pop(with_notes[0])
+	edited["notes"] = "Edited note."
+	added = {**events[-1], "event_id": events[-1]["event_id"] + "_extra", "notes": "A new entry."}
+	timeline.write_text(json.dumps([*events, added]), encoding="utf-8")
+
+	assert export_main([*argv, "--incremental"]) == 0
+	after = mechanics()
+	assert [row["text"] for row in delta("added")] == ["A new entry."]
+	assert [row["text"].split("\n")[0] for row in delta("changed")] == ["Edited note."]
+	(gone,) = delta("deleted")
+	assert gone["bundle"] == "mechanics" and gone["id"] in before and gone["id"] not in after
+	unchanged = set(before) - {gone["id"]} - {row["id"] for row in delta("changed")}
+	assert all(after[row_id] == before[row_id] for row_id in unchanged)
+
+	assert export_main([*argv, "--incremental"]) == 0
+	assert not any(delta(name) for name in export_rag_bundle.DELTA_FILENAMES)
+	assert export_main(argv) == 0
+	assert not (output_dir / export_rag_bundle.DELTA_FILENAMES["added"]).exists()
+
+
+def test_export_reports_a_repeated_event_id_without_writing_bundles(tmp_path: Path, capsys) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=2, scenes=2, events=60, tags=10, characters=1), seed=7)
+	output_dir = tmp_path / "bundles"
+	timeline = root / "records" / "characters" / "synth_00" / "timeline.json"
+	events = json.loads(timeline.read_text(encoding="utf-8"))
+	first = next(event for event in events if event.get("notes"))
+	timeline.write_text(json.dumps([*events, {**first, "notes": "Same event, other text."}]), encoding="utf-8")
+
+	assert export_main(["--records-root", str(root / "records"), "--output-dir", str(output_dir), "--no-validate"]) == 1
+	assert f"synth_00: event_id '{first['event_id']}' appears more than once" in capsys.readouterr().out
+	assert not any(output_dir.glob("*.jsonl"))
+
+
+def test_legacy_entries_without_event_ids_keep_their_row_ids_across_edits(tmp_path: Path) -> None:
+	records = tmp_path / "records"
+	timeline = records / "jake" / "timeline.json"
+	timeline.parent.mkdir(parents=True)
+	span = [{"scene_id": "01.01.01", "line_start": 1, "line_end": 9, "type": "scene"}]
+	entries = [{"scene_id": "01.01.01", "notes": "Same note.", "source_ref": span} for _ in range(2)]
+	timeline.write_text(json.dumps(entries), encoding="utf-8")
+	output_dir = tmp_path / "bundles"
+	argv = ["--records-root", str(records), "--output-dir", str(output_dir), "--no-validate"]
+
+	def mechanics() -> list[dict]:
+		lines = (output_dir / BUNDLE_FILENAMES["mechanics"]).read_text(encoding="utf-8").splitlines()
+		return [json.loads(line) for line in lines]
+
+	assert export_main(argv) == 0
+	before = [row["id"] for row in mechanics()]
+	assert len(set(before)) == 2
+
+	entries[1]["notes"] = "Edited note."
+	timeline.write_text(json.dumps(entries), encoding="utf-8")
+	assert export_main([*argv, "--incremental"]) == 0
+	assert [row["id"] for row in mechanics()] == before
+	changed = (output_dir / export_rag_bundle.DELTA_FILENAMES["changed"]).read_text(encoding="utf-8").splitlines()
+	assert [json.loads(line)["id"] for line in changed] == [before[1]]
+	for name in ("added", "deleted"):
+		assert not (output_dir / export_rag_bundle.DELTA_FILENAMES[name]).read_text(encoding="utf-8")
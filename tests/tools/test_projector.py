@@ -0,0 +1,231 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from tools.projector import (
+	CheckpointCache,
+	KnowledgeIndex,
+	apply_scene_record,
+	compare_before_after,
+	compare_topics,
+	diff_scenes,
+	iter_scene_states,
+	project,
+	project_world,
+)
+from tools.synth_corpus import Scale, generate
+
+CHARACTER = "pc.synth_00"
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory) -> Path:
+	root = tmp_path_factory.mktemp("corpus")
+	generate(root, Scale(books=2, chapters=4, scenes=3, events=400, tags=10, characters=1), seed=3)
+	return root
+
+
+def _scene_ids(corpus: Path) -> list[str]:
+	paths = (corpus / "records" / "scene_index").rglob("*.json")
+	return sorted(path.stem for path in paths if not path.name.endswith(".meta.json"))
+
+
+@pytest.mark.parametrize("every", [37, "chapter"])
+@pytest.mark.parametrize("view", ["character", "reader"])
+def test_checkpointed_snapshots_match_full_replay(corpus: Path, tmp_path: Path, every, view: str) -> None:
+	checkpoints = CheckpointCache(cache_root=tmp_path / "cache", every=every)
+	for scene_id in ["00.00.00", *_scene_ids(corpus), "99.99.99"]:
+		expected = project(CHARACTER, scene_id, view=view, repo_root=corpus)
+		assert project(CHARACTER, scene_id, view=view, repo_root=corpus, checkpoints=checkpoints) == expected
+	assert checkpoints.builds == 1
+	# Segments hold only their state: every event and every source_ref is written once per cache entry.
+	segments = list((tmp_path / "cache").rglob("seg-*.json"))
+	assert len(segments) > 1
+	assert not any('"source_ref"' in path.read_text() or '"line_start"' in path.read_text() for path in segments)
+
+
+def test_checkpoints_rebuild_when_the_timeline_changes(corpus: Path, tmp_path: Path) -> None:
+	timeline = corpus / "records" / "characters" / "synth_00" / "timeline.json"
+	original = timeline.read_bytes()
+	checkpoints = CheckpointCache(cache_root=tmp_path / "cache", every=50)
+	last_scene = _scene_ids(corpus)[-1]
+	before = project(CHARACTER, last_scene, repo_root=corpus, checkpoints=checkpoints)
+	try:
+		events = json.loads(original)
+		events[-1]["knowledge_delta"] = [{"field_path": "cooldown", "new_value": "edited"}]
+		events[-1]["type"] = "skill_observation"
+		events[-1].setdefault("node_id", events[0]["node_id"])
+		events[-1].pop("from_node_id", None)
+		events[-1].pop("to_node_id", None)
+		timeline.write_text(json.dumps(events), encoding="utf-8")
+		os.utime(timeline, ns=(1, 1))
+		after = project(CHARACTER, last_scene, repo_root=corpus, checkpoints=checkpoints)
+		assert after == project(CHARACTER, last_scene, repo_root=corpus)
+		assert after != before
+		assert checkpoints.builds == 2
+		assert len(list((tmp_path / "cache" / "synth_00").glob("character-50-*"))) == 1
+	finally:
+		timeline.write_bytes(original)
+
+
+@pytest.mark.parametrize("full_every", [0, 3])
+@pytest.mark.parametrize("view", ["character", "reader"])
+def test_scene_range_stream_replays_to_per_scene_snapshots(corpus: Path, view: str, full_every: int) -> None:
+	scenes = _scene_ids(corpus)
+	first, last = scenes[2], scenes[-3]
+	state, emitted = None, []
+	for record in iter_scene_states(CHARACTER, first=first, last=last, view=view, repo_root=corpus, full_every=full_every):
+		emitted.append(record["kind"])
+		state = apply_scene_record(state, record)
+		assert state == project(CHARACTER, record["scene"], view=view, repo_root=corpus)
+	assert len(emitted) == len(scenes) - 4
+	assert emitted.count("full") == (1 if not full_every else -(-len(emitted) // full_every))
+
+
+def test_character_view_cuts_off_on_the_epistemic_clock(tmp_path: Path) -> None:
+	def event(n: int, scene_id: str, knew_at: str | None = None) -> dict:
+		ev = {
+			"event_id": f"ev.synth.{n}",
+			"scene_id": scene_id,
+			"order": 1,
+			"type": "skill_acquired",
+			"node_id": f"sn.synth.skill_{n}",
+			"source_ref": [{"type": "scene", "scene_id": scene_id, "line_start": 1, "line_end": 2}],
+		}
+		if knew_at:
+			ev["epistemic_at"] = {"scene_id": knew_at}
+		return ev
+
+	timeline = tmp_path / "records" / "characters" / "synth" / "timeline.json"
+	timeline.parent.mkdir(parents=True)
+	# Event 2 is revealed to the reader in chapter 3 but the character knew it in chapter 1.
+	events = [event(1, "01.01.01"), event(3, "01.02.01"), event(2, "01.03.01", knew_at="01.01.02")]
+	timeline.write_text(json.dumps(events), encoding="utf-8")
+
+	def known(scene_id: str, view: str) -> list[str]:
+		return sorted(project("pc.synth", scene_id, view=view, repo_root=tmp_path)["skills"])
+
+	assert known("01.01.02", "character") == ["sn.synth.skill_1", "sn.synth.skill_2"]
+	assert known("01.02.01", "character") == ["sn.synth.skill_1", "sn.synth.skill_2", "sn.synth.skill_3"]
+	assert known("01.02.01", "reader") == ["sn.synth.skill_1", "sn.synth.skill_3"]
+	checkpoints = CheckpointCache(cache_root=tmp_path / "cache", every=1)
+	assert project("pc.synth", "01.02.01", repo_root=tmp_path, checkpoints=checkpoints)["skills"].keys() == {
+		"sn.synth.skill_1",
+		"sn.synth.skill_2",
+		"sn.synth.skill_3",
+	}
+
+	with pytest.raises(ValueError, match="scene id must be BB.CC.SS"):
+		project("pc.synth", "1.2", repo_root=tmp_path, checkpoints=checkpoints)
+	events[2]["epistemic_at"] = {"scene_id": "1.1.2"}
+	timeline.write_text(json.dumps(events), encoding="utf-8")
+	with pytest.raises(ValueError, match="epistemic_at.scene_id"):
+		project("pc.synth", "01.02.01", repo_root=tmp_path)
+
+
+@pytest.mark.parametrize("use_columns", [True, False])
+def test_topic_batch_matches_one_compare_per_topic(corpus: Path, tmp_path: Path, use_columns: bool) -> None:
+	timeline = json.loads((corpus / "records" / "characters" / "synth_00" / "timeline.json").read_text(encoding="utf-8"))
+	nodes = sorted({ev[field] for ev in timeline for field in ("node_id", "from_node_id", "to_node_id") if field in ev})
+	topics = ["sn.", "sn.synth_00.skill_0000", "sn.nothing.", *nodes[::7], *(node.rsplit(".", 1)[0] + "." for node in nodes[::5])]
+	batch = compare_topics(CHARACTER, topics, repo_root=corpus, use_columns=use_columns)
+	assert batch == {topic: compare_before_after(CHARACTER, topic, repo_root=corpus, use_columns=False) for topic in topics}
+	assert len({verdict["verdict"] for verdict in batch.values()}) > 2
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_world_snapshot_merges_every_character_and_reports_broken_timelines(tmp_path: Path, jobs: int) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=3, scenes=2, events=90, tags=10, characters=4), seed=11)
+	(root / "records" / "characters" / "synth_02" / "timeline.json").write_text("{}", encoding="utf-8")
+	bad_delta = root / "records" / "characters" / "synth_03" / "timeline.json"
+	events = json.loads(bad_delta.read_text(encoding="utf-8"))
+	events[0]["knowledge_delta"] = [{"new_value": 1}]
+	bad_delta.write_text(json.dumps(events), encoding="utf-8")
+	world = project_world("01.02.01", repo_root=root, jobs=jobs, view="reader")
+	assert list(world["characters"]) == ["pc.synth_00", "pc.synth_01"]
+	for character_id, state in world["characters"].items():
+		assert state == project(character_id, "01.02.01", view="reader", repo_root=root)
+	assert list(world["errors"]) == ["pc.synth_02", "pc.synth_03"]
+	assert "knowledge_delta" in world["errors"]["pc.synth_03"]
+
+
+@pytest.mark.parametrize("view", ["character", "reader"])
+def test_scene_diff_accounts_for_every_change_between_two_snapshots(corpus: Path, view: str) -> None:
+	scenes = _scene_ids(corpus)
+	first, last = scenes[3], scenes[-4]
+	before = project(CHARACTER, first, view=view, repo_root=corpus)["skills"]
+	after = project(CHARACTER, last, view=view, repo_root=corpus)["skills"]
+	diff = diff_scenes(CHARACTER, first, last, view=view, repo_root=corpus)
+	nodes = diff["nodes"]
+
+	assert {node for node, change in nodes.items() if change["status"] in {"removed", "upgraded"}} == set(before) - set(after)
+	assert set(diff["skills_gained"]) == set(after) - set(before)
+	assert diff["skills_upgraded"] and all(nodes[up["to"]]["status"] == "gained" for up in diff["skills_upgraded"] if up["to"] in after)
+	for node, state in after.items():
+		change = nodes.get(node, {})
+		old = before.get(node) or before.get(change.get("upgraded_from"), {"facts": {}, "evidence": []})
+		expected = {k: {"old": old["facts"].get(k), "new": v} for k, v in state["facts"].items() if old["facts"].get(k, object()) != v}
+		assert change.get("facts_changed", {}) == expected
+		carried = len(old["evidence"]) if node in before else 0
+		if node in before:
+			assert change.get("evidence_added", []) == state["evidence"][carried:]
+
+
+def test_who_knew_agrees_with_every_projection_and_refreshes_one_timeline(tmp_path: Path) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=4, scenes=3, events=150, tags=10, characters=3), seed=5)
+	index = KnowledgeIndex(root)
+	assert index.refresh() == 3
+	characters = ["pc.synth_00", "pc.synth_01", "pc.synth_02"]
+	for scene_id in ["01.02.01", "01.04.03"]:
+		states = {c: project(c, scene_id, repo_root=root)["skills"] for c in characters}
+		for c, skills in states.items():
+			for node, state in skills.items():
+				for field, value in state["facts"].items():
+					answer = index.who_knew(node, field, scene_id)
+					assert answer["characters"][c]["value"] == value
+					assert set(answer["characters"]) == {o for o in characters if field in states[o].get(node, {}).get("facts", {})}
+
+	assert index.refresh() == 0
+	timeline = root / "records" / "characters" / "synth_01" / "timeline.json"
+	events = json.loads(timeline.read_text(encoding="utf-8"))
+	observed = next(ev for ev in events if ev["type"] == "skill_observation")
+	observed["knowledge_delta"] = [{"field_path": "lore.origin", "new_value": "edited"}]
+	timeline.write_text(json.dumps(events), encoding="utf-8")
+	os.utime(timeline, ns=(1, 1))
+	assert index.refresh() == 1
+	known = index.who_knew(observed["node_id"], "lore.origin", "99.99.99")["characters"]
+	assert list(known) == ["pc.synth_01"]
+	assert (known["pc.synth_01"]["event_id"], known["pc.synth_01"]["value"]) == (observed["event_id"], "edited")
+	assert index.who_knew(observed["node_id"], "lore.origin", "00.00.00")["characters"] == {}
+
+
+def test_knowledge_cache_is_keyed_by_the_event_checker_version_too(tmp_path: Path, monkeypatch) -> None:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=2, scenes=2, events=40, tags=5, characters=1), seed=2)
+	cache = root / ".cache" / "compiled_timelines" / "synth_00"
+	KnowledgeIndex(root).refresh()
+	before = sorted(path.name for path in cache.glob("*.knowledge-*"))
+	monkeypatch.setattr("tools.projector.CHECK_VERSION", 99)
+	KnowledgeIndex(root).refresh()
+	after = sorted(path.name for path in cache.glob("*.knowledge-*"))
+	assert len(before) == len(after) == 1 and before != after
+
+
+def test_column_cache_is_keyed_by_the_event_checker_version(tmp_path: Path, monkeypatch) -> None:
+	root = tmp_path / "corpus"
+	summary = generate(root, Scale(books=1, chapters=2, scenes=2, events=40, tags=5, characters=1), seed=2)
+	topic = summary["samples"]["topic"]
+	compare_before_after(CHARACTER, topic, repo_root=root)
+
+	def reject(ev: dict) -> dict:
+		raise ValueError("stricter check")
+
+	monkeypatch.setattr("tools.projector._check_event", reject)
+	assert compare_before_after(CHARACTER, topic, repo_root=root)  # same checks, cached columns
+	monkeypatch.setattr("tools.projector.CHECK_VERSION", 99)
+	with pytest.raises(ValueError, match="stricter check"):
+		compare_before_after(CHARACTER, topic, repo_root=root)
@@ -0,0 +1,86 @@
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from tools.projector import KnowledgeIndex, compare_before_after, diff_scenes, project
+from tools.projector_serve import ProjectorService, make_http_server, make_unix_server
+from tools.synth_corpus import Scale, generate
+
+CHARACTER = "pc.synth_00"
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+	root = tmp_path / "corpus"
+	generate(root, Scale(books=1, chapters=3, scenes=2, events=120, tags=10, characters=2), seed=5)
+	return root
+
+
+def _get(server, route: str):
+	url = f"http://127.0.0.1:{server.server_port}{route}"
+	try:
+		with urllib.request.urlopen(url) as response:
+			return response.status, json.loads(response.read())
+	except urllib.error.HTTPError as exc:
+		return exc.code, json.loads(exc.read())
+
+
+def test_http_queries_match_cli_and_cache_until_the_timeline_changes(corpus: Path) -> None:
+	summary = json.loads((corpus / "corpus.json").read_text(encoding="utf-8"))
+	scene, topic = summary["samples"]["middle_scene"], summary["samples"]["topic"]
+	service = ProjectorService(corpus)
+	server = make_http_server(service, port=0)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	try:
+		status, payload = _get(server, f"/snapshot?character={CHARACTER}&scene={scene}&view=reader")
+		assert status == 200 and payload == project(CHARACTER, scene, view="reader", repo_root=corpus)
+		_get(server, f"/snapshot?character={CHARACTER}&scene={scene}&view=reader")
+		status, payload = _get(server, f"/compare?character={CHARACTER}&topic={topic}")
+		assert payload == compare_before_after(CHARACTER, topic, repo_root=corpus)
+		cache = service.health()["cache"]
+		assert (cache["size"], cache["hits"], cache["misses"]) == (2, 1, 2)
+
+		timeline = corpus / "records" / "characters" / "synth_00" / "timeline.json"
+		events = json.loads(timeline.read_text(encoding="utf-8"))
+		timeline.write_text(json.dumps(events[: len(events) // 2]), encoding="utf-8")
+		os.utime(timeline, ns=(1, 1))
+		status, payload = _get(server, f"/snapshot?character={CHARACTER}&scene={scene}&view=reader")
+		assert payload == project(CHARACTER, scene, view="reader", repo_root=corpus)
+		assert service.reloads == 1 and service.misses == 3
+
+		status, payload = _get(server, f"/diff?character={CHARACTER}&from=01.01.01&to={scene}")
+		assert payload == diff_scenes(CHARACTER, "01.01.01", scene, repo_root=corpus)
+		skills = project(CHARACTER, scene, repo_root=corpus)["skills"]
+		node, field = next((node, next(iter(state["facts"]))) for node, state in skills.items() if state["facts"])
+		expected = KnowledgeIndex(corpus)
+		expected.refresh()
+		status, payload = _get(server, f"/who-knew?node={node}&field={field}&scene={scene}")
+		assert status == 200 and payload == expected.who_knew(node, field, scene)
+		assert _get(server, f"/snapshot?character=pc.nobody&scene={scene}")[0] == 404
+		assert _get(server, f"/snapshot?character={CHARACTER}&scene=1.2.3")[0] == 400
+	finally:
+		server.shutdown()
+		server.server_close()
+
+
+def test_unix_socket_answers_one_json_line_per_request(corpus: Path, tmp_path: Path) -> None:
+	socket_path = tmp_path / "projector.sock"
+	server = make_unix_server(ProjectorService(corpus), socket_path)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	try:
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+			client.connect(str(socket_path))
+			client.sendall(b'{"op": "snapshot", "character": "pc.synth_01", "scene": "99.99.99"}\n{"op": "nope"}\n')
+			with client.makefile("rb") as reader:
+				first, second = json.loads(reader.readline()), json.loads(reader.readline())
+	finally:
+		server.shutdown()
+		server.server_close()
+	assert first == {"ok": True, "result": project("pc.synth_01", "99.99.99", repo_root=corpus)}
+	assert second["ok"] is False
@@ -0,0 +1,35 @@
+import json
+import shutil
+from pathlib import Path
+
+from tools.validate_all_metadata import validate_all
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _copy_repo_data(target: Path) -> None:
+	for name in ("schemas", "records", "tagging"):
+		shutil.copytree(REPO_ROOT / name, target / name)
+
+
+def _write_broken_scenes(target: Path, count: int) -> None:
+	scene_dir = target / "records" / "scene_index" / "Book 01 - PH"
+	template = json.loads((scene_dir / "01.01.01.json").read_text(encoding="utf-8"))
+	for index in range(count):
+		broken = {**template, "scene_id": f"01.09.{index + 1:02d}", "chapter": "nine", "mood": [index]}
+		(scene_dir / f"01.09.{index + 1:02d}.json").write_text(json.dumps(broken), encoding="utf-8")
+
+
+def test_parallel_run_matches_serial_output(tmp_path: Path, monkeypatch, capsys) -> None:
+	_copy_repo_data(tmp_path)
+	_write_broken_scenes(tmp_path, 6)
+	monkeypatch.chdir(tmp_path)
+
+	serial_status = validate_all(jobs=1)
+	serial_output = capsys.readouterr().out
+	parallel_status = validate_all(jobs=3)
+	parallel_output = capsys.readouterr().out
+
+	assert serial_status == parallel_status == 1
+	assert "01.09.06.json: chapter" in serial_output
+	assert parallel_output == serial_output
@@ -0,0 +1,65 @@
+import json
+import shutil
+from pathlib import Path
+
+from core.validation_manifest import ValidationManifest
+from tools.validate_all_metadata import validate_all
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MANIFEST = Path(".cache") / "validation_manifest.json"
+SCENE_PATH = Path("records") / "scene_index" / "Book 01 - PH" / "01.02.01.json"
+TIMELINE_PATH = Path("records") / "characters" / "hero" / "timeline.json"
+
+
+def _prepare_tree(target: Path) -> None:
+	for name in ("schemas", "records", "tagging"):
+		shutil.copytree(REPO_ROOT / name, target / name)
+	timeline = [
+		{
+			"scene_id": "01.01.01",
+			"skills": ["Skill Nobody Has"],
+			"source_ref": [{"type": "scene", "scene_id": "01.01.01", "line_start": 1, "line_end": 5}],
+		}
+	]
+	(target / TIMELINE_PATH).parent.mkdir(parents=True)
+	(target / TIMELINE_PATH).write_text(json.dumps(timeline), encoding="utf-8")
+
+
+def _run(capsys, *, reuse: bool = True) -> tuple[ValidationManifest, str]:
+	manifest = ValidationManifest.load(MANIFEST, reuse=reuse)
+	validate_all(manifest=manifest)
+	return manifest, capsys.readouterr().out
+
+
+def test_unchanged_tree_reuses_every_unit_and_keeps_findings(tmp_path: Path, monkeypatch, capsys) -> None:
+	_prepare_tree(tmp_path)
+	monkeypatch.chdir(tmp_path)
+
+	first, first_output = _run(capsys)
+	assert first.reused == 0 and first.computed > 0
+	assert "'Skill Nobody Has' missing from records/skills.json" in first_output
+
+	second, second_output = _run(capsys)
+	assert second.computed == 0
+	assert second_output.split("\n", 1)[1] == first_output.split("\n", 1)[1]
+
+	full, _ = _run(capsys, reuse=False)
+	assert full.reused == 0 and full.computed == first.computed
+
+
+def test_scene_bounds_change_only_invalidates_citing_units(tmp_path: Path, monkeypatch, capsys) -> None:
+	_prepare_tree(tmp_path)
+	monkeypatch.chdir(tmp_path)
+	_run(capsys)
+
+	scene = json.loads(SCENE_PATH.read_text(encoding="utf-8"))
+	scene["end_line"] += 10
+	SCENE_PATH.write_text(json.dumps(scene, indent="\t"), encoding="utf-8")
+
+	manifest, _ = _run(capsys)
+	recomputed = set(manifest.computed_units)
+	assert f"schema:{SCENE_PATH}" in recomputed
+	assert "canonical:records/skills.json" in recomputed
+	assert f"timeline:{TIMELINE_PATH}" not in recomputed
+	assert "schema:records/skills.json" not in recomputed
+	assert "tags:records/skills.json" not in recomputed
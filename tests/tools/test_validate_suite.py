@@ -0,0 +1,44 @@
+import shutil
+from collections import Counter
+from pathlib import Path
+
+import core.record_store as record_store
+from core.record_store import RecordStore
+from tools.validate import run_all
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_suite_parses_each_records_file_once(tmp_path: Path, monkeypatch, capsys) -> None:
+	for name in ("schemas", "records", "tagging"):
+		shutil.copytree(REPO_ROOT / name, tmp_path / name)
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.setattr("tools.validate.RECORDS_ROOT", tmp_path / "records")
+	monkeypatch.setattr("tools.validate.TAG_REGISTRY_PATH", tmp_path / "tagging" / "tag_registry.json")
+
+	parsed: Counter[str] = Counter()
+	original_read_json = record_store.read_json
+
+	def counting_read_json(path):
+		parsed[str(path)] += 1
+		return original_read_json(path)
+
+	monkeypatch.setattr(record_store, "read_json", counting_read_json)
+	store = RecordStore()
+	run_all(allow_inline=True, store=store)
+
+	assert parsed and max(parsed.values()) == 1
+	assert store.hits > 0
+	assert str(tmp_path / "records" / "skills.json") in parsed
+	assert "Parsed" in capsys.readouterr().out
+
+
+def test_store_reparses_after_file_changes(tmp_path: Path) -> None:
+	path = tmp_path / "record.json"
+	path.write_text('{"a": 1}', encoding="utf-8")
+	store = RecordStore()
+	assert store.load(path) == {"a": 1}
+	assert store.load(tmp_path / "." / "record.json") == {"a": 1}
+	path.write_text('{"a": 22}', encoding="utf-8")
+	assert store.load(path) == {"a": 22}
+	assert (store.parses, store.hits) == (2, 1)
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+from core.file_watcher import PollingWatcher
+from tools.validate_watch import ValidationDaemon, make_server
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCENE_PATH = Path("records") / "scene_index" / "Book 01 - PH" / "01.01.01.json"
+
+
+def test_daemon_revalidates_only_changed_units_and_serves_results(tmp_path: Path, monkeypatch) -> None:
+	for name in ("schemas", "records", "tagging"):
+		shutil.copytree(REPO_ROOT / name, tmp_path / name)
+	monkeypatch.chdir(tmp_path)
+	watcher = PollingWatcher([Path("records")], interval=0.01)
+
+	daemon = ValidationDaemon()
+	first = daemon.revalidate()
+	assert first["ok"] and first["revalidated"] > 0
+
+	scene = json.loads(SCENE_PATH.read_text(encoding="utf-8"))
+	scene["chapter"] = "one"
+	SCENE_PATH.write_text(json.dumps(scene), encoding="utf-8")
+	changed = watcher.wait(1)
+	assert changed == {SCENE_PATH}
+
+	second = daemon.revalidate(changed)
+	assert not second["ok"]
+	assert 0 < second["revalidated"] < first["revalidated"]
+
+	server = make_server(daemon, port=0)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	try:
+		url = f"http://127.0.0.1:{server.server_port}/results?path={SCENE_PATH}".replace(" ", "%20")
+		with urllib.request.urlopen(url) as response:
+			payload = json.loads(response.read())
+	finally:
+		server.shutdown()
+		server.server_close()
+	assert payload["generation"] == 2
+	assert payload["errors"] and all(error.startswith(f"{SCENE_PATH}:") for error in payload["errors"])
+
+
+def test_watch_mode_reports_each_finding_once(tmp_path: Path) -> None:
+	# `validate_all_metadata.py --watch` runs as __main__ and imports itself again via validate_watch.
+	for name in ("schemas", "records", "tagging"):
+		shutil.copytree(REPO_ROOT / name, tmp_path / name)
+	equipment = tmp_path / "records" / "equipment.json"
+	records = json.loads(equipment.read_text(encoding="utf-8"))
+	first = next(entry for entry in (records.values() if isinstance(records, dict) else records) if "tags" in entry)
+	first["tags"].append("NotSnake")
+	equipment.write_text(json.dumps(records), encoding="utf-8")
+	with socket.socket() as probe:
+		probe.bind(("127.0.0.1", 0))
+		port = probe.getsockname()[1]
+
+	env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+	process = subprocess.Popen(
+		[sys.executable, str(REPO_ROOT / "tools" / "validate_all_metadata.py"), "--watch", "--poll", "--port", str(port)],
+		cwd=tmp_path,
+		env=env,
+		stdout=subprocess.DEVNULL,
+		stderr=subprocess.DEVNULL,
+	)
+	try:
+		deadline = time.monotonic() + 60
+		payload = {"generation": 0}
+		while payload["generation"] < 1 and time.monotonic() < deadline:
+			time.sleep(0.1)
+			try:
+				with urllib.request.urlopen(f"http://127.0.0.1:{port}/results") as response:
+					payload = json.loads(response.read())
+			except OSError:
+				assert process.poll() is None
+	finally:
+		process.terminate()
+		process.wait(10)
+	assert payload["generation"] == 1
+	not_snake = [error for error in payload["errors"] if "NotSnake" in error]
+	assert not_snake
+	assert len(payload["errors"]) == len(set(payload["errors"]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark `core.json_codec` against the stdlib on the real `records/` corpus.
+
+Every JSON file under the given roots is read and re-serialised in the repo's
+tab-indented format, first with `json` and then with `core.json_codec`. The
+run fails (exit 1) if the codec ever returns different objects or different
+bytes, so the reported speedup is only shown for identical output.
+
+Example:
+	python tools/benchmark_json_codec.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+	sys.path.insert(0, str(REPO_ROOT))
+
+from core import json_codec  # noqa: E402  # imported after sys.path fix
+
+DEFAULT_ROOTS = (REPO_ROOT / "records", REPO_ROOT / "schemas", REPO_ROOT / "tagging")
+
+
+def _best_of(rounds: int, operation: Callable[[], Any]) -> float:
+	best = float("inf")
+	for _ in range(rounds):
+		started = time.perf_counter()
+		operation()
+		best = min(best, time.perf_counter() - started)
+	return best
+
+
+def run(roots: list[Path], rounds: int) -> int:
+	paths = sorted(path for root in roots for path in root.rglob("*.json"))
+	raw = [path.read_bytes() for path in paths]
+	documents = [json.loads(payload.decode("utf-8")) for payload in raw]
+
+	mismatches = []
+	for path, payload, document in zip(paths, raw, documents):
+		if json_codec.loads(payload) != document:
+			mismatches.append(f"{path}: decoded objects differ")
+		for ensure_ascii in (False, True):
+			expected = json.dumps(document, indent="\t", ensure_ascii=ensure_ascii)
+			if json_codec.dumps(document, indent="\t", ensure_ascii=ensure_ascii) != expected:
+				mismatches.append(f"{path}: encoded text differs (ensure_ascii={ensure_ascii})")
+	if mismatches:
+		for mismatch in mismatches:
+			print(f"❌ {mismatch}")
+		return 1
+
+	size_kib = sum(len(payload) for payload in raw) / 1024
+	timings = {
+		"read": (
+			_best_of(rounds, lambda: [json.loads(payload.decode("utf-8")) for payload in raw]),
+			_best_of(rounds, lambda: [json_codec.loads(payload) for payload in raw]),
+		),
+		"write": (
+			_best_of(rounds, lambda: [json.dumps(document, indent="\t", ensure_ascii=False) for document in documents]),
+			_best_of(rounds, lambda: [json_codec.dumps(document) for document in documents]),
+		),
+	}
+	print(f"📦 {len(paths)} files, {size_kib:.1f} KiB, best of {rounds} round(s); codec backend: {json_codec.BACKEND}")
+	print(f"{'':<6} {'stdlib ms':>10} {'codec ms':>10} {'speedup':>8}")
+	for label, (stdlib_seconds, codec_seconds) in timings.items():
+		speedup = stdlib_seconds / codec_seconds if codec_seconds else float("inf")
+		print(f"{label:<6} {stdlib_seconds * 1000:>10.2f} {codec_seconds * 1000:>10.2f} {speedup:>7.1f}x")
+	print("✅ Output is byte-identical to json.dumps(indent='\\t').")
+	return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("roots", nargs="*", type=Path, default=list(DEFAULT_ROOTS), help="Directories to scan")
+	parser.add_argument("--rounds", type=int, default=10, help="Repetitions per measurement (default: %(default)s)")
+	args = parser.parse_args(argv)
+	return run(args.roots, max(1, args.rounds))
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
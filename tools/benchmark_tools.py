@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Time each tool's entry point on a synthetic corpus and guard against regressions.
+
+Every tool runs as a fresh subprocess from the corpus root (the same way it
+runs from a checkout), so wall time includes interpreter start-up, imports
+and schema compilation. Each tool first runs once cold, with the corpus
+`.cache` (compiled timelines, columns, checkpoints) removed, then *rounds*
+times warm; both wall times are reported. Peak RSS comes from the child's
+own rusage. Results are compared with a stored baseline. The run fails (exit 1) when any tool
+is slower, or uses more memory, than the baseline plus the tolerance.
+
+Example:
+	python tools/synth_corpus.py --scale medium
+	python tools/benchmark_tools.py --scale medium --update-baseline   # once, on a quiet machine
+	python tools/benchmark_tools.py --scale medium                     # later: fails on regressions
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+	sys.path.insert(0, str(REPO_ROOT))
+
+from core.io_safe import write_json_atomic  # noqa: E402  # imported after sys.path fix
+from tools.synth_corpus import SCALES, SUMMARY_FILENAME, generate, load_summary  # noqa: E402
+
+BASELINE_DIR = REPO_ROOT / ".cache" / "benchmarks"
+DEFAULT_TOLERANCE = 0.25
+SCRATCH_DIRNAME = ".bench_out"
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+	name: str
+	argv: list[str]
+	units: int
+	unit: str = "files"
+
+
+def tool_specs(summary: dict[str, Any], scratch: Path) -> list[ToolSpec]:
+	"""Command lines (relative to the corpus root) for every benchmarked tool."""
+	counts, samples = summary["counts"], summary["samples"]
+	per_character = counts["events"] // counts["characters"]
+	tools = REPO_ROOT / "tools"
+	return [
+		ToolSpec("validate_all_metadata", [str(tools / "validate_all_metadata.py")], counts["record_files"]),
+		ToolSpec(
+			"projector.snapshot",
+			[
+				str(tools / "projector.py"),
+				"snapshot",
+				"--character",
+				samples["character"],
+				"--scene",
+				samples["last_scene"],
+			],
+			per_character,
+			"events",
+		),
+		ToolSpec(
+			"projector.compare",
+			[str(tools / "projector.py"), "compare", "--character", samples["character"], "--topic", samples["topic"]],
+			per_character,
+			"events",
+		),
+		ToolSpec(
+			"export_rag_bundle",
+			[str(tools / "export_rag_bundle.py"), "--records-root", "records", "--output-dir", str(scratch / "bundles")],
+			counts["scenes"] + counts["characters"],
+		),
+		ToolSpec(
+			"search_term_mentions",
+			[
+				str(tools / "search_term_mentions.py"),
+				samples["search_term"],
+				"--chapters-root",
+				"chapters",
+				"--output-root",
+				str(scratch / "search"),
+			],
+			counts["chapter_files"],
+		),
+	]
+
+
+def _peak_rss_mib(max_rss: int) -> float:
+	# ru_maxrss is KiB on Linux and bytes on macOS.
+	return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def run_once(spec: ToolSpec, corpus: Path) -> dict[str, Any]:
+	"""Run *spec* once from *corpus*; return wall seconds, peak RSS (MiB, when measurable) and exit code."""
+	env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]))}
+	with tempfile.TemporaryFile() as output:
+		started = time.perf_counter()
+		process = subprocess.Popen(
+			[sys.executable, *spec.argv], cwd=corpus, env=env, stdout=output, stderr=subprocess.STDOUT
+		)
+		peak_rss = None
+		if hasattr(os, "wait4"):
+			_, status, usage = os.wait4(process.pid, 0)
+			process.returncode = os.waitstatus_to_exitcode(status)
+			peak_rss = round(_peak_rss_mib(usage.ru_maxrss), 1)
+		else:  # pragma: no cover - Windows
+			process.wait()
+		wall = time.perf_counter() - started
+		output.seek(0)
+		tail = output.read()[-2000:].decode("utf-8", "replace")
+	return {"wall_s": wall, "peak_rss_mib": peak_rss, "exit_code": process.returncode, "output_tail": tail}
+
+
+def clear_corpus_cache(corpus: Path) -> None:
+	"""Drop the caches tools keep under *corpus*/.cache so the next run starts cold."""
+	shutil.rmtree(corpus / ".cache", ignore_errors=True)
+
+
+def measure(spec: ToolSpec, corpus: Path, rounds: int) -> dict[str, Any]:
+	"""One cold run, then the best warm wall time over *rounds* runs; peak RSS is the highest of all."""
+	clear_corpus_cache(corpus)
+	cold = run_once(spec, corpus)
+	runs = [cold, *(run_once(spec, corpus) for _ in range(rounds))]
+	failed = next((run for run in runs if run["exit_code"] != 0), None)
+	wall = min(run["wall_s"] for run in runs[1:])
+	rss_values = [run["peak_rss_mib"] for run in runs if run["peak_rss_mib"] is not None]
+	result = {
+		"wall_s": round(wall, 4),
+		"cold_wall_s": round(cold["wall_s"], 4),
+		"peak_rss_mib": max(rss_values) if rss_values else None,
+		"units": spec.units,
+		"unit": spec.unit,
+		"per_second": round(spec.units / wall, 1) if wall else None,
+		"exit_code": failed["exit_code"] if failed else 0,
+	}
+	if failed:
+		result["output_tail"] = failed["output_tail"]
+	return result
+
+
+def compare(
+	results: dict[str, dict[str, Any]],
+	baseline: dict[str, Any],
+	*,
+	tolerance: float = DEFAULT_TOLERANCE,
+	rss_tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+	"""Return one message per metric that regressed past the baseline (tools missing from it are skipped)."""
+	regressions = []
+	for name, result in results.items():
+		previous = baseline.get("tools", {}).get(name)
+		if previous is None:
+			continue
+		for key, label in (("wall_s", "wall"), ("cold_wall_s", "cold wall")):
+			if result.get(key) is None or previous.get(key) is None:
+				continue
+			limit = previous[key] * (1 + tolerance)
+			if result[key] > limit:
+				regressions.append(
+					f"{name}: {label} {result[key]:.3f}s > {limit:.3f}s (baseline {previous[key]:.3f}s +{tolerance:.0%})"
+				)
+		if result.get("peak_rss_mib") is not None and previous.get("peak_rss_mib") is not None:
+			rss_limit = previous["peak_rss_mib"] * (1 + rss_tolerance)
+			if result["peak_rss_mib"] > rss_limit:
+				regressions.append(
+					f"{name}: peak RSS {result['peak_rss_mib']:.1f} MiB > {rss_limit:.1f} MiB "
+					f"(baseline {previous['peak_rss_mib']:.1f} MiB +{rss_tolerance:.0%})"
+				)
+	return regressions
+
+
+def _print_table(results: dict[str, dict[str, Any]], baseline: Optional[dict[str, Any]]) -> None:
+	print(f"{'tool':<24} {'cold s':>9} {'wall s':>9} {'base s':>9} {'peak MiB':>9} {'throughput':>20}")
+	for name, result in results.items():
+		previous = (baseline or {}).get("tools", {}).get(name)
+		base = f"{previous['wall_s']:.3f}" if previous else "-"
+		cold = f"{result['cold_wall_s']:.3f}" if result.get("cold_wall_s") is not None else "-"
+		rss = f"{result['peak_rss_mib']:.1f}" if result["peak_rss_mib"] is not None else "n/a"
+		rate = f"{result['per_second']:,.0f} {result['unit']}/s" if result["per_second"] else "-"
+		print(f"{name:<24} {cold:>9} {result['wall_s']:>9.3f} {base:>9} {rss:>9} {rate:>20}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--scale", choices=sorted(SCALES), default="smoke", help="Corpus preset (default: %(default)s)")
+	parser.add_argument("--corpus", type=Path, default=None, help="Corpus root (default: .cache/synth/<scale>)")
+	parser.add_argument("--tools", default=None, help="Comma-separated subset of tools to run (default: all)")
+	parser.add_argument(
+		"--rounds",
+		type=int,
+		default=3,
+		help="Warm runs per tool after the cold one; the best warm wall time counts (default: %(default)s)",
+	)
+	parser.add_argument("--baseline", type=Path, default=None, help="Baseline file (default: .cache/benchmarks/<scale>.json)")
+	parser.add_argument("--update-baseline", action="store_true", help="Record this run as the new baseline")
+	parser.add_argument(
+		"--tolerance",
+		type=float,
+		default=DEFAULT_TOLERANCE,
+		help="Allowed wall-time slowdown vs baseline (default: %(default)s = 25%%)",
+	)
+	parser.add_argument(
+		"--rss-tolerance",
+		type=float,
+		default=DEFAULT_TOLERANCE,
+		help="Allowed peak RSS growth vs baseline (default: %(default)s)",
+	)
+	parser.add_argument("--json-out", type=Path, default=None, help="Also write this run's results to PATH")
+	return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:  # noqa: C901
+	args = parse_args(argv)
+	corpus = (args.corpus or REPO_ROOT / ".cache" / "synth" / args.scale).resolve()
+	if not (corpus / SUMMARY_FILENAME).exists():
+		print(f"🧪 Generating {args.scale} corpus in {corpus} ...")
+		generate(corpus, SCALES[args.scale], force=True)
+	summary = load_summary(corpus)
+	baseline_path = args.baseline or BASELINE_DIR / f"{args.scale}.json"
+
+	scratch = corpus / SCRATCH_DIRNAME
+	specs = tool_specs(summary, scratch)
+	if args.tools:
+		wanted = {name.strip() for name in args.tools.split(",") if name.strip()}
+		unknown = wanted - {spec.name for spec in specs}
+		if unknown:
+			print(f"❌ Unknown tool(s): {', '.join(sorted(unknown))}")
+			return 2
+		specs = [spec for spec in specs if spec.name in wanted]
+
+	results: dict[str, dict[str, Any]] = {}
+	try:
+		for spec in specs:
+			results[spec.name] = measure(spec, corpus, max(1, args.rounds))
+	finally:
+		shutil.rmtree(scratch, ignore_errors=True)
+
+	baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+	if baseline is not None and baseline.get("counts") != summary["counts"]:
+		print(f"⚠️  {baseline_path} was recorded on a different corpus; not comparing.")
+		baseline = None
+	print(f"📦 Corpus {corpus}: {summary['counts']}")
+	_print_table(results, baseline)
+
+	report = {
+		"counts": summary["counts"],
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"tools": results,
+	}
+	if args.json_out:
+		write_json_atomic(args.json_out, report)
+
+	failures = [f"{name}: exited with {result['exit_code']}" for name, result in results.items() if result["exit_code"]]
+	for name, result in results.items():
+		if result["exit_code"]:
+			print(f"\n--- {name} output (tail) ---\n{result['output_tail']}")
+	if failures:
+		print("\n❌ Tool failures:")
+		for failure in failures:
+			print(f" - {failure}")
+		return 1
+
+	if args.update_baseline:
+		write_json_atomic(baseline_path, report)
+		print(f"📌 Baseline written to {baseline_path}")
+		return 0
+	if baseline is None:
+		print(f"ℹ️  No baseline at {baseline_path}; re-run with --update-baseline to record one.")
+		return 0
+	regressions = compare(results, baseline, tolerance=args.tolerance, rss_tolerance=args.rss_tolerance)
+	if regressions:
+		print("\n❌ Performance regressions:")
+		for regression in regressions:
+			print(f" - {regression}")
+		return 1
+	print("✅ No tool regressed past the baseline.")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
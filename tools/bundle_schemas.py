@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Write every schema under `schemas/` into a single pre-resolved bundle file."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+	sys.path.insert(0, str(REPO_ROOT))
+
+from core.schema_registry import SCHEMA_BUNDLE_PATH, SCHEMA_ROOT, SchemaRegistry  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="Bundle all schemas (keyed by $id) into one JSON file.")
+	parser.add_argument(
+		"--schemas-root",
+		type=Path,
+		default=SCHEMA_ROOT,
+		help="Directory containing *.schema.json files (default: %(default)s)",
+	)
+	parser.add_argument(
+		"--output",
+		type=Path,
+		default=SCHEMA_BUNDLE_PATH,
+		help="Bundle file to write (default: %(default)s)",
+	)
+	return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+	args = parse_args(argv)
+	registry = SchemaRegistry(args.schemas_root)
+	output = registry.write_bundle(args.output)
+	print(f"✅ Bundled {len(registry.uris())} schemas into {output}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
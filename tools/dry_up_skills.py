@@ -5,15 +5,16 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Optional
 
-from core.io_safe import write_json_atomic
+from core.io_safe import WriteBatch, write_json_atomic
 
 SKILLS_PATH = Path("records/skills.json")
 KNOWN_SKILLS_ROOT = Path("records/characters")
 
 
-def scrub_skills_catalog(skills_path: Path) -> bool:
-	"""Remove deprecated fields from the canonical skills catalog."""
+def scrub_skills_catalog(skills_path: Path, batch: Optional[WriteBatch] = None) -> bool:
+	"""Remove deprecated fields from the canonical skills catalog (staged in *batch* when given)."""
 	if not skills_path.exists():
 		raise FileNotFoundError(f"Skills catalog not found: {skills_path}")
 
@@ -26,18 +27,18 @@ def scrub_skills_catalog(skills_path: Path) -> bool:
 			removed = True
 
 	if removed:
-		write_json_atomic(skills_path, skills, ensure_ascii=False, indent=2)
+		(batch.write_json if batch else write_json_atomic)(skills_path, skills, ensure_ascii=False, indent=2)
 	return removed
 
 
-def scrub_known_skills(root: Path) -> list[Path]:
-	"""Strip obsolete provenance hints from character known_skills files."""
+def scrub_known_skills(root: Path, batch: Optional[WriteBatch] = None) -> list[Path]:
+	"""Strip obsolete provenance hints from character known_skills files (staged in *batch* when given)."""
 	if not root.exists():
 		return []
 
 	updated_files: list[Path] = []
 
-	for path in root.rglob("known_skills.json"):
+	for path in sorted(root.rglob("known_skills.json")):
 		known = json.loads(path.read_text(encoding="utf-8"))
 		changed = False
 
@@ -48,21 +49,26 @@ def scrub_known_skills(root: Path) -> list[Path]:
 				changed = True
 
 		if changed:
-			write_json_atomic(path, known, ensure_ascii=False, indent=2)
+			(batch.write_json if batch else write_json_atomic)(path, known, ensure_ascii=False, indent=2)
 			updated_files.append(path)
 
 	return updated_files
 
 
 def main() -> None:
-	"""Entry point for the metadata cleanup script."""
-	skills_updated = scrub_skills_catalog(SKILLS_PATH)
+	"""Entry point for the metadata cleanup script.
+
+	All rewrites land together: either every file is updated or none is.
+	"""
+	with WriteBatch() as batch:
+		skills_updated = scrub_skills_catalog(SKILLS_PATH, batch)
+		changed_files = scrub_known_skills(KNOWN_SKILLS_ROOT, batch)
+
 	if skills_updated:
 		print("✅ Removed legacy first_mentioned_in blocks from skills.json")
 	else:
 		print("✅ No legacy first_mentioned_in fields found in skills.json")
 
-	changed_files = scrub_known_skills(KNOWN_SKILLS_ROOT)
 	if changed_files:
 		print("✅ Cleaned redundant source_file entries from known_skills.json:")
 		for file_path in changed_files:
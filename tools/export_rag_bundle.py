@@ -1,15 +1,37 @@
 #!/usr/bin/env python3
-"""Generate retrieval bundles for downstream RAG pipelines."""
+"""Generate retrieval bundles for downstream RAG pipelines.
+
+The export is a streaming pipeline: scene files are read one at a time and
+timeline events are streamed with `iter_json_array`; each builder is a
+generator, and every row goes straight to its bundle through a writer that
+flushes in batches of `WRITE_BATCH_ROWS`. Memory stays flat however large the
+corpus grows, and rows reach disk while later files are still being read.
+
+Row ids are content-derived (scene ids for style/story rows; the span's
+anchor hash plus the event id for mechanics rows), so a row keeps its id
+when other entries change. Legacy entries without an `event_id` use their
+position among the id-less entries citing the same span instead, so editing
+their text reports a change rather than a delete plus an add. Each export records `row id → content hash` in
+`export_manifest.json`; with `--incremental` the rows that are new, changed
+or gone since the previous export are also written to `added.jsonl`,
+`changed.jsonl` and `deleted.jsonl` for downstream upserts.
+"""
 
 from __future__ import annotations
 
 import argparse
 import hashlib
 import json
+import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, TextIO
 
+from core import instrumentation
+from core.io_safe import write_json_atomic
+from core.json_stream import NotAJSONArrayError, iter_json_array
 from core.schema_utils import load_schema, read_json, validate_instance
+from core.validation_manifest import digest_bytes
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 RECORDS_ROOT = REPO_ROOT / "records"
@@ -21,6 +43,14 @@ BUNDLE_FILENAMES = {
 	"mechanics": "bundle_mechanics.jsonl",
 	"story": "bundle_story.jsonl",
 }
+DELTA_FILENAMES = {
+	"added": "added.jsonl",
+	"changed": "changed.jsonl",
+	"deleted": "deleted.jsonl",
+}
+MANIFEST_FILENAME = "export_manifest.json"
+MANIFEST_VERSION = 1
+WRITE_BATCH_ROWS = 512
 
 
 def _relative(path: Path) -> str:
@@ -30,45 +60,41 @@ def _relative(path: Path) -> str:
 		return str(path)
 
 
+class DuplicateRowIdError(ValueError):
+	"""Two rows of one export would share an id (manifest entries and deltas are keyed by it)."""
+
+
 def _anchor_hash(*components: str) -> str:
 	data = "::".join(components).encode("utf-8")
 	return hashlib.blake2s(data, digest_size=12).hexdigest()
 
 
-def _read_scene_files(scene_root: Path) -> list[dict[str, Any]]:
-	scenes: list[dict[str, Any]] = []
+def _iter_scene_files(scene_root: Path) -> Iterator[dict[str, Any]]:
+	"""Yield scene records in path order, reading each file only when it is reached."""
 	if not scene_root.exists():
-		return scenes
+		return
 	for path in sorted(scene_root.rglob("*.json")):
 		if path.name.endswith(".meta.json"):
 			continue
 		scene = read_json(path)
 		if isinstance(scene, dict) and "scene_id" in scene:
-			scenes.append(scene)
-	return scenes
+			yield scene
 
 
-def _collect_timeline_entries(records_root: Path) -> list[tuple[str, dict[str, Any]]]:
-	entries: list[tuple[str, dict[str, Any]]] = []
-	candidate_dirs: list[Path] = []
+def _iter_timeline_entries(records_root: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+	"""Yield `(character, event)` for every timeline event, streaming one event at a time."""
 	characters_dir = records_root / "characters"
-	if characters_dir.exists():
-		candidate_dirs.append(characters_dir)
-	else:
-		candidate_dirs.append(records_root)
-
-	for base_dir in candidate_dirs:
-		for timeline_path in sorted(base_dir.glob("*/timeline.json")):
-			if not timeline_path.is_file():
-				continue
-			timeline = read_json(timeline_path)
-			if not isinstance(timeline, list):
-				continue
-			character = timeline_path.parent.name
-			for event in timeline:
+	base_dir = characters_dir if characters_dir.exists() else records_root
+	for timeline_path in sorted(base_dir.glob("*/timeline.json")):
+		if not timeline_path.is_file():
+			continue
+		character = timeline_path.parent.name
+		try:
+			for _index, _offset, event in iter_json_array(timeline_path):
 				if isinstance(event, dict):
-					entries.append((character, event))
-	return entries
+					yield character, event
+		except NotAJSONArrayError:
+			continue
 
 
 def _build_scene_provenance(scene: dict[str, Any]) -> list[dict[str, Any]]:
@@ -103,8 +129,7 @@ def _ensure_tags(values: Iterable[str]) -> list[str]:
 	return list(seen.keys())
 
 
-def _build_style_rows(scenes: list[dict[str, Any]]) -> list[dict[str, Any]]:
-	rows: list[dict[str, Any]] = []
+def _build_style_rows(scenes: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
 	for scene in scenes:
 		scene_id = scene.get("scene_id")
 		if not isinstance(scene_id, str):
@@ -133,12 +158,10 @@ def _build_style_rows(scenes: list[dict[str, Any]]) -> list[dict[str, Any]]:
 			"source_ids": [f"scene:{scene_id}"],
 			"provenance": _build_scene_provenance(scene),
 		}
-		rows.append(row)
-	return rows
+		yield row
 
 
-def _build_story_rows(scenes: list[dict[str, Any]]) -> list[dict[str, Any]]:
-	rows: list[dict[str, Any]] = []
+def _build_story_rows(scenes: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
 	for scene in scenes:
 		scene_id = scene.get("scene_id")
 		summary = scene.get("summary")
@@ -162,12 +185,12 @@ def _build_story_rows(scenes: list[dict[str, Any]]) -> list[dict[str, Any]]:
 			"source_ids": [f"scene:{scene_id}"],
 			"provenance": _build_scene_provenance(scene),
 		}
-		rows.append(row)
-	return rows
+		yield row
 
 
-def _build_mechanics_rows(entries: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
-	rows: list[dict[str, Any]] = []
+def _build_mechanics_rows(entries: Iterable[tuple[str, dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+	seen_event_ids: set[tuple[str, str]] = set()
+	legacy_positions: dict[tuple[str, str], int] = {}
 	for character, entry in entries:
 		source = _first_source_ref(entry)
 		if not source:
@@ -177,6 +200,18 @@ def _build_mechanics_rows(entries: list[tuple[str, dict[str, Any]]]) -> list[dic
 		line_end = source.get("line_end")
 		if not isinstance(scene_id, str) or not isinstance(line_start, int) or not isinstance(line_end, int):
 			continue
+		anchor_hash = _anchor_hash(scene_id, "mechanics", str(line_start), str(line_end))
+		# Stable across exports: the row's span plus its event, or, for legacy entries without an id,
+		# its position among the id-less entries citing that span (edits to the text keep the id).
+		event_key = entry.get("event_id")
+		if isinstance(event_key, str):
+			if (character, event_key) in seen_event_ids:
+				raise DuplicateRowIdError(f"{character}: event_id '{event_key}' appears more than once in its timeline")
+			seen_event_ids.add((character, event_key))
+		else:
+			position = legacy_positions.get((character, anchor_hash), 0)
+			legacy_positions[(character, anchor_hash)] = position + 1
+			event_key = f"#{position}"
 
 		notes = entry.get("notes") or entry.get("reason") or ""
 		skills = entry.get("skills") or []
@@ -200,31 +235,120 @@ def _build_mechanics_rows(entries: list[tuple[str, dict[str, Any]]]) -> list[dic
 			continue
 
 		tags = _ensure_tags(entry.get("tags", []))
+		text = "\n".join(text_sections)
 		row = {
-			"id": f"mechanics.{character}.{scene_id}.{len(rows) + 1}",
-			"text": "\n".join(text_sections),
+			"id": f"mechanics.{character}.{scene_id}.{_anchor_hash(anchor_hash, event_key)}",
+			"text": text,
 			"span": {
 				"scene_id": scene_id,
 				"line_start": line_start,
 				"line_end": line_end,
-				"anchor_hash": _anchor_hash(scene_id, "mechanics", str(line_start), str(line_end)),
+				"anchor_hash": anchor_hash,
 			},
 			"weights": {"certainty": 0.85, "tone": 0.2, "mechanics": 0.95},
 			"tags": _ensure_tags(tags + ["mechanics", f"character-{character}"]),
 			"source_ids": [f"timeline:{character}", f"scene:{scene_id}"],
 			"provenance": [source],
 		}
-		rows.append(row)
-	return rows
+		yield row
 
 
-def _write_jsonl(path: Path, rows: list[dict[str, Any]], schema: dict[str, Any] | None) -> None:
-	path.parent.mkdir(parents=True, exist_ok=True)
-	with path.open("w", encoding="utf-8") as handle:
-		for row in rows:
-			if schema is not None:
-				validate_instance(row, schema)
-			handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+def _build_scene_rows(scenes: Iterable[dict[str, Any]]) -> Iterator[tuple[str, dict[str, Any]]]:
+	"""Style and story rows for each scene in one pass, tagged with their bundle name."""
+	for scene in scenes:
+		for row in _build_style_rows((scene,)):
+			yield "style", row
+		for row in _build_story_rows((scene,)):
+			yield "story", row
+
+
+class _BundleWriter:
+	"""Validate and append rows to one JSONL bundle, writing them out every *batch_rows* rows.
+
+	Rows go to a temporary file next to *path*; `commit` moves it into place,
+	so a failed export never leaves a truncated bundle behind.
+	"""
+
+	def __init__(self, path: Path, schema: dict[str, Any] | None, batch_rows: int = WRITE_BATCH_ROWS) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		self.path = path
+		self.rows = 0
+		self._schema = schema
+		self._batch_rows = batch_rows
+		self._pending: list[str] = []
+		# A plain open (not mkstemp) so the bundle gets the usual umask permissions, not 0600.
+		self._temp_path = path.with_name(f".{path.name}.tmp")
+		self._handle: TextIO = self._temp_path.open("w", encoding="utf-8")
+
+	def write(self, row: dict[str, Any]) -> str:
+		"""Validate and queue *row*; return its encoded line."""
+		if self._schema is not None:
+			validate_instance(row, self._schema)
+		line = json.dumps(row, ensure_ascii=False) + "\n"
+		self.write_line(line)
+		return line
+
+	def write_line(self, line: str) -> None:
+		self._pending.append(line)
+		self.rows += 1
+		if len(self._pending) >= self._batch_rows:
+			self._flush()
+
+	def _flush(self) -> None:
+		self._handle.write("".join(self._pending))
+		self._handle.flush()
+		self._pending.clear()
+
+	def commit(self) -> None:
+		self._flush()
+		self._handle.close()
+		os.replace(self._temp_path, self.path)
+
+	def discard(self) -> None:
+		self._handle.close()
+		self._temp_path.unlink(missing_ok=True)
+
+
+class _RowLedger:
+	"""`row id → content hash` for this export, diffed against the previous manifest when *deltas* are given."""
+
+	def __init__(self, previous: dict[str, str], deltas: dict[str, _BundleWriter] | None) -> None:
+		self.rows: dict[str, str] = {}
+		self._previous = previous
+		self._deltas = deltas
+
+	@staticmethod
+	def load(path: Path) -> dict[str, str]:
+		"""Row hashes from a previous export's manifest (empty when missing or from another version)."""
+		manifest = read_json(path)
+		if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+			return {}
+		return manifest.get("rows", {})
+
+	def record(self, row_id: str, line: str) -> None:
+		"""Hash *line* under *row_id*; an id may only occur once per export (deltas are keyed by it)."""
+		if row_id in self.rows:
+			raise DuplicateRowIdError(f"row id '{row_id}' would be written twice in one export")
+		digest = digest_bytes(line.encode("utf-8"))
+		self.rows[row_id] = digest
+		if self._deltas is None:
+			return
+		previous = self._previous.pop(row_id, None)
+		if previous is None:
+			self._deltas["added"].write_line(line)
+		elif previous != digest:
+			self._deltas["changed"].write_line(line)
+
+	def finish(self) -> None:
+		"""Write a deletion for every previous row this export did not produce."""
+		if self._deltas is None:
+			return
+		for row_id in self._previous:
+			bundle = row_id.split(".", 1)[0]
+			self._deltas["deleted"].write_line(json.dumps({"id": row_id, "bundle": bundle}, ensure_ascii=False) + "\n")
+
+	def save(self, path: Path) -> None:
+		write_json_atomic(path, {"version": MANIFEST_VERSION, "rows": self.rows}, indent=None)
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -246,31 +370,68 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 		action="store_true",
 		help="Skip validating rows against schemas/export_bundle.schema.json",
 	)
+	parser.add_argument(
+		"--incremental",
+		action="store_true",
+		help=f"Also write {', '.join(DELTA_FILENAMES.values())} against the previous {MANIFEST_FILENAME}",
+	)
+	instrumentation.add_arguments(parser)
 	return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
 	args = parse_args(argv)
-	scenes = _read_scene_files(args.records_root / "scene_index")
-	timeline_entries = _collect_timeline_entries(args.records_root)
+	with instrumentation.session("export_rag_bundle", args):
+		return _export(args)
 
-	if not scenes:
-		print("⚠️  No scenes found; bundles will be empty.")
-	if not timeline_entries:
-		print("⚠️  No timeline entries found; mechanics bundle may be empty.")
 
-	rows = {
-		"style": _build_style_rows(scenes),
-		"story": _build_story_rows(scenes),
-		"mechanics": _build_mechanics_rows(timeline_entries),
-	}
+def _counted(items: Iterable[Any], counts: dict[str, int], key: str) -> Iterator[Any]:
+	for item in items:
+		counts[key] += 1
+		yield item
 
-	schema = None if args.no_validate else load_schema(SCHEMA_PATH)
 
-	for bundle_name, filename in BUNDLE_FILENAMES.items():
-		out_path = args.output_dir / filename
-		_write_jsonl(out_path, rows[bundle_name], schema)
-		print(f"✅ Wrote {len(rows[bundle_name])} rows to {_relative(out_path)}")
+def _export(args: argparse.Namespace) -> int:
+	schema = None if args.no_validate else load_schema(SCHEMA_PATH)
+	manifest_path = args.output_dir / MANIFEST_FILENAME
+	writers = {name: _BundleWriter(args.output_dir / filename, schema) for name, filename in BUNDLE_FILENAMES.items()}
+	deltas = None
+	if args.incremental:
+		deltas = {name: _BundleWriter(args.output_dir / filename, None) for name, filename in DELTA_FILENAMES.items()}
+	ledger = _RowLedger(_RowLedger.load(manifest_path) if deltas is not None else {}, deltas)
+	outputs = [*writers.values(), *(deltas or {}).values()]
+	counts = {"scenes": 0, "events": 0}
+	try:
+		with instrumentation.phase("scenes"):
+			scenes = _counted(_iter_scene_files(args.records_root / "scene_index"), counts, "scenes")
+			for bundle_name, row in _build_scene_rows(scenes):
+				ledger.record(row["id"], writers[bundle_name].write(row))
+		with instrumentation.phase("timelines"):
+			entries = _counted(_iter_timeline_entries(args.records_root), counts, "events")
+			for row in _build_mechanics_rows(entries):
+				ledger.record(row["id"], writers["mechanics"].write(row))
+		ledger.finish()
+	except BaseException as exc:
+		for writer in outputs:
+			writer.discard()
+		if isinstance(exc, DuplicateRowIdError):
+			print(f"❌ {exc}; no bundles were written.")
+			return 1
+		raise
+	for writer in outputs:
+		writer.commit()
+	if deltas is None:
+		# Deltas from an earlier --incremental run no longer describe this export.
+		for filename in DELTA_FILENAMES.values():
+			(args.output_dir / filename).unlink(missing_ok=True)
+	ledger.save(manifest_path)
+
+	if not counts["scenes"]:
+		print("⚠️  No scenes found; bundles will be empty.")
+	if not counts["events"]:
+		print("⚠️  No timeline entries found; mechanics bundle may be empty.")
+	for writer in outputs:
+		print(f"✅ Wrote {writer.rows} rows to {_relative(writer.path)}")
 
 	return 0
 
@@ -10,129 +10,609 @@
 # - Tagging: only approved tags should influence flags (mvp: ignore)       :contentReference[oaicite:15]{index=15}
 # ─────────────────────────────────────────────────────────────────────────────
 
-import argparse, json, re, sys
+from __future__ import annotations
+
+import argparse, json, os, re, shutil, sys, tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core import instrumentation, json_codec  # noqa: E402  # imported after sys.path fix
+from core.compiled_timeline import compiled_cache_dir, load_compiled  # noqa: E402
+from core.event_columns import EventColumns, load_columns, scene_key  # noqa: E402
+from core.io_safe import write_json_atomic  # noqa: E402
+from core.json_stream import NotAJSONArrayError, iter_json_array  # noqa: E402
+from core.validation_manifest import cached_file_digest  # noqa: E402
+
 SCENE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}$")  # dotted BB.CC.SS (we adopted this)
 ID_RE     = re.compile(r"^[a-z0-9_]+(\.[a-z0-9_]+)*$")  # validated after split by namespace
 
-def _load_timeline(character_id: str, repo_root: Path) -> list[dict]:
-    """Load and minimally validate a character timeline. We keep it boring on purpose."""
-    p = repo_root / "records" / "characters" / character_id.split(".", 1)[-1] / "timeline.json"
-    data = json.loads(p.read_text(encoding="utf-8"))
-    if not isinstance(data, list):
-        raise ValueError("timeline.json must be an array of events (ordered)")
-    for ev in data:
-        # Must have IDs and receipts. Contracts are not suggestions.  :contentReference[oaicite:17]{index=17} :contentReference[oaicite:18]{index=18}
-        event_id = ev.get("event_id")
-        if not (isinstance(event_id, str) and event_id.startswith("ev.")):
-            raise ValueError(f"bad event_id: {event_id!r}")
-        scene_id = ev.get("scene_id")
-        if not (isinstance(scene_id, str) and SCENE_RE.match(scene_id)):
-            raise ValueError(f"scene_id must be BB.CC.SS, got {scene_id!r}")
-        order = ev.get("order")
-        if not (isinstance(order, int) and order >= 1):
-            raise ValueError(f"order must be >=1, got {order!r}")
-        sref = ev.get("source_ref")
-        if not (isinstance(sref, list) and sref):
-            raise ValueError(f"every event needs source_ref[] ({event_id})")
-        for r in sref:
-            # Minimal Source-Ref checks; full schema lives elsewhere.  :contentReference[oaicite:19]{index=19}
-            if r.get("type", "scene") not in {"scene","wiki","user","inferred","external"}:
-                raise ValueError(f"invalid source_ref.type in {event_id}")
-            if r.get("type","scene") == "scene":
-                sr_scene = r.get("scene_id","")
-                if not SCENE_RE.match(sr_scene):
-                    raise ValueError(f"source_ref.scene_id must be BB.CC.SS (event {event_id})")
-                line_start = int(r.get("line_start",0))
-                line_end = int(r.get("line_end",0))
-                if line_start < 1 or line_end < line_start:
-                    raise ValueError(f"invalid source_ref line range in {event_id}")
-    return data
+def _timeline_path(character_id: str, repo_root: Path) -> Path:
+    return repo_root / "records" / "characters" / character_id.split(".", 1)[-1] / "timeline.json"
 
-def _sort_key(ev: dict, view: str) -> tuple:
-    """Stable ordering. Reader view = book order; character view prefers epistemic clock when present."""
+def _check_event(ev: dict) -> dict:
+    """Minimal per-event contract checks. We keep it boring on purpose."""
+    if not isinstance(ev, dict):
+        raise ValueError(f"timeline events must be objects, got {type(ev).__name__}")
+    # Must have IDs and receipts. Contracts are not suggestions.  :contentReference[oaicite:17]{index=17} :contentReference[oaicite:18]{index=18}
+    event_id = ev.get("event_id")
+    if not (isinstance(event_id, str) and event_id.startswith("ev.")):
+        raise ValueError(f"bad event_id: {event_id!r}")
+    scene_id = ev.get("scene_id")
+    if not (isinstance(scene_id, str) and SCENE_RE.match(scene_id)):
+        raise ValueError(f"scene_id must be BB.CC.SS, got {scene_id!r}")
+    if "epistemic_at" in ev:
+        epistemic = ev["epistemic_at"]
+        epi_scene = epistemic.get("scene_id") if isinstance(epistemic, dict) else None
+        if not (isinstance(epi_scene, str) and SCENE_RE.match(epi_scene)):
+            raise ValueError(f"epistemic_at.scene_id must be BB.CC.SS, got {epi_scene!r} ({event_id})")
+    order = ev.get("order")
+    if not (isinstance(order, int) and order >= 1):
+        raise ValueError(f"order must be >=1, got {order!r}")
+    sref = ev.get("source_ref")
+    if not (isinstance(sref, list) and sref):
+        raise ValueError(f"every event needs source_ref[] ({event_id})")
+    for r in sref:
+        # Minimal Source-Ref checks; full schema lives elsewhere.  :contentReference[oaicite:19]{index=19}
+        if not isinstance(r, dict):
+            raise ValueError(f"source_ref entries must be objects ({event_id})")
+        if r.get("type", "scene") not in {"scene","wiki","user","inferred","external"}:
+            raise ValueError(f"invalid source_ref.type in {event_id}")
+        if r.get("type","scene") == "scene":
+            sr_scene = r.get("scene_id","")
+            if not (isinstance(sr_scene, str) and SCENE_RE.match(sr_scene)):
+                raise ValueError(f"source_ref.scene_id must be BB.CC.SS (event {event_id})")
+            line_start, line_end = r.get("line_start", 0), r.get("line_end", 0)
+            if not (isinstance(line_start, int) and isinstance(line_end, int)):
+                raise ValueError(f"source_ref line_start/line_end must be integers ({event_id})")
+            if line_start < 1 or line_end < line_start:
+                raise ValueError(f"invalid source_ref line range in {event_id}")
+    # Shapes replay relies on, so a bad event fails here as a ValueError instead of mid-replay.
+    deltas = ev.get("knowledge_delta", [])
+    if not (isinstance(deltas, list)
+            and all(isinstance(d, dict) and isinstance(d.get("field_path"), str) for d in deltas)):
+        raise ValueError(f"knowledge_delta must be a list of objects with a field_path ({event_id})")
+    tags = ev.get("tags", [])
+    if not (isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)):
+        raise ValueError(f"tags must be a list of strings ({event_id})")
+    return ev
+
+def _iter_timeline(character_id: str, repo_root: Path):
+    """Stream checked events one at a time (constant memory, however long the timeline gets)."""
+    p = _timeline_path(character_id, repo_root)
+    try:
+        for _, _, ev in iter_json_array(p):
+            yield _check_event(ev)
+    except NotAJSONArrayError:
+        raise ValueError("timeline.json must be an array of events (ordered)") from None
+
+CHECK_VERSION = 3  # bump whenever _check_event changes: it keys the compiled-timeline and event-column caches
+
+def _load_timeline(character_id: str, repo_root: Path, *, cache: bool = True) -> list[dict]:
+    """Load and minimally validate a character timeline.
+    With *cache*, checked events come from .cache/compiled_timelines/<character>/ while the file is unchanged."""
+    if not cache:
+        return list(_iter_timeline(character_id, repo_root))
+    path = _timeline_path(character_id, repo_root)
+    return load_compiled(path, compiled_cache_dir(repo_root / ".cache" / "compiled_timelines", path),
+                         name="projector", version=CHECK_VERSION,
+                         compile=lambda: list(_iter_timeline(character_id, repo_root)))
+
+VIEWS = ("reader", "character")
+
+def _clock(ev: dict, view: str) -> str:
+    """Scene an event counts at. Reader view = book scene; character view = epistemic clock when present."""
     epi = ev.get("epistemic_at", {}).get("scene_id") if view == "character" else None
-    s   = epi or ev["scene_id"]
-    return (s, ev["order"], ev["event_id"])  # deterministic tie-breaker
+    return epi or ev["scene_id"]
 
-def project(character_id: str, scene_id: str, *, view: str = "character", repo_root: Path = Path(".")) -> dict:
+def _load_columns(character_id: str, repo_root: Path) -> EventColumns:
+    """Columnar timeline (core.event_columns), cached under .cache/event_columns/<character>/ by content hash
+    and CHECK_VERSION."""
+    cache_dir = repo_root / ".cache" / "event_columns" / character_id.split(".", 1)[-1]
+    return load_columns(_timeline_path(character_id, repo_root), cache_dir,
+                        lambda: _iter_timeline(character_id, repo_root), version=CHECK_VERSION)
+
+def _sort_key(ev: dict, view: str) -> tuple:
+    """Stable ordering on the view's clock."""
+    return (scene_key(_clock(ev, view)), ev["order"], ev["event_id"])  # deterministic tie-breaker
+
+class TimelineIndex:
     """
-    Reconstruct what <character_id> knows by <scene_id>.
-    Output is boring-on-purpose: IDs, tiny fact dicts, and receipts.
+    Events parsed once, plus one index array per view (reader = book order, character =
+    epistemic order) and the matching packed scene keys. A scene's cutoff is a bisect
+    into the keys; everything before it applies, nothing after it does.
     """
-    events = sorted(_load_timeline(character_id, repo_root), key=lambda e: _sort_key(e, view))
-    state = {"character": character_id, "scene": scene_id, "skills": {}, "flags": []}
 
+    def __init__(self, events: list[dict]):
+        self.events = events
+        self._order, self._keys = {}, {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _view(self, view: str) -> tuple[array, array]:
+        if view not in self._order:  # built on first use; one-shot CLI calls only need one view
+            keys = [_sort_key(ev, view) for ev in self.events]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._order[view] = array("l", order)
+            self._keys[view] = array("l", [keys[i][0] for i in order])
+        return self._order[view], self._keys[view]
+
+    def cutoff(self, scene_id: str, view: str) -> int:
+        """Number of events (in *view* order) known by the end of *scene_id*."""
+        return bisect_right(self._view(view)[1], scene_key(scene_id))
+
+    def ordered(self, view: str, stop: int | None = None) -> list[dict]:
+        events = self.events
+        return [events[i] for i in self._view(view)[0][:stop]]
+
+    def upto(self, scene_id: str, view: str) -> list[dict]:
+        return self.ordered(view, self.cutoff(scene_id, view))
+
+class _Node:
+    """One skill node's replay state: facts, plus evidence as indices into ProjectionState.refs."""
+    __slots__ = ("facts", "evidence")
+
+    def __init__(self, facts: dict | None = None, evidence=()):
+        self.facts = facts if facts is not None else {}
+        self.evidence = array("i", evidence)
+
+class ProjectionState:
+    """
+    Replay state. Every source_ref lives once in the `refs` table and nodes hold 4-byte array
+    indices into it, so carrying evidence forward copies ints, not lists of dicts, and a
+    checkpoint writes each ref once. The JSON shape (project()'s output) is only built by
+    to_json().
+    """
+    __slots__ = ("character", "scene", "skills", "flags", "refs")
+
+    def __init__(self, character_id: str | None, scene_id: str | None):
+        self.character, self.scene = character_id, scene_id
+        self.skills: dict[str, _Node] = {}
+        self.flags: set[str] = set()
+        self.refs: list[dict] = []
+
+    def intern(self, refs: list[dict]) -> range:
+        """Add one event's source_ref[] to the table (each event is applied once, so no lookup)."""
+        start = len(self.refs)
+        self.refs.extend(refs)
+        return range(start, len(self.refs))
+
+    def node(self, node_id: str) -> _Node:
+        entry = self.skills.get(node_id)
+        if entry is None:
+            entry = self.skills[node_id] = _Node()
+        return entry
+
+    def node_json(self, node_id: str) -> dict:
+        entry, refs = self.skills[node_id], self.refs
+        return {"known": True, "facts": entry.facts, "evidence": [refs[i] for i in entry.evidence]}
+
+    def evidence_json(self, node_id: str, start: int = 0) -> list[dict]:
+        refs = self.refs
+        return [refs[i] for i in self.skills[node_id].evidence[start:]]
+
+    def to_json(self) -> dict:
+        return {"character": self.character, "scene": self.scene,
+                "skills": {node_id: self.node_json(node_id) for node_id in self.skills},
+                "flags": sorted(self.flags)}
+
+    def to_checkpoint(self) -> dict:
+        """Everything but the refs table, which is append-only: a checkpoint records only its length."""
+        return {"refs": len(self.refs), "flags": sorted(self.flags),
+                "skills": {node_id: [entry.facts, entry.evidence.tolist()] for node_id, entry in self.skills.items()}}
+
+    @classmethod
+    def from_checkpoint(cls, character_id: str, scene_id: str, data: dict, refs: list[dict]) -> "ProjectionState":
+        """Rebuild from to_checkpoint() output plus the first data["refs"] entries of the refs table."""
+        state = cls(character_id, scene_id)
+        state.refs, state.flags = refs, set(data["flags"])
+        state.skills = {node_id: _Node(facts, evidence) for node_id, (facts, evidence) in data["skills"].items()}
+        return state
+
+def _new_state(character_id: str | None, scene_id: str | None) -> ProjectionState:
+    return ProjectionState(character_id, scene_id)
+
+def _ensure_node_id(raw_id: str) -> str:
+    if not isinstance(raw_id, str):
+        raise ValueError(f"node id must be string, got {raw_id!r}")
+    parts = raw_id.split(".")
+    if len(parts) < 2 or parts[0] != "sn" or not all(ID_RE.match(p) for p in parts[1:]):
+        raise ValueError(f"bad node id: {raw_id}")
+    return raw_id
+
+def _apply_event(state: ProjectionState, ev: dict) -> None:
+    """Fold one event into *state* (the replay step shared by full and checkpointed projection)."""
     def add_evidence(node_id: str, ev: dict):
-        s = state["skills"].setdefault(node_id, {"known": True, "facts": {}, "evidence": []})
-        s["evidence"].extend(ev["source_ref"])
+        state.node(node_id).evidence.extend(state.intern(ev["source_ref"]))
 
     def apply_delta(node_id: str, ev: dict):
         if not ev.get("knowledge_delta"):
             return
-        entry = state["skills"].setdefault(node_id, {"known": True, "facts": {}, "evidence": []})
+        facts = state.node(node_id).facts
         for d in ev["knowledge_delta"]:
-            entry["facts"][d["field_path"]] = d.get("new_value")
+            facts[d["field_path"]] = d.get("new_value")
+
+    t = ev.get("type")
+    node = ev.get("node_id") or ev.get("skill_id")
 
-    def ensure_node_id(raw_id: str) -> str:
-        if not isinstance(raw_id, str):
-            raise ValueError(f"node id must be string, got {raw_id!r}")
-        parts = raw_id.split(".")
-        if len(parts) < 2 or parts[0] != "sn" or not all(ID_RE.match(p) for p in parts[1:]):
-            raise ValueError(f"bad node id: {raw_id}")
-        return raw_id
+    if t == "skill_acquired" and node:
+        node_id = _ensure_node_id(node)
+        add_evidence(node_id, ev)
+        apply_delta(node_id, ev)
+    elif t == "skill_evolved" and node:
+        node_id = _ensure_node_id(node)
+        add_evidence(node_id, ev)
+        apply_delta(node_id, ev)
+    elif t == "skill_upgraded":
+        from_node = ev.get("from_node_id")
+        to_node = ev.get("to_node_id")
+        if not (from_node and to_node):
+            raise ValueError(f"skill_upgraded event missing from/to node ids ({ev.get('event_id')})")
+        from_node = _ensure_node_id(from_node)
+        to_node = _ensure_node_id(to_node)
+        prev = state.skills.pop(from_node, None) or _Node()
+        # carry evidence and facts forward (evidence is ref indices, so this copies ints)
+        current = state.node(to_node)
+        current.evidence.extend(prev.evidence)
+        current.evidence.extend(state.intern(ev["source_ref"]))
+        current.facts.update(prev.facts)
+        apply_delta(to_node, ev)
+    elif t in {"skill_observation", "belief_corrected"} and node:
+        node_id = _ensure_node_id(node)
+        add_evidence(node_id, ev)
+        apply_delta(node_id, ev)
+    # Tags → flags (MVP: just copy; later we can gate by approval per Tagging Contract)  :contentReference[oaicite:22]{index=22}
+    state.flags.update(ev.get("tags", []))
 
+def _replay(state: ProjectionState, events) -> dict:
+    """Apply already-cut events (see TimelineIndex.cutoff) in order; return the JSON shape."""
     for ev in events:
-        # stop at the reveal cutoff for reader-view; character-view uses epistemic sort but same cutoff scene
-        if ev["scene_id"] > scene_id:  # book anchor remains the cutoff; matches provenance thinking.  :contentReference[oaicite:20]{index=20}
+        _apply_event(state, ev)
+    return state.to_json()  # flags come out sorted, predictable for diffs
+
+def project(character_id: str, scene_id: str, *, view: str = "character", repo_root: Path = Path("."),
+            checkpoints: CheckpointCache | None = None) -> dict:
+    """
+    Reconstruct what <character_id> knows by <scene_id>.
+    Output is boring-on-purpose: IDs, tiny fact dicts, and receipts.
+    With *checkpoints*, start from the nearest cached state instead of event zero (same result).
+    """
+    if checkpoints is not None:
+        return checkpoints.project(character_id, scene_id, view=view, repo_root=repo_root)
+    with instrumentation.phase("load"):
+        index = TimelineIndex(_load_timeline(character_id, repo_root))
+    with instrumentation.phase("replay"):
+        return _replay(_new_state(character_id, scene_id), index.upto(scene_id, view))
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Checkpoints: replay once, keep the state every K events, answer from the nearest one
+#
+# .cache/projector/<character>/source.json            mtime/size → content digest (skip re-hashing)
+# .cache/projector/<character>/<view>-<every>-v<N>-<digest>/
+#     index.json       segments [{start, end, max_key, file, events, refs}] in sorted-event order;
+#                      events/refs are [from, to) byte spans of the two array files below
+#     events.json      every sorted event once, as one JSON array
+#     refs.json        the final refs table once, as one JSON array
+#     seg-00000.json   {"start", "state": ProjectionState.to_checkpoint() after events[:start], "keys"}
+#
+# Keys are packed clock scenes (scene_key), ascending. A query's cutoff lies in the first
+# segment whose last key is past it, so it loads one state, the refs that state points at
+# (a byte prefix of refs.json) and at most one segment of events (a byte range of events.json).
+# ─────────────────────────────────────────────────────────────────────────────
+
+CHECKPOINT_VERSION = 4
+DEFAULT_CHECKPOINT_EVERY = 2000
+
+def _checkpoint_every(value: str):
+    """argparse type: a positive event count or the word 'chapter'."""
+    if value == "chapter":
+        return value
+    every = int(value)
+    if every < 1:
+        raise argparse.ArgumentTypeError("--checkpoint-every must be >= 1 or 'chapter'")
+    return every
+
+def _segment_starts(events: list[dict], every, view: str) -> list[int]:
+    if every == "chapter":
+        chapters = [_sort_key(ev, view)[0] >> 8 for ev in events]  # BB.CC of the sort clock
+        return [i for i, chapter in enumerate(chapters) if i == 0 or chapter != chapters[i - 1]]
+    return list(range(0, len(events), every))
+
+def _write_array(path: Path, items: list) -> list[int]:
+    """Write *items* as one JSON array; return ends[i], the byte offset just past item i."""
+    ends, offset = [], 1
+    with path.open("wb") as handle:
+        handle.write(b"[")
+        for i, item in enumerate(items):
+            encoded = (b"," if i else b"") + json_codec.dumps(item, indent=None).encode("utf-8")
+            handle.write(encoded)
+            offset += len(encoded)
+            ends.append(offset)
+        handle.write(b"]")
+    return ends
+
+def _span(ends: list[int], start: int, stop: int) -> list[int]:
+    """Byte range holding items [start, stop) of a _write_array file, without separators."""
+    if stop <= start:
+        return [1, 1]
+    return [ends[start - 1] + 1 if start else 1, ends[stop - 1]]
+
+def _read_span(path: Path, span: list[int]) -> list:
+    begin, end = span
+    with path.open("rb") as handle:
+        handle.seek(begin)
+        return json_codec.loads(b"[" + handle.read(end - begin) + b"]")
+
+def _write_checkpoints(target: Path, events: list[dict], every, view: str, digest: str) -> None:
+    """Replay everything once, writing each segment's starting state; events and refs go to disk once."""
+    target.mkdir(parents=True)
+    state, segments = _new_state(None, None), []
+    starts = _segment_starts(events, every, view)
+    for j, start in enumerate(starts):
+        end = starts[j + 1] if j + 1 < len(starts) else len(events)
+        name = f"seg-{j:05d}.json"
+        checkpoint = state.to_checkpoint()
+        payload = {"start": start, "state": checkpoint, "keys": [_sort_key(ev, view)[0] for ev in events[start:end]]}
+        (target / name).write_text(json_codec.dumps(payload, indent=None), encoding="utf-8")
+        try:
+            for ev in events[start:end]:
+                _apply_event(state, ev)
+        except ValueError:
+            # Queries before the bad event still succeed; later ones replay into the same error.
+            end = len(events)
+            payload["keys"] = [_sort_key(ev, view)[0] for ev in events[start:]]
+            (target / name).write_text(json_codec.dumps(payload, indent=None), encoding="utf-8")
+        segments.append({"start": start, "end": end, "file": name, "max_key": payload["keys"][-1],
+                         "refs": checkpoint["refs"]})
+        if end == len(events):
             break
-        t = ev.get("type")
-        node = ev.get("node_id") or ev.get("skill_id")
-
-        if t == "skill_acquired" and node:
-            node_id = ensure_node_id(node)
-            add_evidence(node_id, ev)
-            apply_delta(node_id, ev)
-        elif t == "skill_evolved" and node:
-            node_id = ensure_node_id(node)
-            add_evidence(node_id, ev)
-            apply_delta(node_id, ev)
-        elif t == "skill_upgraded":
-            from_node = ev.get("from_node_id")
-            to_node = ev.get("to_node_id")
-            if not (from_node and to_node):
-                raise ValueError(f"skill_upgraded event missing from/to node ids ({ev.get('event_id')})")
-            from_node = ensure_node_id(from_node)
-            to_node = ensure_node_id(to_node)
-            if from_node in state["skills"]:
-                prev = state["skills"].pop(from_node)
+    event_ends = _write_array(target / "events.json", events)
+    ref_ends = _write_array(target / "refs.json", state.refs)
+    for segment in segments:
+        segment["events"] = _span(event_ends, segment["start"], segment["end"])
+        segment["refs"] = _span(ref_ends, 0, segment["refs"])
+    index = {"version": CHECKPOINT_VERSION, "digest": digest, "view": view, "every": every,
+             "events": len(events), "segments": segments}
+    (target / "index.json").write_text(json_codec.dumps(index, indent=None), encoding="utf-8")
+
+class CheckpointCache:
+    """Projection checkpoints every K events (or per chapter), keyed by the timeline's content hash."""
+
+    def __init__(self, cache_root: Path | None = None, every=DEFAULT_CHECKPOINT_EVERY):
+        self.cache_root = cache_root
+        self.every = every
+        self.builds = 0
+
+    def _character_dir(self, character_id: str, repo_root: Path) -> Path:
+        root = self.cache_root or repo_root / ".cache" / "projector"
+        return root / character_id.split(".", 1)[-1]
+
+    def directory(self, character_id: str, view: str, repo_root: Path) -> Path:
+        """Checkpoint directory for the timeline as it is on disk now (built on first use)."""
+        character_dir = self._character_dir(character_id, repo_root)
+        digest = cached_file_digest(_timeline_path(character_id, repo_root), character_dir / "source.json")
+        prefix = f"{view}-{self.every}-v{CHECKPOINT_VERSION}-"
+        target = character_dir / f"{prefix}{digest}"
+        if (target / "index.json").exists():
+            return target
+        with instrumentation.phase("load"):
+            events = TimelineIndex(_load_timeline(character_id, repo_root)).ordered(view)
+        with instrumentation.phase("checkpoint_build"):
+            staging = Path(tempfile.mkdtemp(prefix=".build-", dir=character_dir))
+            try:
+                _write_checkpoints(staging / "cp", events, self.every, view, digest)
+                for stale in character_dir.glob(f"{prefix}*"):
+                    shutil.rmtree(stale, ignore_errors=True)
+                os.replace(staging / "cp", target)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        self.builds += 1
+        return target
+
+    def project(self, character_id: str, scene_id: str, *, view: str = "character", repo_root: Path = Path(".")) -> dict:
+        with instrumentation.phase("checkpoint_lookup"):
+            target = self.directory(character_id, view, repo_root)
+            index = json_codec.loads((target / "index.json").read_bytes())
+            segments = index["segments"]
+            key = scene_key(scene_id)
+            segment = next((seg for seg in segments if seg["max_key"] > key), segments[-1] if segments else None)
+            if segment is None:
+                return _replay(_new_state(character_id, scene_id), [])
+            payload = json_codec.loads((target / segment["file"]).read_bytes())
+            refs = _read_span(target / "refs.json", segment["refs"])
+            events = _read_span(target / "events.json", segment["events"])
+        state = ProjectionState.from_checkpoint(character_id, scene_id, payload["state"], refs)
+        with instrumentation.phase("replay"):
+            return _replay(state, events[:bisect_right(payload["keys"], key)])
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ranges: one replay, one JSONL record per scene boundary
+#
+# The state at scene S is the prefix of sorted events up to TimelineIndex.cutoff(S), the
+# same cut project() makes. Cutoffs only grow with S, so walking the scenes in order
+# applies each event once.
+#
+#   {"kind": "full",  "character", "scene", "skills", "flags"}           == project(scene)
+#   {"kind": "delta", "character", "scene", "skills_added"?, "skills_removed"?,
+#    "facts_changed"?, "evidence_appended"?, "flags_set"?}              (empty keys omitted)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _parse_range(value: str) -> tuple[str, str]:
+    """argparse type: 'BB.CC.SS..BB.CC.SS' (inclusive)."""
+    first, sep, last = value.partition("..")
+    if not (sep and SCENE_RE.match(first) and SCENE_RE.match(last)) or first > last:
+        raise argparse.ArgumentTypeError(f"--range must look like 01.01.01..05.40.03, got {value!r}")
+    return first, last
+
+def _indexed_scene_ids(repo_root: Path) -> set[str]:
+    root = repo_root / "records" / "scene_index"
+    return {p.name[:-5] for p in root.rglob("*.json") if SCENE_RE.match(p.name[:-5])} if root.is_dir() else set()
+
+def _node_ids(ev: dict) -> list[str]:
+    return [n for n in (ev.get("node_id") or ev.get("skill_id"), ev.get("from_node_id"), ev.get("to_node_id")) if n]
+
+def iter_scene_states(character_id: str, *, first: str = "00.00.00", last: str = "99.99.99", view: str = "character",
+                      repo_root: Path = Path("."), full_every: int = 0):
+    """
+    Yield one record per scene in [first, last] (scene_index scenes plus every event's clock scene).
+    The first record is a full state, later ones are deltas against the previous record;
+    with *full_every* N, every Nth record is a full state as well. Records share the live
+    state, so serialise (or apply_scene_record) each one before asking for the next.
+    """
+    with instrumentation.phase("load"):
+        index = TimelineIndex(_load_timeline(character_id, repo_root))
+        events = index.ordered(view)
+    scenes = sorted(s for s in _indexed_scene_ids(repo_root) | {_clock(ev, view) for ev in events} if first <= s <= last)
+
+    state = _new_state(character_id, None)
+    seen_flags: set[str] = set()
+    shadow: dict[str, tuple[_Node, dict, int]] = {}  # node → (entry object, facts copy, evidence length) as last emitted
+    touched: set[str] = set()
+    pos = 0
+    with instrumentation.phase("replay"):
+        for n, scene in enumerate(scenes):
+            for ev in events[pos:index.cutoff(scene, view)]:
+                _apply_event(state, ev)
+                touched.update(_node_ids(ev))
+                pos += 1
+            new_flags = sorted(state.flags - seen_flags)
+            seen_flags.update(new_flags)
+
+            if n == 0 or (full_every and n % full_every == 0):
+                state.scene = scene
+                record = {"kind": "full", **state.to_json()}
+                shadow, touched = {}, set(state.skills)
             else:
-                prev = {"known": True, "facts": {}, "evidence": []}
-            # carry evidence and facts forward
-            current = state["skills"].setdefault(to_node, {"known": True, "facts": {}, "evidence": []})
-            current["evidence"].extend(prev.get("evidence", []))
-            current["evidence"].extend(ev["source_ref"])
-            current["facts"].update(prev.get("facts", {}))
-            apply_delta(to_node, ev)
-        elif t in {"skill_observation", "belief_corrected"} and node:
-            node_id = ensure_node_id(node)
-            add_evidence(node_id, ev)
-            apply_delta(node_id, ev)
-        # Tags → flags (MVP: just copy; later we can gate by approval per Tagging Contract)  :contentReference[oaicite:22]{index=22}
-        for tag in ev.get("tags", []):
-            state["flags"].append(tag)
-
-    # make flags predictable for diffs
-    state["flags"] = sorted(set(state["flags"]))
+                record = {"kind": "delta", "character": character_id, "scene": scene}
+                added, removed, facts, evidence = {}, [], {}, {}
+                for node in sorted(touched):
+                    entry, known = state.skills.get(node), shadow.get(node)
+                    if entry is None:
+                        if known is not None:
+                            removed.append(node)
+                    elif known is None or known[0] is not entry:
+                        added[node] = state.node_json(node)
+                    else:
+                        changed = {k: v for k, v in entry.facts.items() if k not in known[1] or known[1][k] != v}
+                        if changed:
+                            facts[node] = changed
+                        if len(entry.evidence) > known[2]:
+                            evidence[node] = state.evidence_json(node, known[2])
+                for key, value in (("skills_added", added), ("skills_removed", removed), ("facts_changed", facts),
+                                   ("evidence_appended", evidence), ("flags_set", new_flags)):
+                    if value:
+                        record[key] = value
+            for node in touched:
+                entry = state.skills.get(node)
+                if entry is None:
+                    shadow.pop(node, None)
+                else:
+                    shadow[node] = (entry, dict(entry.facts), len(entry.evidence))
+            touched = set()
+            yield record
+
+def apply_scene_record(state: dict | None, record: dict) -> dict:
+    """Fold one iter_scene_states() record into *state*; returns the state project() gives at that scene."""
+    if record["kind"] == "full":
+        return {"character": record["character"], "scene": record["scene"],
+                "skills": json.loads(json.dumps(record["skills"])), "flags": list(record["flags"])}
+    state["scene"] = record["scene"]
+    for node in record.get("skills_removed", []):
+        state["skills"].pop(node, None)
+    for node, entry in record.get("skills_added", {}).items():
+        state["skills"][node] = json.loads(json.dumps(entry))
+    for node, changed in record.get("facts_changed", {}).items():
+        state["skills"][node]["facts"].update(changed)
+    for node, refs in record.get("evidence_appended", {}).items():
+        state["skills"][node]["evidence"].extend(refs)
+    state["flags"] = sorted(set(state["flags"]) | set(record.get("flags_set", [])))
     return state
 
-def compare_before_after(character_id: str, topic_id_or_prefix: str, *, repo_root: Path, upgrade_predicate="skill_evolved"):
+# ─────────────────────────────────────────────────────────────────────────────
+# Diff: what changed between two scenes, from one replay
+#
+# Replay to cutoff(S1), note the nodes the S1..S2 events will touch, apply only those
+# events. The ref table is append-only, so "new evidence" is every index past its S1 length.
+#
+#   {"character", "from", "to", "view", "events_applied", "flags_set",
+#    "skills_gained": [node], "skills_upgraded": [{"from", "to", "event_id", "scene_id"}],
+#    "nodes": {node: {"status": "gained"|"changed"|"upgraded"|"removed", "upgraded_from"?,
+#                     "upgraded_to"?, "facts_changed"?: {field: {"old", "new"}}, "evidence_added"?}}}
+# ─────────────────────────────────────────────────────────────────────────────
+
+def diff_index(index: TimelineIndex, character_id: str, first: str, last: str, *, view: str = "character") -> dict:
+    """Change set from scene *first* to scene *last* (inclusive cutoffs, first <= last)."""
+    if scene_key(first) > scene_key(last):
+        raise ValueError(f"--from {first} is after --to {last}")
+    events = index.ordered(view, index.cutoff(last, view))
+    start = index.cutoff(first, view)
+    state = _new_state(character_id, last)
+    for ev in events[:start]:
+        _apply_event(state, ev)
+    span = events[start:]
+    touched = sorted({node for ev in span for node in _node_ids(ev)})
+    before = {node: dict(state.skills[node].facts) for node in touched if node in state.skills}
+    flags_before, refs_before = set(state.flags), len(state.refs)
+
+    upgrades, origin = [], {}  # origin: upgrade target → the node it came from at S1
+    for ev in span:
+        _apply_event(state, ev)
+        if ev.get("type") == "skill_upgraded":
+            source, target = ev["from_node_id"], ev["to_node_id"]
+            origin[target] = origin.get(source, source)
+            upgrades.append({"from": source, "to": target, "event_id": ev["event_id"], "scene_id": ev["scene_id"]})
+    upgraded_to = {up["from"]: up["to"] for up in upgrades}
+
+    nodes = {}
+    for node in touched:
+        entry = state.skills.get(node)
+        change: dict = {}
+        if entry is None:
+            if node not in before:
+                continue  # appeared and was upgraded away inside the range
+            change["status"] = "upgraded" if node in upgraded_to else "removed"
+            if node in upgraded_to:
+                change["upgraded_to"] = upgraded_to[node]
+        else:
+            change["status"] = "changed" if node in before else "gained"
+            if node not in before and node in origin:
+                change["upgraded_from"] = origin[node]
+            old = before.get(node, before.get(origin.get(node), {}))
+            facts = {k: {"old": old.get(k), "new": v} for k, v in entry.facts.items() if k not in old or old[k] != v}
+            evidence = [state.refs[i] for i in entry.evidence if i >= refs_before]
+            if facts:
+                change["facts_changed"] = facts
+            if evidence:
+                change["evidence_added"] = evidence
+            if change["status"] == "changed" and len(change) == 1:
+                continue
+        nodes[node] = change
+    return {"character": character_id, "from": first, "to": last, "view": view, "events_applied": len(span),
+            "flags_set": sorted(state.flags - flags_before),
+            "skills_gained": [node for node, change in nodes.items() if change["status"] == "gained"],
+            "skills_upgraded": upgrades, "nodes": nodes}
+
+def diff_scenes(character_id: str, first: str, last: str, *, view: str = "character", repo_root: Path = Path(".")) -> dict:
+    with instrumentation.phase("load"):
+        index = TimelineIndex(_load_timeline(character_id, repo_root))
+    with instrumentation.phase("replay"):
+        return diff_index(index, character_id, first, last, view=view)
+
+def compare_before_after(character_id: str, topic_id_or_prefix: str, *, repo_root: Path, upgrade_predicate="skill_evolved",
+                         use_columns: bool = True):
     """
     Compare earliest recovery-related evidence vs the upgrade event.
     Returns a tiny verdict struct the LLM can narrate with receipts.
+    Topic events come from the cached columnar timeline (or one streaming pass without it);
+    for many topics use compare_topics().
     """
-    events = _load_timeline(character_id, repo_root)
     def mentions_topic(ev: dict) -> bool:
         candidates = [
             ev.get("node_id"),
@@ -142,15 +622,30 @@ def compare_before_after(character_id: str, topic_id_or_prefix: str, *, repo_roo
         ]
         return any(isinstance(n, str) and n.startswith(topic_id_or_prefix) for n in candidates)
 
-    # Filter candidates
-    upgrades = [e for e in events if e.get("type") in {"skill_evolved","skill_upgraded"} and mentions_topic(e)]
-    deltas   = []
-    for e in events:
-        if not mentions_topic(e): continue
-        for d in e.get("knowledge_delta", []):
-            if re.search(r"(recovery|regen)(_rate)?$", d["field_path"]):
+    # Filter candidates in one pass; only topic events are kept in memory
+    with instrumentation.phase("scan"):
+        if use_columns:
+            columns = _load_columns(character_id, repo_root)
+            events = columns.events(columns.select(node_prefix=topic_id_or_prefix))
+        else:
+            events = _iter_timeline(character_id, repo_root)
+        upgrades, deltas = [], []
+        for e in events:
+            if not mentions_topic(e): continue
+            if e.get("type") in UPGRADE_TYPES:
+                upgrades.append(e)
+            for d in _recovery_deltas(e):
                 deltas.append((e, d))
+    return _verdict(upgrades, deltas)
+
+UPGRADE_TYPES = {"skill_evolved", "skill_upgraded"}
+RECOVERY_FIELD_RE = re.compile(r"(recovery|regen)(_rate)?$")
 
+def _recovery_deltas(ev: dict) -> list[dict]:
+    return [d for d in ev.get("knowledge_delta", []) if RECOVERY_FIELD_RE.search(d["field_path"])]
+
+def _verdict(upgrades: list[dict], deltas: list[tuple[dict, dict]]) -> dict:
+    """Verdict from a topic's upgrade events and recovery deltas (both in file order)."""
     if not upgrades:
         return {"verdict": "no_upgrade_event"}
 
@@ -182,25 +677,372 @@ def compare_before_after(character_id: str, topic_id_or_prefix: str, *, repo_roo
         return {"verdict": "no_confirmation_evidence", "upgrade": pack(up), "first_suspicion": pack(first_sus, suspicions[0][1])}
     return {"verdict": "no_evidence", "upgrade": pack(up)}
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Topic index: answer many compare topics from one pass
+#
+# A trie over the dot segments of every distinct node id (node/skill/from/to) maps a topic
+# prefix to the node ids it matches, and each node id to the positions of events naming it.
+# "sn.meditation." walks sn → meditation and takes every child subtree; "sn.med" takes the
+# subtrees of sn's children starting with "med" (same answers as str.startswith).
+# ─────────────────────────────────────────────────────────────────────────────
+
+NODE_FIELDS = ("node_id", "skill_id", "from_node_id", "to_node_id")
+
+class TopicIndex:
+    """Node-prefix trie → event positions, with recovery deltas parsed once per event."""
+
+    def __init__(self, node_positions: dict[str, list[int]], event_at):
+        self._node_positions = node_positions
+        self._event_at = event_at
+        self._events: dict[int, dict] = {}
+        self._deltas: dict[int, list[dict]] = {}
+        self._trie: dict = {}  # segment → child; the None key holds the node id ending here
+        for node in node_positions:
+            branch = self._trie
+            for segment in node.split("."):
+                branch = branch.setdefault(segment, {})
+            branch[None] = node
+
+    @classmethod
+    def from_events(cls, events: list[dict]) -> "TopicIndex":
+        node_positions: dict[str, list[int]] = {}
+        for pos, ev in enumerate(events):
+            for node in {ev.get(field) for field in NODE_FIELDS}:
+                if isinstance(node, str) and node:
+                    node_positions.setdefault(node, []).append(pos)
+        return cls(node_positions, events.__getitem__)
+
+    @classmethod
+    def from_columns(cls, columns: EventColumns) -> "TopicIndex":
+        """Built from interned node codes; only events of queried topics are ever decoded."""
+        by_code: dict[int, set[int]] = {}
+        for name in ("node", "skill", "from_node", "to_node"):
+            for row, code in enumerate(columns.columns[name]):
+                if code >= 0:
+                    by_code.setdefault(code, set()).add(row)
+        return cls({columns.nodes[code]: sorted(rows) for code, rows in by_code.items()}, columns.event)
+
+    def nodes(self, prefix: str) -> list[str]:
+        """Distinct node ids starting with *prefix*."""
+        *whole, partial = prefix.split(".")
+        branch = self._trie
+        for segment in whole:
+            branch = branch.get(segment)
+            if branch is None:
+                return []
+        found, stack = [], [child for segment, child in branch.items() if segment is not None and segment.startswith(partial)]
+        while stack:
+            child = stack.pop()
+            for segment, value in child.items():
+                if segment is None:
+                    found.append(value)
+                else:
+                    stack.append(value)
+        return found
+
+    def positions(self, prefix: str) -> list[int]:
+        return sorted({pos for node in self.nodes(prefix) for pos in self._node_positions[node]})
+
+    def _event(self, pos: int) -> dict:
+        if pos not in self._events:
+            self._events[pos] = ev = self._event_at(pos)
+            self._deltas[pos] = _recovery_deltas(ev)
+        return self._events[pos]
+
+    def compare(self, topic: str) -> dict:
+        """Same verdict as compare_before_after(topic), from the index."""
+        upgrades, deltas = [], []
+        for pos in self.positions(topic):
+            ev = self._event(pos)
+            if ev.get("type") in UPGRADE_TYPES:
+                upgrades.append(ev)
+            deltas.extend((ev, d) for d in self._deltas[pos])
+        return _verdict(upgrades, deltas)
+
+def compare_topics(character_id: str, topics: list[str], *, repo_root: Path, use_columns: bool = True) -> dict:
+    """compare_before_after for every topic, answered from one TopicIndex."""
+    with instrumentation.phase("index"):
+        if use_columns:
+            index = TopicIndex.from_columns(_load_columns(character_id, repo_root))
+        else:
+            index = TopicIndex.from_events(_load_timeline(character_id, repo_root, cache=False))
+    with instrumentation.phase("scan"):
+        return {topic: index.compare(topic) for topic in topics}
+
+def _read_topics(path: Path) -> list[str]:
+    """One topic per line; blank lines and # comments are skipped, duplicates answered once."""
+    lines = (line.split("#", 1)[0].strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return list(dict.fromkeys(line for line in lines if line))
+
+# ─────────────────────────────────────────────────────────────────────────────
+# World snapshot: every character under records/characters/ at one scene
+#
+# Characters are projected independently, so a process pool spreads them over CPUs; each
+# worker goes through the character's checkpoint cache (built once, reused by later runs).
+# Results come back in directory order whatever the pool does, so output is stable.
+# ─────────────────────────────────────────────────────────────────────────────
+
+CHARACTER_PREFIX = "pc."  # character IDs are pc.<slug> (ID contract); the slug names the folder
+
+def _world_characters(repo_root: Path) -> list[str]:
+    root = repo_root / "records" / "characters"
+    return [CHARACTER_PREFIX + p.parent.name for p in sorted(root.glob("*/timeline.json"))] if root.is_dir() else []
+
+def _project_for_world(task: tuple) -> tuple[str, dict | None, str | None]:
+    character_id, scene_id, view, repo_root, every = task
+    try:
+        checkpoints = CheckpointCache(every=every) if every else None
+        return character_id, project(character_id, scene_id, view=view, repo_root=repo_root, checkpoints=checkpoints), None
+    except (OSError, ValueError) as exc:  # one broken timeline should not sink the world
+        return character_id, None, str(exc)
+    except (KeyError, TypeError) as exc:  # malformed data _check_event does not cover
+        return character_id, None, f"{type(exc).__name__}: {exc}"
+
+def iter_world(scene_id: str, *, view: str = "character", repo_root: Path = Path("."), jobs: int = 1,
+               checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+    """Yield (character_id, state or None, error or None) per character, in directory order.
+    *checkpoint_every* None replays every timeline from event zero."""
+    tasks = [(c, scene_id, view, repo_root, checkpoint_every) for c in _world_characters(repo_root)]
+    if jobs <= 1 or len(tasks) <= 1:
+        yield from map(_project_for_world, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        yield from pool.map(_project_for_world, tasks)
+
+def project_world(scene_id: str, **kwargs) -> dict:
+    """One merged document: {"scene", "view", "characters": {id: state}, "errors": {id: message}}."""
+    world = {"scene": scene_id, "view": kwargs.get("view", "character"), "characters": {}, "errors": {}}
+    for character_id, state, error in iter_world(scene_id, **kwargs):
+        if error is None:
+            world["characters"][character_id] = state
+        else:
+            world["errors"][character_id] = error
+    return world
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Knowledge index: "which characters knew field F of node N by scene S, and from which event"
+#
+# Every fact the replay sets (knowledge_delta items, plus the facts an upgrade carries onto its
+# to_node), timed on the epistemic clock:
+#
+#   (node_id, field_path) → [(clock key, character, scene_id, event_id, value), ...]  sorted by key
+#
+# A query bisects one list and keeps each character's last entry before the cut. refresh() re-reads
+# only timelines whose mtime/size changed (their entries come from the compiled-timeline cache when
+# the content is unchanged) and splices just those characters' entries back in.
+# ─────────────────────────────────────────────────────────────────────────────
+
+KNOWLEDGE_VERSION = 1  # bump whenever _knowledge_entries changes; with CHECK_VERSION it keys the compiled-timeline cache
+DELTA_TYPES = {"skill_acquired", "skill_evolved", "skill_observation", "belief_corrected"}
+
+def _knowledge_entries(events: list[dict]) -> list[tuple]:
+    """(node_id, field_path, clock key, scene_id, event_id, value) per fact the replay sets, in replay order.
+    An upgrade re-enters the facts it carries onto the new node, as _apply_event does."""
+    out, facts = [], {}
+    for ev in TimelineIndex(events).ordered("character"):
+        t, scene = ev.get("type"), _clock(ev, "character")
+        if t == "skill_upgraded":
+            if not (ev.get("from_node_id") and ev.get("to_node_id")):
+                raise ValueError(f"skill_upgraded event missing from/to node ids ({ev.get('event_id')})")
+            node = _ensure_node_id(ev["to_node_id"])
+            carried = facts.pop(_ensure_node_id(ev["from_node_id"]), {})
+            facts.setdefault(node, {}).update(carried)
+            changes = list(carried.items())
+        elif t in DELTA_TYPES and (ev.get("node_id") or ev.get("skill_id")):
+            node, changes = _ensure_node_id(ev.get("node_id") or ev.get("skill_id")), []
+        else:
+            continue
+        for d in ev.get("knowledge_delta") or ():
+            facts.setdefault(node, {})[d["field_path"]] = d.get("new_value")
+            changes.append((d["field_path"], d.get("new_value")))
+        out.extend((node, field, scene_key(scene), scene, ev["event_id"], value) for field, value in changes)
+    return out
+
+class KnowledgeIndex:
+    """Reverse epistemic index over every character timeline under *repo_root*."""
+
+    def __init__(self, repo_root: Path = Path(".")):
+        self.repo_root = repo_root
+        self.postings: dict[tuple[str, str], list[tuple]] = {}
+        self.errors: dict[str, str] = {}
+        self._signatures: dict[str, tuple[int, int]] = {}
+        self._postings_of: dict[str, set[tuple[str, str]]] = {}  # character → posting keys it appears in
+
+    def update(self, changes: dict[str, list[tuple]]) -> None:
+        """Replace each character's entries with *changes[character]* (an empty list removes it)."""
+        fresh: dict[tuple[str, str], list[tuple]] = {}
+        touched: set[tuple[str, str]] = set()
+        for character_id, entries in changes.items():
+            touched |= self._postings_of.pop(character_id, set())
+            for node, field, key, scene, event_id, value in entries:
+                fresh.setdefault((node, field), []).append((key, character_id, scene, event_id, value))
+                self._postings_of.setdefault(character_id, set()).add((node, field))
+        for k in touched | fresh.keys():
+            posting = [e for e in self.postings.get(k, ()) if e[1] not in changes] + fresh.get(k, [])
+            if posting:
+                posting.sort(key=itemgetter(0))  # stable: a character's same-scene entries keep replay order
+                self.postings[k] = posting
+            else:
+                self.postings.pop(k, None)
+
+    def _entries(self, character_id: str) -> list[tuple]:
+        path = _timeline_path(character_id, self.repo_root)
+        return load_compiled(path, compiled_cache_dir(self.repo_root / ".cache" / "compiled_timelines", path),
+                             name="knowledge", version=f"{KNOWLEDGE_VERSION}.{CHECK_VERSION}",
+                             compile=lambda: _knowledge_entries(_load_timeline(character_id, self.repo_root)))
+
+    def refresh(self) -> int:
+        """Re-index timelines added, changed or removed since the last refresh; return how many."""
+        changes, present = {}, set(_world_characters(self.repo_root))
+        for character_id in sorted(present):
+            stat = _timeline_path(character_id, self.repo_root).stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._signatures.get(character_id) == signature:
+                continue
+            self._signatures[character_id] = signature
+            self.errors.pop(character_id, None)
+            try:
+                changes[character_id] = self._entries(character_id)
+            except ValueError as exc:  # one broken timeline should not sink the index
+                changes[character_id] = []
+                self.errors[character_id] = str(exc)
+        for character_id in set(self._signatures) - present:
+            del self._signatures[character_id]
+            self.errors.pop(character_id, None)
+            changes[character_id] = []
+        self.update(changes)
+        return len(changes)
+
+    def who_knew(self, node_id: str, field_path: str, scene_id: str) -> dict:
+        """{"node_id", "field_path", "scene", "characters": {id: {"scene_id", "event_id", "value"}}, "errors"}:
+        each character's latest value for the field by the end of *scene_id* (epistemic clock)."""
+        posting = self.postings.get((node_id, field_path), [])
+        # (key + 1,) sorts after every (key, ...) entry and before every (key + 1, ...) one.
+        cut = bisect_left(posting, (scene_key(scene_id) + 1,))
+        known = {}
+        for _, character_id, scene, event_id, value in posting[:cut]:
+            known[character_id] = {"scene_id": scene, "event_id": event_id, "value": value}
+        return {"node_id": node_id, "field_path": field_path, "scene": scene_id,
+                "characters": dict(sorted(known.items())), "errors": dict(sorted(self.errors.items()))}
+
+def _write_jsonl(records, output: Path | None) -> None:
+    out = output.open("w", encoding="utf-8") if output else sys.stdout
+    try:
+        for record in records:
+            out.write(json_codec.dumps(record, indent=None) + "\n")
+    finally:
+        if output:
+            out.close()
+
 def main():
     ap = argparse.ArgumentParser(description="PHI Projector — replay character knowledge")
     sub = ap.add_subparsers(dest="cmd", required=True)
 
     p1 = sub.add_parser("snapshot", help="state at scene")
     p1.add_argument("--character", required=True)
-    p1.add_argument("--scene", required=True)   # dotted BB.CC.SS
+    at = p1.add_mutually_exclusive_group(required=True)
+    at.add_argument("--scene")   # dotted BB.CC.SS
+    at.add_argument("--range", type=_parse_range, help="JSONL record per scene in A..B (one replay)")
+    at.add_argument("--all-scenes", action="store_true", help="JSONL record per scene, whole timeline")
     p1.add_argument("--view", choices=["reader","character"], default="character")
+    p1.add_argument("--full-every", type=int, default=0, metavar="N",
+                    help="with --range/--all-scenes: full state every N scenes, deltas between (default: first only)")
+    p1.add_argument("--output", type=Path, default=None, help="with --range/--all-scenes: write JSONL here (default: stdout)")
+    p1.add_argument("--no-cache", action="store_true", help="replay from event zero; skip .cache/projector checkpoints")
+    p1.add_argument("--checkpoint-every", type=_checkpoint_every, default=DEFAULT_CHECKPOINT_EVERY,
+                    help="checkpoint spacing: N events or 'chapter' (default: %(default)s)")
 
     p2 = sub.add_parser("compare", help="before/after verdict for a topic vs upgrade")
     p2.add_argument("--character", required=True)
-    p2.add_argument("--topic", required=True)   # e.g., "sn.meditation." prefix
+    topic = p2.add_mutually_exclusive_group(required=True)
+    topic.add_argument("--topic")   # e.g., "sn.meditation." prefix
+    topic.add_argument("--topics-file", type=Path, help="one topic per line; prints {topic: verdict}")
+    p2.add_argument("--no-cache", action="store_true", help="stream timeline.json; skip .cache/event_columns")
+
+    p4 = sub.add_parser("events", help="filter events via the columnar timeline")
+    p4.add_argument("--character", required=True)
+    p4.add_argument("--type", action="append", dest="types", help="event type (repeatable)")
+    p4.add_argument("--node", help="node id prefix, e.g. sn.meditation.")
+    p4.add_argument("--from", dest="first", help="first scene (inclusive)")
+    p4.add_argument("--to", dest="last", help="last scene (inclusive)")
+    p4.add_argument("--view", choices=["reader","character"], default="reader")
+
+    p6 = sub.add_parser("diff", help="what changed between two scenes (one replay)")
+    p6.add_argument("--character", required=True)
+    p6.add_argument("--from", dest="first", required=True)
+    p6.add_argument("--to", dest="last", required=True)
+    p6.add_argument("--view", choices=["reader","character"], default="character")
+
+    p7 = sub.add_parser("who-knew", help="which characters knew a node's field by a scene (epistemic clock)")
+    p7.add_argument("--node", required=True)
+    p7.add_argument("--field", required=True, help="knowledge_delta field_path, e.g. effects.regen_rate")
+    p7.add_argument("--scene", required=True)
+
+    p5 = sub.add_parser("world-snapshot", help="every character's state at a scene (process pool)")
+    p5.add_argument("--scene", required=True)
+    p5.add_argument("--view", choices=["reader","character"], default="character")
+    p5.add_argument("--jobs", "-j", type=int, default=0, help="worker processes (0 = one per CPU; default: %(default)s)")
+    p5.add_argument("--jsonl", action="store_true", help="one line per character instead of one merged document")
+    p5.add_argument("--output", type=Path, default=None, help="write here instead of stdout")
+    p5.add_argument("--no-cache", action="store_true", help="replay from event zero; skip .cache/projector checkpoints")
+    for p in (p1, p2, p4, p5, p6, p7):
+        instrumentation.add_arguments(p)
+
+    p3 = sub.add_parser("serve", help="keep timelines loaded; answer snapshot/compare/diff/who-knew over HTTP or a Unix socket")
+    p3.add_argument("--host", default="127.0.0.1")
+    p3.add_argument("--port", type=int, default=8766)
+    p3.add_argument("--socket", type=Path, default=None, help="listen on this Unix socket instead of HTTP")
+    p3.add_argument("--cache-size", type=int, default=4096, help="LRU result cache entries (default: %(default)s)")
     args = ap.parse_args()
 
     root = Path(".")
-    if args.cmd == "snapshot":
-        print(json.dumps(project(args.character, args.scene, view=args.view, repo_root=root), indent=2))
-    else:
-        print(json.dumps(compare_before_after(args.character, args.topic, repo_root=root), indent=2))
+    if args.cmd == "serve":
+        from tools.projector_serve import serve  # noqa: E402  # imports this module
+        raise SystemExit(serve(repo_root=root, host=args.host, port=args.port, socket_path=args.socket,
+                               cache_size=args.cache_size))
+    with instrumentation.session(f"projector.{args.cmd}", args):
+        if args.cmd == "snapshot" and (args.range or args.all_scenes):
+            first, last = args.range or ("00.00.00", "99.99.99")
+            records = iter_scene_states(args.character, first=first, last=last, view=args.view, repo_root=root,
+                                        full_every=args.full_every)
+            _write_jsonl(records, args.output)
+            return
+        elif args.cmd == "world-snapshot":
+            kwargs = {"view": args.view, "repo_root": root, "jobs": args.jobs or os.cpu_count() or 1,
+                      "checkpoint_every": None if args.no_cache else DEFAULT_CHECKPOINT_EVERY}
+            if args.jsonl:
+                lines = ({"character": c, "scene": args.scene, "error": err} if err else state
+                         for c, state, err in iter_world(args.scene, **kwargs))
+                _write_jsonl(lines, args.output)
+                return
+            result = project_world(args.scene, **kwargs)
+            if args.output:
+                # Same text as the stdout print below (json.dumps(..., indent=2)), written atomically.
+                write_json_atomic(args.output, result, indent=2, ensure_ascii=True)
+                return
+        elif args.cmd == "snapshot":
+            checkpoints = None if args.no_cache else CheckpointCache(every=args.checkpoint_every)
+            result = project(args.character, args.scene, view=args.view, repo_root=root, checkpoints=checkpoints)
+        elif args.cmd == "diff":
+            result = diff_scenes(args.character, args.first, args.last, view=args.view, repo_root=root)
+        elif args.cmd == "who-knew":
+            knowledge = KnowledgeIndex(root)
+            with instrumentation.phase("load"):
+                knowledge.refresh()
+            result = knowledge.who_knew(args.node, args.field, args.scene)
+        elif args.cmd == "events":
+            with instrumentation.phase("load"):
+                columns = _load_columns(args.character, root)
+            with instrumentation.phase("select"):
+                rows = columns.select(types=args.types, node_prefix=args.node, first=args.first, last=args.last,
+                                      view=args.view)
+                result = columns.events(rows)
+        elif args.topics_file:
+            result = compare_topics(args.character, _read_topics(args.topics_file), repo_root=root,
+                                    use_columns=not args.no_cache)
+        else:
+            result = compare_before_after(args.character, args.topic, repo_root=root, use_columns=not args.no_cache)
+    print(json.dumps(result, indent=2))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Long-running query server behind `projector.py serve`.
+
+Every timeline under `records/characters/` is loaded and checked once at
+start-up and indexed in both reader and epistemic order. Answered queries go into an
+LRU cache keyed by `(character, scene, view)` (compare verdicts by
+`(character, topic, "compare")`, diffs by `(character, "S1..S2", "diff:<view>")`). Each query stats that character's
+`timeline.json`; when its mtime or size changed, the timeline is reloaded and
+only that character's cached results are dropped. Reverse `who-knew` queries
+span every character, so they are answered from a `KnowledgeIndex` (built on
+first use) that re-indexes just the timelines changed since the last query.
+
+Localhost HTTP (default):
+
+* `GET /health` → `{"status": "ok", "characters": N, "cache": {...}}`
+* `GET /snapshot?character=pc.jake&scene=01.02.01[&view=reader]` → same JSON as `projector.py snapshot`
+* `GET /compare?character=pc.jake&topic=sn.meditation.` → same JSON as `projector.py compare`
+* `GET /diff?character=pc.jake&from=03.10.01&to=03.25.04[&view=reader]` → same JSON as `projector.py diff`
+* `GET /who-knew?node=sn.meditation.tier_1&field=rarity&scene=01.02.01` → same JSON as `projector.py who-knew`
+
+Unix socket (`--socket PATH`): one JSON request per line, e.g.
+`{"op": "snapshot", "character": "pc.jake", "scene": "01.02.01"}`, answered
+with one line `{"ok": true, "result": ...}` or `{"ok": false, "error": "..."}`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from tools.projector import (
+	SCENE_RE,
+	VIEWS,
+	KnowledgeIndex,
+	TimelineIndex,
+	TopicIndex,
+	_load_timeline,
+	_new_state,
+	_replay,
+	_timeline_path,
+	diff_index,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_CACHE_SIZE = 4096
+
+
+class UnknownQuery(LookupError):
+	"""Unknown route/op or character (HTTP 404)."""
+
+
+def _check_scene(scene_id: Any) -> None:
+	if not (isinstance(scene_id, str) and SCENE_RE.match(scene_id)):
+		raise ValueError(f"scene must be BB.CC.SS, got {scene_id!r}")
+
+
+def _check_view(view: Any) -> None:
+	if view not in VIEWS:
+		raise ValueError(f"view must be one of {', '.join(VIEWS)}, got {view!r}")
+
+
+def _slug(character_id: str) -> str:
+	return character_id.split(".", 1)[-1]
+
+
+class _Timeline:
+	"""One character's checked events, indexed for bisect cutoffs in both views."""
+
+	def __init__(self, slug: str, repo_root: Path) -> None:
+		path = _timeline_path(slug, repo_root)
+		stat = path.stat()
+		self.signature = (stat.st_mtime_ns, stat.st_size)
+		self.error: Optional[str] = None
+		self.index = TimelineIndex([])
+		self._topics: Optional[TopicIndex] = None
+		try:
+			self.index = TimelineIndex(_load_timeline(slug, repo_root))
+		except ValueError as exc:
+			# Keep serving the other characters; queries for this one report the problem.
+			self.error = str(exc)
+
+	@property
+	def topics(self) -> TopicIndex:
+		if self._topics is None:
+			self._topics = TopicIndex.from_events(self.index.events)
+		return self._topics
+
+
+class ProjectorService:
+	"""Answer snapshot/compare/diff/who-knew queries from loaded timelines with an LRU result cache."""
+
+	def __init__(self, repo_root: Path = Path("."), *, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+		self.repo_root = repo_root
+		self.cache_size = cache_size
+		self._lock = threading.Lock()
+		self._timelines: dict[str, _Timeline] = {}
+		self._cache: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+		self._knowledge: Optional[KnowledgeIndex] = None
+		self.hits = self.misses = self.reloads = 0
+		characters_root = repo_root / "records" / "characters"
+		for path in sorted(characters_root.glob("*/timeline.json")) if characters_root.is_dir() else []:
+			self._timelines[path.parent.name] = _Timeline(path.parent.name, repo_root)
+
+	def _timeline(self, character_id: str) -> _Timeline:
+		"""Loaded timeline for *character_id*, reloaded (and its cache entries dropped) if the file changed."""
+		slug = _slug(character_id)
+		try:
+			stat = _timeline_path(slug, self.repo_root).stat()
+		except FileNotFoundError:
+			self._timelines.pop(slug, None)
+			self._invalidate(slug)
+			raise UnknownQuery(f"no timeline for {character_id}") from None
+		loaded = self._timelines.get(slug)
+		if loaded is None or loaded.signature != (stat.st_mtime_ns, stat.st_size):
+			if loaded is not None:
+				self.reloads += 1
+			self._invalidate(slug)
+			loaded = self._timelines[slug] = _Timeline(slug, self.repo_root)
+		if loaded.error is not None:
+			raise ValueError(loaded.error)
+		return loaded
+
+	def _invalidate(self, slug: str) -> None:
+		for key in [key for key in self._cache if _slug(key[0]) == slug]:
+			del self._cache[key]
+
+	def _cached(self, key: tuple[str, str, str], compute) -> dict[str, Any]:
+		if key in self._cache:
+			self.hits += 1
+			self._cache.move_to_end(key)
+			return self._cache[key]
+		self.misses += 1
+		result = compute()
+		self._cache[key] = result
+		if len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
+		return result
+
+	def snapshot(self, character_id: str, scene_id: str, view: str = "character") -> dict[str, Any]:
+		_check_scene(scene_id)
+		_check_view(view)
+		with self._lock:
+			timeline = self._timeline(character_id)
+			return self._cached(
+				(character_id, scene_id, view),
+				lambda: _replay(_new_state(character_id, scene_id), timeline.index.upto(scene_id, view)),
+			)
+
+	def diff(self, character_id: str, first: str, last: str, view: str = "character") -> dict[str, Any]:
+		_check_scene(first)
+		_check_scene(last)
+		_check_view(view)
+		with self._lock:
+			timeline = self._timeline(character_id)
+			return self._cached(
+				(character_id, f"{first}..{last}", f"diff:{view}"),
+				lambda: diff_index(timeline.index, character_id, first, last, view=view),
+			)
+
+	def compare(self, character_id: str, topic: str) -> dict[str, Any]:
+		if not topic:
+			raise ValueError("topic is required")
+		with self._lock:
+			timeline = self._timeline(character_id)
+			return self._cached(
+				(character_id, topic, "compare"),
+				lambda: timeline.topics.compare(topic),
+			)
+
+	def who_knew(self, node_id: str, field_path: str, scene_id: str) -> dict[str, Any]:
+		if not (node_id and field_path):
+			raise ValueError("node and field are required")
+		_check_scene(scene_id)
+		with self._lock:
+			if self._knowledge is None:
+				self._knowledge = KnowledgeIndex(self.repo_root)
+			self._knowledge.refresh()
+			return self._knowledge.who_knew(node_id, field_path, scene_id)
+
+	def health(self) -> dict[str, Any]:
+		with self._lock:
+			return {
+				"status": "ok",
+				"characters": len(self._timelines),
+				"cache": {
+					"size": len(self._cache),
+					"max_size": self.cache_size,
+					"hits": self.hits,
+					"misses": self.misses,
+					"reloads": self.reloads,
+				},
+			}
+
+	def query(self, op: str, params: dict[str, Any]) -> dict[str, Any]:
+		"""Dispatch one request; raises `UnknownQuery` (404) or `ValueError` (400)."""
+		if op == "health":
+			return self.health()
+		if op == "who-knew":
+			return self.who_knew(params.get("node"), params.get("field"), params.get("scene"))
+		if op not in {"snapshot", "compare", "diff"}:
+			raise UnknownQuery(f"unknown query {op!r}")
+		character_id = params.get("character")
+		if not character_id:
+			raise ValueError("character is required")
+		if op == "snapshot":
+			return self.snapshot(character_id, params.get("scene"), params.get("view") or "character")
+		if op == "diff":
+			return self.diff(character_id, params.get("from"), params.get("to"), params.get("view") or "character")
+		return self.compare(character_id, params.get("topic"))
+
+
+def make_http_server(service: ProjectorService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+	"""Build (but do not start) the localhost JSON API for *service*."""
+
+	class Handler(BaseHTTPRequestHandler):
+		def _respond(self, status: int, payload: dict[str, Any]) -> None:
+			body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+			self.send_response(status)
+			self.send_header("Content-Type", "application/json; charset=utf-8")
+			self.send_header("Content-Length", str(len(body)))
+			self.end_headers()
+			self.wfile.write(body)
+
+		def do_GET(self) -> None:  # noqa: N802 - http.server naming
+			url = urlparse(self.path)
+			params = {key: values[0] for key, values in parse_qs(url.query).items()}
+			try:
+				self._respond(200, service.query(url.path.strip("/"), params))
+			except UnknownQuery as exc:
+				self._respond(404, {"error": str(exc)})
+			except ValueError as exc:
+				self._respond(400, {"error": str(exc)})
+
+		def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+			return
+
+	return ThreadingHTTPServer((host, port), Handler)
+
+
+def make_unix_server(service: ProjectorService, socket_path: Path) -> socketserver.ThreadingUnixStreamServer:
+	"""Build (but do not start) the line-delimited JSON API on a Unix socket."""
+
+	class Handler(socketserver.StreamRequestHandler):
+		def handle(self) -> None:
+			for line in self.rfile:
+				if not line.strip():
+					continue
+				try:
+					request = json.loads(line)
+					if not isinstance(request, dict):
+						raise ValueError("request must be a JSON object")
+					response = {"ok": True, "result": service.query(request.get("op", ""), request)}
+				except (LookupError, ValueError) as exc:
+					response = {"ok": False, "error": str(exc)}
+				self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+				self.wfile.flush()
+
+	if socket_path.exists():
+		socket_path.unlink()  # stale socket from a previous run
+	server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+	server.daemon_threads = True  # as ThreadingHTTPServer: idle clients must not block shutdown
+	return server
+
+
+def serve(
+	*,
+	repo_root: Path = Path("."),
+	host: str = DEFAULT_HOST,
+	port: int = DEFAULT_PORT,
+	socket_path: Optional[Path] = None,
+	cache_size: int = DEFAULT_CACHE_SIZE,
+) -> int:
+	service = ProjectorService(repo_root, cache_size=cache_size)
+	if socket_path is not None:
+		server: socketserver.BaseServer = make_unix_server(service, socket_path)
+		where = f"unix:{socket_path}"
+	else:
+		server = make_http_server(service, host, port)
+		where = f"http://{host}:{server.server_address[1]}/snapshot"
+	print(f"📚 Loaded {service.health()['characters']} timeline(s) from {repo_root / 'records' / 'characters'}")
+	print(f"🌐 Serving projector queries on {where}")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		print("\n👋 Stopping projector server.")
+	finally:
+		server.server_close()
+		if socket_path is not None and socket_path.exists():
+			os.unlink(socket_path)
+	return 0
@@ -16,6 +16,7 @@ from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
+from core import instrumentation
 from core.io_safe import write_json_atomic
 
 SUPPORTED_EXTENSIONS = {".md", ".txt"}
@@ -86,46 +87,50 @@ def search_and_copy(
 	manifest: dict[str, dict] = {}
 	matches_found = 0
 
-	for file_path in iter_text_files(chapters_root, extensions):
-		with file_path.open("r", encoding="utf-8") as handle:
-			lines = handle.readlines()
-
-		line_hits: list[int] = []
-		for idx, line in enumerate(lines, start=1):
-			haystack = line.rstrip()
-			if use_regex:
-				if pattern.search(haystack):
-					line_hits.append(idx)
-			else:
-				lowered_line = haystack.lower()
-				if any(keyword in lowered_line for keyword in lowered):
-					line_hits.append(idx)
-
-		if not line_hits:
-			continue
-
-		relative_path = file_path.relative_to(chapters_root)
-		destination_path = destination_root / relative_path
-		destination_path.parent.mkdir(parents=True, exist_ok=True)
-		shutil.copyfile(file_path, destination_path)
-
-		excerpts = build_excerpts(lines, line_hits, context_lines)
-		manifest[relative_path.as_posix()] = {
-			"relative_path": relative_path.as_posix(),
-			"matches": [
-				{
-					"line": record.line,
-					"excerpt": record.excerpt,
-				}
-				for record in excerpts
-			],
-			"keyword_mode": keyword_mode,
-			"keywords": keywords,
-		}
-		matches_found += 1
-
-	manifest_path = destination_root / "manifest.json"
-	write_json_atomic(manifest_path, manifest, ensure_ascii=False, indent=2)
+	with instrumentation.phase("scan"):
+		for file_path in iter_text_files(chapters_root, extensions):
+			with file_path.open("r", encoding="utf-8") as handle:
+				lines = handle.readlines()
+			if instrumentation.active() is not None:
+				instrumentation.record_read(file_path.stat().st_size)
+
+			line_hits: list[int] = []
+			for idx, line in enumerate(lines, start=1):
+				haystack = line.rstrip()
+				if use_regex:
+					if pattern.search(haystack):
+						line_hits.append(idx)
+				else:
+					lowered_line = haystack.lower()
+					if any(keyword in lowered_line for keyword in lowered):
+						line_hits.append(idx)
+
+			if not line_hits:
+				continue
+
+			relative_path = file_path.relative_to(chapters_root)
+			destination_path = destination_root / relative_path
+			destination_path.parent.mkdir(parents=True, exist_ok=True)
+			shutil.copyfile(file_path, destination_path)
+
+			excerpts = build_excerpts(lines, line_hits, context_lines)
+			manifest[relative_path.as_posix()] = {
+				"relative_path": relative_path.as_posix(),
+				"matches": [
+					{
+						"line": record.line,
+						"excerpt": record.excerpt,
+					}
+					for record in excerpts
+				],
+				"keyword_mode": keyword_mode,
+				"keywords": keywords,
+			}
+			matches_found += 1
+
+	with instrumentation.phase("write_manifest"):
+		manifest_path = destination_root / "manifest.json"
+		write_json_atomic(manifest_path, manifest, ensure_ascii=False, indent=2)
 
 	return matches_found
 
@@ -171,6 +176,7 @@ def parse_arguments() -> argparse.Namespace:
 		default=",".join(sorted(SUPPORTED_EXTENSIONS)),
 		help="Comma-separated list of file extensions to scan (default: .md,.txt).",
 	)
+	instrumentation.add_arguments(parser)
 	return parser.parse_args()
 
 
@@ -183,15 +189,16 @@ def main() -> None:
 		search_terms = args.keywords
 
 	extensions = {ext if ext.startswith(".") else f".{ext}" for ext in args.extensions.split(",") if ext}
-	matches = search_and_copy(
-		chapters_root=args.chapters_root,
-		output_root=args.output_root,
-		keywords=search_terms,
-		use_regex=args.regex,
-		context_lines=args.context_lines,
-		extensions=extensions,
-		slug=args.slug,
-	)
+	with instrumentation.session("search_term_mentions", args):
+		matches = search_and_copy(
+			chapters_root=args.chapters_root,
+			output_root=args.output_root,
+			keywords=search_terms,
+			use_regex=args.regex,
+			context_lines=args.context_lines,
+			extensions=extensions,
+			slug=args.slug,
+		)
 
 	print(
 		f"Copied {matches} file(s) containing {search_terms[0] if args.regex else search_terms} "
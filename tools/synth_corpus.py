@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Generate a schema-valid synthetic `records/` + `chapters/` tree for scale testing.
+
+The output directory looks like a checkout of this repo's data (scene index,
+metadata sidecars, character timelines, tag registry, chapter text), so every
+tool can be pointed at it by running from that directory. Generation is
+deterministic for a given scale and seed. A `corpus.json` summary at the root
+records the counts and a few sample ids that `tools/benchmark_tools.py` uses.
+
+Example:
+	python tools/synth_corpus.py --scale medium --output .cache/synth/medium
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+	sys.path.insert(0, str(REPO_ROOT))
+
+from core.io_safe import write_json_atomic  # noqa: E402  # imported after sys.path fix
+
+SUMMARY_FILENAME = "corpus.json"
+SEARCH_TERM = "Arcane Powershot"
+# Scene ids are BB.CC.SS, so books, chapters per book and scenes per chapter each top out at 99.
+MAX_ID_COMPONENT = 99
+TAG_NAMESPACES = ("skills", "topic", "scene_type", "affinity", "mood")
+EVENT_TYPES = (
+	("skill_acquired", 14),
+	("skill_observation", 30),
+	("skill_evolved", 8),
+	("skill_upgraded", 4),
+	("insight_gained", 16),
+	("combat_action", 18),
+	("training_session", 10),
+)
+FIELD_PATHS = ("effects.recovery_rate", "effects.regen_rate", "cost.mana", "cooldown", "range", "effects.damage")
+WORDS = (
+	"the arrow hunter forest mana stamina bow beast tutorial system level tier bloodline "
+	"poison alchemy meditation cave boar wolf river sky primal instinct focus breath"
+).split()
+
+
+@dataclass(frozen=True)
+class Scale:
+	books: int
+	chapters: int
+	scenes: int
+	events: int
+	tags: int
+	characters: int
+	lines_per_scene: tuple[int, int] = (40, 120)
+
+	def __post_init__(self) -> None:
+		for name in ("books", "chapters", "scenes"):
+			value = getattr(self, name)
+			if not 1 <= value <= MAX_ID_COMPONENT:
+				raise ValueError(f"{name} must be between 1 and {MAX_ID_COMPONENT} (scene ids are BB.CC.SS), got {value}")
+		if self.characters < 1 or self.events < self.characters:
+			raise ValueError("need at least one character and one event per character")
+		if self.tags < len(TAG_NAMESPACES):
+			raise ValueError(f"need at least {len(TAG_NAMESPACES)} tags (one per namespace)")
+
+
+# "full" approximates 20 books x 150 chapters x 4 scenes with the chapter count capped by the id format.
+SCALES = {
+	"smoke": Scale(books=1, chapters=6, scenes=2, events=1_000, tags=200, characters=2),
+	"medium": Scale(books=5, chapters=40, scenes=4, events=100_000, tags=10_000, characters=4),
+	"full": Scale(books=20, chapters=99, scenes=6, events=1_000_000, tags=50_000, characters=8),
+}
+
+SceneSpan = tuple[str, int, int]
+
+
+def _book_dirname(book: int) -> str:
+	return f"Book {book:02d} - Synthetic"
+
+
+def _sentence(rng: random.Random, line_number: int) -> str:
+	words = rng.choices(WORDS, k=rng.randint(6, 14))
+	if line_number % 37 == 0:
+		words.insert(rng.randrange(len(words)), SEARCH_TERM)
+	return " ".join(words).capitalize() + "."
+
+
+def _tag_registry(scale: Scale) -> dict[str, list[dict[str, Any]]]:
+	registry: dict[str, list[dict[str, Any]]] = {namespace: [] for namespace in TAG_NAMESPACES}
+	for index in range(scale.tags):
+		namespace = TAG_NAMESPACES[index % len(TAG_NAMESPACES)]
+		tag = f"{namespace}_{WORDS[index % len(WORDS)]}_{index:06d}"
+		approved = index % 3 == 0
+		registry[namespace].append(
+			{
+				"tag_id": f"tag.{namespace}.{tag}",
+				"tag": tag,
+				"type": namespace,
+				"tag_role": "heuristic",
+				"status": "approved" if approved else "candidate",
+				"approved": approved,
+				"allow_inferred": index % 2 == 0,
+				"description": tag.replace("_", " ").title(),
+			}
+		)
+	return registry
+
+
+def _write_chapters_and_scenes(root: Path, scale: Scale, rng: random.Random, tag_names: list[str]) -> list[SceneSpan]:
+	"""Write chapter text plus one scene index entry (and sidecar) per scene; return scene spans in book order."""
+	spans: list[SceneSpan] = []
+	chapter_number = 0
+	for book in range(1, scale.books + 1):
+		chapter_dir = root / "chapters" / _book_dirname(book)
+		scene_dir = root / "records" / "scene_index" / _book_dirname(book)
+		chapter_dir.mkdir(parents=True, exist_ok=True)
+		scene_dir.mkdir(parents=True, exist_ok=True)
+		for chapter in range(1, scale.chapters + 1):
+			chapter_number += 1
+			chapter_path = chapter_dir / f"{chapter_number:04d}_Chapter_{chapter_number}_Synthetic.md"
+			lines: list[str] = []
+			for scene in range(1, scale.scenes + 1):
+				scene_id = f"{book:02d}.{chapter:02d}.{scene:02d}"
+				start_line = len(lines) + 1
+				lines.extend(_sentence(rng, start_line + offset) for offset in range(rng.randint(*scale.lines_per_scene)))
+				end_line = len(lines)
+				spans.append((scene_id, start_line, end_line))
+				scene_data = {
+					"scene_id": scene_id,
+					"book": book,
+					"chapter": chapter,
+					"scene": scene,
+					"title": f"Synthetic Scene {scene_id}",
+					"summary": " ".join(rng.choices(WORDS, k=24)).capitalize() + ".",
+					"source_file": chapter_path.relative_to(root).as_posix(),
+					"start_line": start_line,
+					"end_line": end_line,
+					"pov": "Synth",
+					"mood": sorted(set(rng.choices(WORDS, k=3))),
+					"characters": {"Synth": {"present": "explicit"}},
+					"tags": sorted(set(rng.choices(tag_names, k=3))),
+				}
+				scene_path = scene_dir / f"{scene_id}.json"
+				write_json_atomic(scene_path, scene_data)
+				write_json_atomic(
+					scene_path.with_name(f"{scene_path.name}.meta.json"),
+					{
+						"entered_by": "assistant",
+						"reviewed_by_human": False,
+						"source": {"book": _book_dirname(book), "chapter": chapter, "scene": scene, "scene_id": scene_id},
+						"records": True,
+					},
+				)
+			chapter_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+	return spans
+
+
+def _character_events(
+	slug: str, count: int, spans: list[SceneSpan], rng: random.Random
+) -> Iterator[dict[str, Any]]:
+	"""Yield *count* events for one character, advancing through the book in order."""
+	types = [event_type for event_type, _ in EVENT_TYPES]
+	weights = [weight for _, weight in EVENT_TYPES]
+	known_nodes: list[str] = []
+	previous_scene = None
+	order = 0
+	for index in range(count):
+		scene_id, start_line, end_line = spans[index * len(spans) // count]
+		order = order + 1 if scene_id == previous_scene else 1
+		previous_scene = scene_id
+		line_start = rng.randint(start_line, end_line)
+		event_type = rng.choices(types, weights)[0] if known_nodes else "skill_acquired"
+		event: dict[str, Any] = {
+			"event_id": f"ev.{slug}.{scene_id}.e{index:07d}",
+			"scene_id": scene_id,
+			"order": order,
+			"type": event_type,
+			"source_ref": [
+				{
+					"type": "scene",
+					"scene_id": scene_id,
+					"line_start": line_start,
+					"line_end": min(end_line, line_start + rng.randint(0, 6)),
+				}
+			],
+		}
+		delta = {
+			"field_path": rng.choice(FIELD_PATHS),
+			"new_value": rng.randint(1, 500),
+			"confidence": rng.choice((0.4, 0.7, 1.0)),
+		}
+		if event_type == "skill_acquired":
+			node_id = f"sn.{slug}.skill_{len(known_nodes):05d}.tier_1"
+			known_nodes.append(node_id)
+			event.update(node_id=node_id, knowledge_delta=[delta])
+		elif event_type in {"skill_observation", "skill_evolved"}:
+			event.update(node_id=rng.choice(known_nodes), knowledge_delta=[delta])
+		elif event_type == "skill_upgraded":
+			position = rng.randrange(len(known_nodes))
+			from_node = known_nodes[position]
+			stem, tier = from_node.rsplit(".tier_", 1)
+			to_node = f"{stem}.tier_{int(tier) + 1}"
+			known_nodes[position] = to_node
+			event.update(from_node_id=from_node, to_node_id=to_node, knowledge_delta=[delta])
+		else:
+			event["notes"] = " ".join(rng.choices(WORDS, k=8)).capitalize() + "."
+		if index % 25 == 0:
+			event["epistemic_at"] = {"scene_id": spans[max(0, index * len(spans) // count - 1)][0]}
+		yield event
+
+
+def _write_timeline(path: Path, events: Iterator[dict[str, Any]]) -> int:
+	"""Stream events into a JSON array, one compact element per line, without holding the timeline in memory."""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	written = 0
+	with path.open("w", encoding="utf-8") as handle:
+		handle.write("[")
+		for event in events:
+			handle.write(",\n\t" if written else "\n\t")
+			handle.write(json.dumps(event, ensure_ascii=False))
+			written += 1
+		handle.write("\n]\n")
+	return written
+
+
+def generate(output: Path, scale: Scale, *, seed: int = 1, force: bool = False) -> dict[str, Any]:
+	"""Write the synthetic tree under *output* and return its `corpus.json` summary."""
+	output = Path(output)
+	if output.exists() and any(output.iterdir()):
+		if not force:
+			raise FileExistsError(f"{output} is not empty (pass force=True / --force to replace it)")
+		shutil.rmtree(output)
+	rng = random.Random(seed)
+
+	# Tools resolve `schemas/...` relative to the working directory, like a checkout.
+	shutil.copytree(REPO_ROOT / "schemas", output / "schemas")
+	registry = _tag_registry(scale)
+	write_json_atomic(output / "tagging" / "tag_registry.json", registry)
+	tag_names = [entry["tag"] for entries in registry.values() for entry in entries]
+
+	spans = _write_chapters_and_scenes(output, scale, rng, tag_names)
+	write_json_atomic(output / "records" / "skills.json", {})
+
+	characters = []
+	per_character, remainder = divmod(scale.events, scale.characters)
+	for number in range(scale.characters):
+		slug = f"synth_{number:02d}"
+		count = per_character + (1 if number < remainder else 0)
+		path = output / "records" / "characters" / slug / "timeline.json"
+		_write_timeline(path, _character_events(slug, count, spans, rng))
+		characters.append(f"pc.{slug}")
+
+	summary = {
+		"scale": asdict(scale),
+		"seed": seed,
+		"counts": {
+			"books": scale.books,
+			"chapters": scale.books * scale.chapters,
+			"scenes": len(spans),
+			"events": scale.events,
+			"tags": scale.tags,
+			"characters": scale.characters,
+			"record_files": sum(1 for _ in (output / "records").rglob("*.json")) + 1,
+			"chapter_files": scale.books * scale.chapters,
+		},
+		"samples": {
+			"character": characters[0],
+			"first_scene": spans[0][0],
+			"middle_scene": spans[len(spans) // 2][0],
+			"last_scene": spans[-1][0],
+			"topic": f"sn.{characters[0].split('.', 1)[1]}.skill_00000",
+			"search_term": SEARCH_TERM,
+		},
+	}
+	write_json_atomic(output / SUMMARY_FILENAME, summary)
+	return summary
+
+
+def load_summary(corpus: Path) -> dict[str, Any]:
+	path = Path(corpus) / SUMMARY_FILENAME
+	if not path.exists():
+		raise FileNotFoundError(f"{path} not found; generate the corpus with tools/synth_corpus.py first")
+	return json.loads(path.read_text(encoding="utf-8"))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--scale", choices=sorted(SCALES), default="smoke", help="Preset size (default: %(default)s)")
+	parser.add_argument("--output", type=Path, default=None, help="Target directory (default: .cache/synth/<scale>)")
+	parser.add_argument("--seed", type=int, default=1, help="Random seed (default: %(default)s)")
+	parser.add_argument("--force", action="store_true", help="Replace an existing non-empty output directory")
+	for name in ("books", "chapters", "scenes", "events", "tags", "characters"):
+		parser.add_argument(f"--{name}", type=int, default=None, help=f"Override the preset's {name} count")
+	return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+	args = parse_args(argv)
+	overrides = {
+		name: getattr(args, name)
+		for name in ("books", "chapters", "scenes", "events", "tags", "characters")
+		if getattr(args, name) is not None
+	}
+	try:
+		scale = replace(SCALES[args.scale], **overrides)
+	except ValueError as exc:
+		print(f"❌ {exc}")
+		return 2
+	output = args.output or REPO_ROOT / ".cache" / "synth" / args.scale
+	try:
+		summary = generate(output, scale, seed=args.seed, force=args.force)
+	except FileExistsError as exc:
+		print(f"❌ {exc}")
+		return 1
+	counts = summary["counts"]
+	print(
+		f"✅ Wrote {counts['scenes']} scenes in {counts['chapters']} chapters, {counts['events']} timeline events "
+		f"across {counts['characters']} character(s) and {counts['tags']} tags to {output}"
+	)
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
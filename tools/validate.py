@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Run every records validator against one shared, parse-once RecordStore.
+
+Equivalent to running `validate_all_metadata`, `validate_tags`,
+`validate_ids` and `validate_provenance` back to back, except each JSON file
+under `records/` is discovered and parsed a single time, and walked a single
+time for every key-name rule the validators register.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+	sys.path.insert(0, str(REPO_ROOT))
+
+from core.record_store import RecordStore  # noqa: E402  # imported after sys.path fix
+from core.record_walker import SharedWalk  # noqa: E402
+from core.validation_manifest import ValidationManifest  # noqa: E402
+from tools.validate_all_metadata import MANIFEST_PATH, subscribe_metadata_rules, validate_all  # noqa: E402
+from tools.validate_ids import RECORDS_ROOT, collect_event_id_findings  # noqa: E402
+from tools.validate_provenance import collect_provenance_findings, subscribe_inline_blocks  # noqa: E402
+from tools.validate_tags import TAG_REGISTRY_PATH, subscribe_tag_usage, validate_tags  # noqa: E402
+
+
+def _report(title: str, errors: list[str], warnings: list[str]) -> int:
+	for warning in warnings:
+		print(f"⚠️  {warning}")
+	for error in errors:
+		print(f"❌ {error}")
+	status = "failed" if errors else "passed"
+	print(f"{title}: {status} ({len(errors)} error(s), {len(warnings)} warning(s))")
+	return 1 if errors else 0
+
+
+def run_all(
+	*,
+	jobs: int = 1,
+	manifest: ValidationManifest | None = None,
+	tag_mode: str = "draft",
+	strict_ids: bool = False,
+	allow_inline: bool = False,
+	store: RecordStore | None = None,
+) -> int:
+	"""Run all validators sharing *store*; return 1 if any of them reported errors."""
+	store = store or RecordStore()
+	# Every validator subscribes before any of them runs, so the first one to
+	# reach a file walks it for all of them.
+	walk = SharedWalk(store.load)
+	subscribe_metadata_rules(walk, store)
+	subscribe_tag_usage(walk, RECORDS_ROOT, TAG_REGISTRY_PATH, tag_mode, store)
+	subscribe_inline_blocks(walk, store)
+	statuses = [validate_all(jobs=jobs, manifest=manifest, store=store, walk=walk)]
+
+	tag_errors, tag_warnings = validate_tags(
+		RECORDS_ROOT, TAG_REGISTRY_PATH, mode=tag_mode, store=store, walk=walk
+	)
+	statuses.append(_report("Tag usage", tag_errors, tag_warnings))
+
+	id_errors, id_warnings = collect_event_id_findings(RECORDS_ROOT, strict=strict_ids, store=store)
+	statuses.append(_report("Event ids", id_errors, id_warnings))
+
+	provenance_errors, provenance_warnings = collect_provenance_findings(
+		allow_inline=allow_inline, store=store, walk=walk
+	)
+	statuses.append(
+		_report(
+			"Provenance",
+			[f"{finding.path}: {finding.message}" for finding in provenance_errors],
+			[f"{finding.path}: {finding.message}" for finding in provenance_warnings],
+		)
+	)
+
+	print(
+		f"📦 Parsed {store.parses} file(s); served {store.hits} repeat read(s) from memory; "
+		f"walked {walk.walks} document(s)."
+	)
+	return max(statuses)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument(
+		"--jobs",
+		"-j",
+		type=int,
+		default=1,
+		help="Schema-check across N worker processes (0 = one per CPU; default: %(default)s)",
+	)
+	parser.add_argument(
+		"--since-manifest",
+		type=Path,
+		nargs="?",
+		const=MANIFEST_PATH,
+		default=None,
+		metavar="PATH",
+		help=f"Skip metadata units unchanged since the manifest at PATH (bare flag: {MANIFEST_PATH})",
+	)
+	parser.add_argument("--full", action="store_true", help="Ignore cached metadata results.")
+	parser.add_argument(
+		"--tag-mode",
+		choices=["draft", "export"],
+		default="draft",
+		help="Draft mode downgrades candidate tags to warnings; export mode fails on them.",
+	)
+	parser.add_argument("--strict-ids", action="store_true", help="Treat missing event_id values as errors.")
+	parser.add_argument(
+		"--allow-inline",
+		action="store_true",
+		help="Downgrade inline source_ref findings to warnings (temporary migration aid).",
+	)
+	return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+	args = parse_args(argv)
+	manifest = None
+	if args.since_manifest is not None:
+		manifest = ValidationManifest.load(args.since_manifest, reuse=not args.full)
+	return run_all(
+		jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+		manifest=manifest,
+		tag_mode=args.tag_mode,
+		strict_ids=args.strict_ids,
+		allow_inline=args.allow_inline,
+	)
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
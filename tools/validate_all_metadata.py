@@ -11,19 +11,27 @@
 """Validate record metadata and enforce basic referential integrity."""
 
 import argparse
+import os
 import re
 import sys
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
-from jsonschema import Draft202012Validator, RefResolver
-
-from core.schema_utils import read_json
+from core import instrumentation
+from core.json_stream import JSONStreamError, NotAJSONArrayError
+from core.record_store import RecordStore
+from core.record_walker import RECORD_RULES, ROOT, Pointer, RuleEngine, SharedWalk
+from core.schema_registry import default_registry
+from core.schema_utils import get_validator, read_json
+from core.validation_manifest import DepsFunction, ValidationManifest, digest_values
 
 SCHEMA_ROOT = Path("schemas")
 RECORDS_ROOT = Path("records")
 TAG_REGISTRY_PATH = Path("tagging") / "tag_registry.json"
 CHARACTER_DIRECTORY = RECORDS_ROOT / "characters"
+MANIFEST_PATH = Path(".cache") / "validation_manifest.json"
 
 FILE_TO_SCHEMA_PATHS = {
 	RECORDS_ROOT / "skills.json": SCHEMA_ROOT / "skills.schema.json",
@@ -44,6 +52,8 @@ FILE_TO_SCHEMA_PATHS = {
 TIMELINE_SCHEMA = SCHEMA_ROOT / "character_timeline.schema.json"
 SCENE_SCHEMA = SCHEMA_ROOT / "scene_index.schema.json"
 META_SCHEMA = SCHEMA_ROOT / "file_metadata.schema.json"
+TAG_CHANNEL = "metadata_tags"
+CANONICAL_CHANNEL = "metadata_canonical"
 
 
 class ValidationError(Exception):
@@ -54,6 +64,8 @@ TAG_NAME_PATTERN = re.compile(r"^[a-z0-9_]+$")
 
 SceneBoundsMap = dict[str, tuple[int, int, Path]]
 SourceRefEntry = tuple[str, dict[str, object]]
+# Top-level entry key → the `canon`/`source_ref` values the walk found on that entry.
+CanonicalFields = dict[object, dict[str, object]]
 
 CANONICAL_RECORD_PATHS: tuple[Path, ...] = (
 	RECORDS_ROOT / "skills.json",
@@ -72,51 +84,57 @@ CANONICAL_RECORD_PATHS: tuple[Path, ...] = (
 	RECORDS_ROOT / "locations.json",
 )
 
-SHARED_SCHEMA_STORE = {
-	"https://primal-hunter.local/schemas/shared/granted_by.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "granted_by.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/flavor.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "flavor.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/resource_block.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "resource_block.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/tags.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "tags.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/provenance.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "provenance.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/source_ref.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "source_ref.schema.json"
-	),
-	"https://primal-hunter.local/schemas/shared/id.schema.json": read_json(SCHEMA_ROOT / "shared" / "id.schema.json"),
-	"https://primal-hunter.local/schemas/shared/record_log.schema.json": read_json(
-		SCHEMA_ROOT / "shared" / "record_log.schema.json"
-	),
-	"https://primal-hunter.local/schemas/timeline_event.schema.json": read_json(
-		SCHEMA_ROOT / "timeline_event.schema.json"
-	),
-	"https://primal-hunter.local/schemas/skill_node.schema.json": read_json(SCHEMA_ROOT / "skill_node.schema.json"),
-}
+
+SchemaTask = tuple[Path, Path]
 
 
-def _collect_schema_errors(data_path: Path, schema_path: Path) -> list[str]:
-	schema_definition = read_json(schema_path)
-	resolver = RefResolver.from_schema(schema_definition, store=SHARED_SCHEMA_STORE)
-	validator = Draft202012Validator(schema_definition, resolver=resolver)
-	instance_data = read_json(data_path)
+def _error_sort_key(validation_error) -> list[tuple[bool, object]]:
+	# Array indexes sort numerically, keys alphabetically, without mixing int/str comparisons.
+	return [(isinstance(part, str), part) for part in validation_error.path]
+
+
+def _collect_schema_errors(data_path: Path, schema_path: Path, store: Optional[RecordStore] = None) -> list[str]:
+	validator = get_validator(schema_path)
+	instance_data = store.load(data_path) if store is not None else read_json(data_path)
 	error_messages: list[str] = []
-	for validation_error in validator.iter_errors(instance_data):
+	for validation_error in sorted(validator.iter_errors(instance_data), key=_error_sort_key):
 		data_location = " → ".join(str(part) for part in validation_error.path) or "<root>"
 		error_messages.append(f"{data_path}: {data_location}: {validation_error.message}")
 	return error_messages
 
 
-def _iter_scene_files() -> Iterable[Path]:
+def _run_schema_task(task: SchemaTask) -> list[str]:
+	return _collect_schema_errors(*task)
+
+
+def _warm_schema_worker(schema_paths: Sequence[Path]) -> None:
+	"""Pool initializer: compile every schema once so each worker keeps them cached."""
+	for schema_path in schema_paths:
+		get_validator(schema_path)
+
+
+def _run_schema_checks(
+	tasks: Sequence[SchemaTask], jobs: int = 1, store: Optional[RecordStore] = None
+) -> dict[Path, list[str]]:
+	"""Validate each (data, schema) pair, optionally across a process pool.
+
+	Results are keyed by data path; callers emit them in their own (serial)
+	order, so the report is identical regardless of *jobs*. Worker processes
+	parse their own copies, so *store* is only used for serial runs.
+	"""
+	if jobs <= 1 or len(tasks) <= 1:
+		return {data_path: _collect_schema_errors(data_path, schema_path, store) for data_path, schema_path in tasks}
+	schema_paths = sorted({schema_path for _, schema_path in tasks})
+	workers = min(jobs, len(tasks))
+	chunksize = max(1, len(tasks) // (workers * 4))
+	with ProcessPoolExecutor(max_workers=workers, initializer=_warm_schema_worker, initargs=(schema_paths,)) as pool:
+		results = pool.map(_run_schema_task, tasks, chunksize=chunksize)
+		return {data_path: errors for (data_path, _), errors in zip(tasks, results)}
+
+
+def _iter_scene_files(store: Optional[RecordStore] = None) -> Iterable[Path]:
 	scene_directory = RECORDS_ROOT / "scene_index"
-	for scene_file in scene_directory.rglob("*.json"):
+	for scene_file in (store or RecordStore()).glob(scene_directory, "*.json"):
 		if scene_file.name.endswith(".meta.json"):
 			continue
 		if scene_file.name == "__init__.py":
@@ -124,14 +142,14 @@ def _iter_scene_files() -> Iterable[Path]:
 		yield scene_file
 
 
-def _iter_meta_files() -> Iterable[Path]:
-	return RECORDS_ROOT.rglob("*.meta.json")
+def _iter_meta_files(store: Optional[RecordStore] = None) -> Iterable[Path]:
+	return [path for path in (store or RecordStore()).glob(RECORDS_ROOT, "*.json") if path.name.endswith(".meta.json")]
 
 
 def _iter_timeline_files() -> Iterable[Path]:
 	if not CHARACTER_DIRECTORY.exists():
 		return []
-	for character_folder in CHARACTER_DIRECTORY.iterdir():
+	for character_folder in sorted(CHARACTER_DIRECTORY.iterdir()):
 		if not character_folder.is_dir():
 			continue
 		timeline_path = character_folder / "timeline.json"
@@ -158,14 +176,34 @@ def _flatten_tag_registry(tag_registry: dict) -> dict[str, dict]:
 	return flattened
 
 
-def _validate_tag_usage(records_root: Path, tag_registry: dict) -> list[str]:  # noqa: C901
+class _TagIndex:
+	"""Registry lookups the `tags` rule checks each tag entry against."""
+
+	def __init__(
+		self, canonical_tags: set[str], alias_to_canonical: dict[str, str], allow_inferred: dict[str, bool]
+	) -> None:
+		self.canonical_tags = canonical_tags
+		self.alias_to_canonical = alias_to_canonical
+		self.allow_inferred = allow_inferred
+
+
+class _TagIssues:
+	"""Per-file context for the `tags` rule."""
+
+	def __init__(self, index: _TagIndex, file_path: Path) -> None:
+		self.index = index
+		self.file_path = file_path
+		self.issues: list[str] = []
+
+
+def _build_tag_index(tag_registry: dict) -> tuple[list[str], Optional[_TagIndex]]:
+	"""Return registry-level errors plus the tag lookups (None when the registry is unusable)."""
 	errors: list[str] = []
 	tag_definitions = _flatten_tag_registry(tag_registry)
 	if not tag_definitions:
 		errors.append(f"{TAG_REGISTRY_PATH}: does not contain any tag definitions.")
-		return errors
+		return errors, None
 
-	canonical_tags = set(tag_definitions.keys())
 	alias_to_canonical: dict[str, str] = {}
 	allow_inferred_map: dict[str, bool] = {}
 
@@ -184,106 +222,157 @@ def _validate_tag_usage(records_root: Path, tag_registry: dict) -> list[str]:  #
 		elif aliases is not None:
 			errors.append(f"{TAG_REGISTRY_PATH}: aliases for '{tag_name}' must be a list if provided.")
 
-	def validate_tag_list(raw_value, pointer: str, file_path: Path) -> list[str]:  # noqa: C901
-		issues: list[str] = []
-		if not isinstance(raw_value, list):
-			issues.append(f"{file_path}: {pointer} → tags must be a list.")
-			return issues
-		for index, entry in enumerate(raw_value):
-			element_pointer = f"{pointer}/{index}"
-			if isinstance(entry, str):
-				tag_name = entry
-				inferred = False
-			elif isinstance(entry, dict):
-				tag_name = entry.get("tag")
-				if tag_name is None:
-					issues.append(f"{file_path}: {element_pointer} → tag object missing 'tag' property.")
-					continue
-				if not isinstance(tag_name, str):
-					issues.append(f"{file_path}: {element_pointer} → tag id must be a string.")
-					continue
-				inferred = entry.get("inferred", False)
-				if not isinstance(inferred, bool):
-					issues.append(f"{file_path}: {element_pointer} → 'inferred' must be a boolean if provided.")
-				extra_keys = {k for k in entry.keys() if k not in {"tag", "inferred"}}
-				if extra_keys:
-					issues.append(
-						f"{file_path}: {element_pointer} → unexpected keys " f"{sorted(extra_keys)} in tag object."
-					)
-			else:
-				issues.append(f"{file_path}: {element_pointer} → tag entries must be strings or objects with 'tag'.")
-				continue
+	return errors, _TagIndex(set(tag_definitions.keys()), alias_to_canonical, allow_inferred_map)
 
-			if not TAG_NAME_PATTERN.fullmatch(tag_name):
-				issues.append(f"{file_path}: {element_pointer} → tag '{tag_name}' must be lowercase snake_case.")
-				continue
 
-			canonical = tag_name
-			if tag_name in alias_to_canonical:
-				canonical = alias_to_canonical[tag_name]
+def _check_tag_list(raw_value, pointer: Pointer, context: _TagIssues) -> None:  # noqa: C901
+	issues, file_path, index = context.issues, context.file_path, context.index
+	if not isinstance(raw_value, list):
+		issues.append(f"{file_path}: {pointer.slash()} → tags must be a list.")
+		return
+	for position, entry in enumerate(raw_value):
+		if isinstance(entry, str):
+			tag_name = entry
+			inferred = False
+		elif isinstance(entry, dict):
+			tag_name = entry.get("tag")
+			if tag_name is None:
+				issues.append(f"{file_path}: {pointer.slash()}/{position} → tag object missing 'tag' property.")
+				continue
+			if not isinstance(tag_name, str):
+				issues.append(f"{file_path}: {pointer.slash()}/{position} → tag id must be a string.")
+				continue
+			inferred = entry.get("inferred", False)
+			if not isinstance(inferred, bool):
+				issues.append(f"{file_path}: {pointer.slash()}/{position} → 'inferred' must be a boolean if provided.")
+			extra_keys = {k for k in entry.keys() if k not in {"tag", "inferred"}}
+			if extra_keys:
 				issues.append(
-					f"{file_path}: {element_pointer} → tag '{tag_name}' is an alias; "
-					f"replace with canonical id '{canonical}'."
+					f"{file_path}: {pointer.slash()}/{position} → unexpected keys {sorted(extra_keys)} in tag object."
 				)
+		else:
+			issues.append(
+				f"{file_path}: {pointer.slash()}/{position} → tag entries must be strings or objects with 'tag'."
+			)
+			continue
 
-			if canonical not in canonical_tags:
-				issues.append(f"{file_path}: {element_pointer} → tag '{tag_name}' missing from {TAG_REGISTRY_PATH}.")
-				continue
+		if not TAG_NAME_PATTERN.fullmatch(tag_name):
+			issues.append(f"{file_path}: {pointer.slash()}/{position} → tag '{tag_name}' must be lowercase snake_case.")
+			continue
 
-			if inferred and not allow_inferred_map.get(canonical, False):
-				issues.append(
-					f"{file_path}: {element_pointer} → tag '{canonical}' cannot be marked "
-					"inferred (allow_inferred is false)."
-				)
-		return issues
-
-	def walk(node, pointer: str, *, file_path: Path):
-		if isinstance(node, dict):
-			for key, value in node.items():
-				child_pointer = f"{pointer}/{key}" if pointer else key
-				if key == "tags":
-					errors.extend(validate_tag_list(value, child_pointer, file_path))
-				else:
-					walk(value, child_pointer, file_path=file_path)
-		elif isinstance(node, list):
-			for index, item in enumerate(node):
-				child_pointer = f"{pointer}/{index}" if pointer else str(index)
-				walk(item, child_pointer, file_path=file_path)
+		canonical = tag_name
+		if tag_name in index.alias_to_canonical:
+			canonical = index.alias_to_canonical[tag_name]
+			issues.append(
+				f"{file_path}: {pointer.slash()}/{position} → tag '{tag_name}' is an alias; "
+				f"replace with canonical id '{canonical}'."
+			)
+
+		if canonical not in index.canonical_tags:
+			issues.append(
+				f"{file_path}: {pointer.slash()}/{position} → tag '{tag_name}' missing from {TAG_REGISTRY_PATH}."
+			)
+			continue
+
+		if inferred and not index.allow_inferred.get(canonical, False):
+			issues.append(
+				f"{file_path}: {pointer.slash()}/{position} → tag '{canonical}' cannot be marked "
+				"inferred (allow_inferred is false)."
+			)
+
+
+def _collect_canonical_field(value: object, pointer: Pointer, fields: CanonicalFields) -> None:
+	entry = pointer.parent
+	if entry is not None and entry.parent is ROOT:
+		fields.setdefault(entry.key, {})[pointer.key] = value
 
-	for json_path in records_root.rglob("*.json"):
+
+def _register_rules(engine: RuleEngine) -> RuleEngine:
+	engine.on("tags", _check_tag_list, channel=TAG_CHANNEL)
+	engine.on("canon", _collect_canonical_field, channel=CANONICAL_CHANNEL)
+	engine.on("source_ref", _collect_canonical_field, channel=CANONICAL_CHANNEL)
+	return engine
+
+
+def subscribe_metadata_rules(walk: SharedWalk, store: RecordStore, records_root: Path = RECORDS_ROOT) -> None:
+	"""Register the tag-usage and canonical-record checks on *walk*.
+
+	The tag registry is only read once some file is actually walked, so fully
+	cached runs never parse it.
+	"""
+	index: list[Optional[_TagIndex]] = []
+
+	def tag_context(path: Path) -> Optional[_TagIssues]:
+		if not index:
+			index.append(_build_tag_index(store.load(TAG_REGISTRY_PATH))[1])
+		return _TagIssues(index[0], path) if index[0] is not None else None
+
+	_register_rules(walk.engine)
+	walk.subscribe(TAG_CHANNEL, _iter_tag_usage_files(records_root, store), tag_context)
+	walk.subscribe(CANONICAL_CHANNEL, CANONICAL_RECORD_PATHS, lambda path: {})
+
+
+def _iter_tag_usage_files(records_root: Path, store: Optional[RecordStore] = None) -> Iterable[Path]:
+	for json_path in (store or RecordStore()).glob(records_root, "*.json"):
 		if json_path.name.endswith(".meta.json"):
 			continue
 		if json_path.name == "tag_registry.json":
 			continue
-		data = read_json(json_path)
-		walk(data, "", file_path=json_path)
+		yield json_path
+
 
+def _validate_tag_usage(records_root: Path, tag_registry: dict, store: Optional[RecordStore] = None) -> list[str]:
+	store = store or RecordStore()
+	errors, index = _build_tag_index(tag_registry)
+	if index is None:
+		return errors
+	walk = SharedWalk(store.load)
+	_register_rules(walk.engine)
+	walk.subscribe(TAG_CHANNEL, _iter_tag_usage_files(records_root, store), lambda path: _TagIssues(index, path))
+	for json_path in _iter_tag_usage_files(records_root, store):
+		errors.extend(walk.context(TAG_CHANNEL, json_path).issues)
 	return errors
 
 
-def _load_scene_bounds() -> tuple[SceneBoundsMap, list[str]]:
+def _scene_bounds_entry(scene_path: Path, scene_data: dict) -> tuple[Optional[list], list[str]]:
+	scene_id = scene_data.get("scene_id")
+	start_line = scene_data.get("start_line")
+	end_line = scene_data.get("end_line")
+	if not scene_id:
+		return None, [f"{scene_path}: missing scene_id."]
+	if not isinstance(start_line, int) or not isinstance(end_line, int):
+		return None, [f"{scene_path}: start_line/end_line must be integers to validate provenance ranges."]
+	return [scene_id, start_line, end_line], []
+
+
+def _load_scene_bounds(
+	scene_files: Optional[Iterable[Path]] = None,
+	manifest: Optional[ValidationManifest] = None,
+	store: Optional[RecordStore] = None,
+) -> tuple[SceneBoundsMap, list[str]]:
+	manifest = manifest or ValidationManifest.disabled()
+	store = store or RecordStore()
 	scene_bounds: SceneBoundsMap = {}
 	errors: list[str] = []
-	for scene_path in _iter_scene_files():
-		scene_data = read_json(scene_path)
-		scene_id = scene_data.get("scene_id")
-		start_line = scene_data.get("start_line")
-		end_line = scene_data.get("end_line")
-		if not scene_id:
-			errors.append(f"{scene_path}: missing scene_id.")
-			continue
-		if not isinstance(start_line, int) or not isinstance(end_line, int):
-			errors.append(f"{scene_path}: start_line/end_line must be integers to validate provenance ranges.")
-			continue
-		scene_bounds[scene_id] = (start_line, end_line, scene_path)
+	for scene_path in scene_files if scene_files is not None else _iter_scene_files(store):
+		unit = f"scene:{scene_path}"
+		content = manifest.file_digest(scene_path)
+		entry = manifest.lookup(unit, content)
+		if entry is None:
+			bounds, bound_errors = _scene_bounds_entry(scene_path, store.load(scene_path))
+			entry = manifest.record(unit, content, errors=bound_errors, bounds=bounds)
+		errors.extend(entry["errors"])
+		if entry["bounds"] is not None:
+			scene_id, start_line, end_line = entry["bounds"]
+			scene_bounds[scene_id] = (start_line, end_line, scene_path)
 	return scene_bounds, errors
 
 
-def _load_skill_types() -> set[str]:
+def _load_skill_types(store: Optional[RecordStore] = None) -> set[str]:
 	skill_types_path = RECORDS_ROOT / "skill_types.json"
 	if not skill_types_path.exists():
 		return set()
-	registry = read_json(skill_types_path)
+	registry = (store or RecordStore()).load(skill_types_path)
 	types = registry.get("types", [])
 	return {str(type_name) for type_name in types if isinstance(type_name, str)}
 
@@ -358,25 +447,36 @@ def _validate_canonical_record_file(
 	file_path: Path,
 	data: object,
 	scene_bounds: SceneBoundsMap,
+	fields: Optional[CanonicalFields] = None,
 ) -> list[str]:
+	"""Check each top-level entry's `canon` flag and `source_ref` ranges.
+
+	*fields* are the values a shared walk already collected for *data*; without
+	them *data* is walked here.
+	"""
+	if fields is None:
+		fields = {}
+		_register_rules(RECORD_RULES).walk(data, {CANONICAL_CHANNEL: fields})
 	errors: list[str] = []
 	if isinstance(data, dict):
-		entries = [(key, value) for key, value in data.items()]
+		entries: Iterable[tuple[object, object]] = data.items()
 	elif isinstance(data, list):
-		entries = [(f"entry[{index}]", value) for index, value in enumerate(data)]
+		entries = enumerate(data)
 	else:
 		return errors
-	for pointer, entry in entries:
+	for key, entry in entries:
 		if not isinstance(entry, dict):
 			continue
-		canon_value = entry.get("canon")
+		pointer = key if isinstance(key, str) else f"entry[{key}]"
+		entry_fields = fields.get(key, {})
+		canon_value = entry_fields.get("canon")
 		if canon_value is None:
 			errors.append(f"{file_path}: {pointer} → missing 'canon' flag (bool expected).")
 			continue
 		if not isinstance(canon_value, bool):
 			errors.append(f"{file_path}: {pointer} → 'canon' must be a boolean value.")
 			continue
-		source_ref = entry.get("source_ref")
+		source_ref = entry_fields.get("source_ref")
 		if canon_value:
 			if source_ref is None:
 				errors.append(f"{file_path}: {pointer} → canon entries must include source_ref.")
@@ -387,84 +487,281 @@ def _validate_canonical_record_file(
 	return errors
 
 
-def _validate_timeline_provenance(
+def _timeline_provenance_errors(
 	timeline_path: Path,
-	entries: object,
+	entry_index: int,
+	entry: dict,
 	scene_bounds: SceneBoundsMap,
+) -> list[str]:
+	pointer = f"entry[{entry_index}]"
+	source_ref = entry.get("source_ref")
+	if source_ref is None:
+		return [f"{timeline_path}: {pointer} → timeline entries must include source_ref."]
+	return _validate_source_ref_ranges(timeline_path, pointer, source_ref, scene_bounds)
+
+
+def _cited_scene_ids(source_ref: object) -> set[str]:
+	refs = source_ref if isinstance(source_ref, list) else [source_ref]
+	return {ref["scene_id"] for ref in refs if isinstance(ref, dict) and isinstance(ref.get("scene_id"), str)}
+
+
+def _record_scene_refs(data: object) -> set[str]:
+	"""Scene ids cited by the top-level entries of a canonical record file."""
+	entries = data.values() if isinstance(data, dict) else data if isinstance(data, list) else []
+	scene_ids: set[str] = set()
+	for entry in entries:
+		if isinstance(entry, dict):
+			scene_ids |= _cited_scene_ids(entry.get("source_ref"))
+	return scene_ids
+
+
+def _constant_deps(value: str) -> DepsFunction:
+	return lambda scene_refs: value
+
+
+def _scene_deps(scene_bounds: SceneBoundsMap, *extra: str) -> DepsFunction:
+	"""Dependency digest over the bounds of every cited scene (plus any extra input digests)."""
+
+	def deps(scene_refs: list[str]) -> str:
+		cited = [
+			[scene_id, *scene_bounds[scene_id][:2], str(scene_bounds[scene_id][2])]
+			if scene_id in scene_bounds
+			else [scene_id]
+			for scene_id in scene_refs
+		]
+		return digest_values([*extra, *cited])
+
+	return deps
+
+
+def _schema_digest(schema_path: Path, manifest: ValidationManifest, memo: dict[Path, str]) -> str:
+	"""Digest of a schema file plus every schema document it `$ref`s."""
+	if not manifest.tracking:
+		return ""
+	if schema_path not in memo:
+		unit = f"schema_refs:{schema_path}"
+		content = manifest.file_digest(schema_path)
+		entry = manifest.lookup(unit, content)
+		if entry is None:
+			registry = default_registry()
+			ref_paths = [str(registry.path_for(uri)) for uri in registry.referenced_uris(read_json(schema_path))]
+			entry = manifest.record(unit, content, errors=[], ref_paths=ref_paths)
+		memo[schema_path] = digest_values([content, *(manifest.file_digest(Path(ref)) for ref in entry["ref_paths"])])
+	return memo[schema_path]
+
+
+def _collect_schema_results(
+	tasks: Sequence[SchemaTask], jobs: int, manifest: ValidationManifest, store: RecordStore
+) -> dict[Path, list[str]]:
+	results: dict[Path, list[str]] = {}
+	pending: dict[Path, tuple[str, DepsFunction]] = {}
+	dirty_tasks: list[SchemaTask] = []
+	schema_memo: dict[Path, str] = {}
+	for data_path, schema_path in tasks:
+		content = manifest.file_digest(data_path)
+		deps = _constant_deps(_schema_digest(schema_path, manifest, schema_memo))
+		entry = manifest.lookup(f"schema:{data_path}", content, deps)
+		if entry is None:
+			pending[data_path] = (content, deps)
+			dirty_tasks.append((data_path, schema_path))
+		else:
+			results[data_path] = entry["errors"]
+	for data_path, errors in _run_schema_checks(dirty_tasks, jobs, store).items():
+		content, deps = pending[data_path]
+		results[data_path] = manifest.record(f"schema:{data_path}", content, deps, errors=errors)["errors"]
+	return results
+
+
+def _load_skill_catalog(store: RecordStore) -> tuple[set[str], dict[str, str]]:
+	skill_catalog_names = set(store.load(RECORDS_ROOT / "skills.json").keys())
+	skill_names_without_rarity = {full_name.split(" (")[0].strip(): full_name for full_name in skill_catalog_names}
+	return skill_catalog_names, skill_names_without_rarity
+
+
+def _timeline_skill_errors(
+	timeline_path: Path,
+	entry_index: int,
+	timeline_entry: dict,
+	skill_catalog: tuple[set[str], dict[str, str]],
 ) -> list[str]:
 	errors: list[str] = []
-	if not isinstance(entries, list):
-		return errors
-	for index, entry in enumerate(entries):
-		if not isinstance(entry, dict):
+	skill_catalog_names, skill_names_without_rarity = skill_catalog
+	for timeline_skill in timeline_entry.get("skills", []):
+		if timeline_skill in skill_catalog_names:
 			continue
-		pointer = f"entry[{index}]"
-		source_ref = entry.get("source_ref")
-		if source_ref is None:
-			errors.append(f"{timeline_path}: {pointer} → timeline entries must include source_ref.")
+		skill_name_without_rarity = timeline_skill.split(" (")[0].strip()
+		if skill_name_without_rarity not in skill_names_without_rarity:
+			errors.append(
+				f"{timeline_path}: entry[{entry_index}].skills → '{timeline_skill}' missing from records/skills.json"
+			)
+	return errors
+
+
+def _check_timeline(
+	timeline_path: Path,
+	store: RecordStore,
+	skill_catalog: tuple[set[str], dict[str, str]],
+	scene_bounds: SceneBoundsMap,
+) -> tuple[list[str], set[str]]:
+	"""Skill and provenance findings plus the cited scene ids, one streamed event at a time."""
+	skill_errors: list[str] = []
+	provenance_errors: list[str] = []
+	scene_ids: set[str] = set()
+	try:
+		for entry_index, _offset, timeline_entry in store.iter_array(timeline_path):
+			if not isinstance(timeline_entry, dict):
+				continue
+			skill_errors.extend(_timeline_skill_errors(timeline_path, entry_index, timeline_entry, skill_catalog))
+			provenance_errors.extend(
+				_timeline_provenance_errors(timeline_path, entry_index, timeline_entry, scene_bounds)
+			)
+			scene_ids |= _cited_scene_ids(timeline_entry.get("source_ref"))
+	except NotAJSONArrayError:
+		pass  # the timeline schema check already reports the wrong top-level type
+	except JSONStreamError as exc:
+		skill_errors.append(f"{timeline_path}: timeline is not valid JSON ({exc}).")
+	return skill_errors + provenance_errors, scene_ids
+
+
+def _validate_skill_types(data_path: Path, entry_data: object, skill_types_allowed: set[str]) -> list[str]:
+	errors: list[str] = []
+	if not skill_types_allowed or not isinstance(entry_data, dict):
+		return errors
+	for skill_name, payload in entry_data.items():
+		if not isinstance(payload, dict):
 			continue
-		errors.extend(_validate_source_ref_ranges(timeline_path, pointer, source_ref, scene_bounds))
+		skill_type = payload.get("type")
+		if isinstance(skill_type, str) and skill_type not in skill_types_allowed:
+			errors.append(f"{data_path}: {skill_name} → type '{skill_type}' missing from records/skill_types.json")
 	return errors
 
 
-def validate_all() -> int:  # noqa: C901
+def collect_validation_errors(  # noqa: C901
+	jobs: int = 1,
+	manifest: Optional[ValidationManifest] = None,
+	store: Optional[RecordStore] = None,
+	walk: Optional[SharedWalk] = None,
+) -> list[str]:
+	"""Run every check and return the findings in report order.
+
+	With a tracking *manifest*, units whose file and dependency digests are
+	unchanged reuse their recorded findings instead of being re-validated.
+	Every file is parsed at most once through *store* and walked at most once
+	through *walk*, both of which callers may share with other validators.
+	"""
+	manifest = manifest or ValidationManifest.disabled()
+	store = store or RecordStore()
+	walk = walk or SharedWalk(store.load)
+	if not walk.subscribed(TAG_CHANNEL):
+		subscribe_metadata_rules(walk, store)
 	validation_errors: list[str] = []
-	skill_types_allowed = _load_skill_types()
+	skills_path = RECORDS_ROOT / "skills.json"
+
+	with instrumentation.phase("discover"):
+		mapped_files = [
+			(data_path, schema_path) for data_path, schema_path in FILE_TO_SCHEMA_PATHS.items() if data_path.exists()
+		]
+		scene_files = list(_iter_scene_files(store))
+		timeline_files = list(_iter_timeline_files())
+		meta_files = list(_iter_meta_files(store))
+	with instrumentation.phase("schema"):
+		schema_errors = _collect_schema_results(
+			mapped_files
+			+ [(scene_path, SCENE_SCHEMA) for scene_path in scene_files]
+			+ [(timeline_path, TIMELINE_SCHEMA) for timeline_path in timeline_files]
+			+ [(metadata_path, META_SCHEMA) for metadata_path in meta_files],
+			jobs,
+			manifest,
+			store,
+		)
 
 	# Records files with direct schema mappings (skills, equipment, etc.)
-	for data_path, schema_path in FILE_TO_SCHEMA_PATHS.items():
-		if data_path.exists():
-			validation_errors.extend(_collect_schema_errors(data_path, schema_path))
+	for data_path, _ in mapped_files:
+		validation_errors.extend(schema_errors[data_path])
 
 	# Scene index entries
-	for scene_path in _iter_scene_files():
-		validation_errors.extend(_collect_schema_errors(scene_path, SCENE_SCHEMA))
+	for scene_path in scene_files:
+		validation_errors.extend(schema_errors[scene_path])
 
-	scene_bounds, scene_bound_errors = _load_scene_bounds()
+	with instrumentation.phase("scene_bounds"):
+		scene_bounds, scene_bound_errors = _load_scene_bounds(scene_files, manifest, store)
 	validation_errors.extend(scene_bound_errors)
 
 	# Character timelines and the skills they reference
-	skill_catalog_names = set(read_json(RECORDS_ROOT / "skills.json").keys())
-	skill_names_without_rarity = {full_name.split(" (")[0].strip(): full_name for full_name in skill_catalog_names}
-	for timeline_path in _iter_timeline_files():
-		validation_errors.extend(_collect_schema_errors(timeline_path, TIMELINE_SCHEMA))
-		timeline_entries = read_json(timeline_path)
-		for entry_index, timeline_entry in enumerate(timeline_entries):
-			for timeline_skill in timeline_entry.get("skills", []):
-				if timeline_skill in skill_catalog_names:
-					continue
-				skill_name_without_rarity = timeline_skill.split(" (")[0].strip()
-				if skill_name_without_rarity not in skill_names_without_rarity:
-					validation_errors.append(
-						f"{timeline_path}: entry[{entry_index}].skills → '{timeline_skill}' "
-						"missing from records/skills.json"
-					)
-		validation_errors.extend(_validate_timeline_provenance(timeline_path, timeline_entries, scene_bounds))
+	skill_catalog = None
+	with instrumentation.phase("timelines"):
+		timeline_deps = _scene_deps(scene_bounds, manifest.file_digest(skills_path))
+		for timeline_path in timeline_files:
+			validation_errors.extend(schema_errors[timeline_path])
+			unit = f"timeline:{timeline_path}"
+			content = manifest.file_digest(timeline_path)
+			entry = manifest.lookup(unit, content, timeline_deps)
+			if entry is None:
+				skill_catalog = skill_catalog or _load_skill_catalog(store)
+				errors, scene_refs = _check_timeline(timeline_path, store, skill_catalog, scene_bounds)
+				entry = manifest.record(unit, content, timeline_deps, errors=errors, scene_refs=scene_refs)
+			validation_errors.extend(entry["errors"])
 
 	# Metadata sidecar files that store provenance
-	for metadata_path in _iter_meta_files():
-		validation_errors.extend(_collect_schema_errors(metadata_path, META_SCHEMA))
+	for metadata_path in meta_files:
+		validation_errors.extend(schema_errors[metadata_path])
 
 	# Tag usage across all record files
-	tag_registry = read_json(TAG_REGISTRY_PATH)
-	validation_errors.extend(_validate_tag_usage(RECORDS_ROOT, tag_registry))
+	with instrumentation.phase("tags"):
+		registry_digest = manifest.file_digest(TAG_REGISTRY_PATH)
+		registry_entry = manifest.lookup("tag_registry", registry_digest)
+		if registry_entry is None:
+			registry_errors, index = _build_tag_index(store.load(TAG_REGISTRY_PATH))
+			registry_entry = manifest.record(
+				"tag_registry", registry_digest, errors=registry_errors, usable=index is not None
+			)
+		validation_errors.extend(registry_entry["errors"])
+		if registry_entry["usable"]:
+			tag_deps = _constant_deps(registry_digest)
+			for json_path in _iter_tag_usage_files(RECORDS_ROOT, store):
+				unit = f"tags:{json_path}"
+				content = manifest.file_digest(json_path)
+				entry = manifest.lookup(unit, content, tag_deps)
+				if entry is None:
+					errors = walk.context(TAG_CHANNEL, json_path).issues
+					entry = manifest.record(unit, content, tag_deps, errors=errors)
+				validation_errors.extend(entry["errors"])
 
 	# Canonical record provenance checks
-	for data_path in CANONICAL_RECORD_PATHS:
-		if not data_path.exists():
-			continue
-		entry_data = read_json(data_path)
-		validation_errors.extend(_validate_canonical_record_file(data_path, entry_data, scene_bounds))
-		if data_path == RECORDS_ROOT / "skills.json" and skill_types_allowed:
-			if isinstance(entry_data, dict):
-				for skill_name, payload in entry_data.items():
-					if not isinstance(payload, dict):
-						continue
-					skill_type = payload.get("type")
-					if isinstance(skill_type, str) and skill_type not in skill_types_allowed:
-						validation_errors.append(
-							f"{data_path}: {skill_name} → type '{skill_type}' missing from records/skill_types.json"
-						)
+	with instrumentation.phase("canonical"):
+		skill_types_allowed = None
+		skill_types_digest = manifest.file_digest(RECORDS_ROOT / "skill_types.json")
+		for data_path in CANONICAL_RECORD_PATHS:
+			if not data_path.exists():
+				continue
+			unit = f"canonical:{data_path}"
+			content = manifest.file_digest(data_path)
+			deps = _scene_deps(scene_bounds, skill_types_digest if data_path == skills_path else "")
+			entry = manifest.lookup(unit, content, deps)
+			if entry is None:
+				entry_data = store.load(data_path)
+				fields = walk.context(CANONICAL_CHANNEL, data_path)
+				errors = _validate_canonical_record_file(data_path, entry_data, scene_bounds, fields)
+				if data_path == skills_path:
+					if skill_types_allowed is None:
+						skill_types_allowed = _load_skill_types(store)
+					errors.extend(_validate_skill_types(data_path, entry_data, skill_types_allowed))
+				entry = manifest.record(unit, content, deps, errors=errors, scene_refs=_record_scene_refs(entry_data))
+			validation_errors.extend(entry["errors"])
+
+	return validation_errors
+
+
+def validate_all(
+	jobs: int = 1,
+	manifest: Optional[ValidationManifest] = None,
+	store: Optional[RecordStore] = None,
+	walk: Optional[SharedWalk] = None,
+) -> int:
+	validation_errors = collect_validation_errors(jobs=jobs, manifest=manifest, store=store, walk=walk)
+	if manifest is not None and manifest.tracking:
+		manifest.save()
+		print(f"♻️  Reused {manifest.reused} cached result(s); re-validated {manifest.computed}.")
 
 	if validation_errors:
 		print("\n❌ Metadata validation failed:")
@@ -478,8 +775,57 @@ def validate_all() -> int:  # noqa: C901
 
 def main(argv: list[str] | None = None) -> int:
 	parser = argparse.ArgumentParser(description=__doc__)
-	parser.parse_args(argv)
-	return validate_all()
+	parser.add_argument(
+		"--jobs",
+		"-j",
+		type=int,
+		default=1,
+		help="Validate files across N worker processes (0 = one per CPU; default: %(default)s)",
+	)
+	parser.add_argument(
+		"--since-manifest",
+		type=Path,
+		nargs="?",
+		const=MANIFEST_PATH,
+		default=None,
+		metavar="PATH",
+		help=f"Skip files unchanged since the manifest at PATH (default when flag is bare: {MANIFEST_PATH})",
+	)
+	parser.add_argument(
+		"--full",
+		action="store_true",
+		help="Ignore cached results and re-validate everything (the manifest is still rewritten).",
+	)
+	parser.add_argument(
+		"--watch",
+		action="store_true",
+		help="Stay running: re-validate changed files and serve results on localhost (see tools/validate_watch.py).",
+	)
+	parser.add_argument("--host", default="127.0.0.1", help="Watch mode: address to serve on (default: %(default)s)")
+	parser.add_argument("--port", type=int, default=8765, help="Watch mode: port to serve on (default: %(default)s)")
+	parser.add_argument(
+		"--poll",
+		action="store_true",
+		help="Watch mode: poll for changes instead of using inotify.",
+	)
+	instrumentation.add_arguments(parser)
+	args = parser.parse_args(argv)
+	jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+	if args.watch:
+		from tools.validate_watch import watch
+
+		return watch(
+			host=args.host,
+			port=args.port,
+			jobs=jobs,
+			manifest_path=args.since_manifest,
+			force_polling=args.poll,
+		)
+	with instrumentation.session("validate_all_metadata", args):
+		manifest = None
+		if args.since_manifest is not None:
+			manifest = ValidationManifest.load(args.since_manifest, reuse=not args.full)
+		return validate_all(jobs=jobs, manifest=manifest)
 
 
 if __name__ == "__main__":
@@ -6,14 +6,18 @@ from __future__ import annotations
 import argparse
 import re
 import sys
+from functools import partial
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Iterator, Optional
 
-from core.schema_utils import read_json
+from core.compiled_timeline import compiled_cache_dir, load_compiled
+from core.json_stream import JSONStreamError, NotAJSONArrayError
+from core.record_store import RecordStore
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 RECORDS_ROOT = REPO_ROOT / "records"
 EVENT_ID_PATTERN = re.compile(r"^ev\.[a-z0-9_]+\.[0-9]{2}\.[0-9]{2}\.[0-9]{2}\.[a-z0-9_]+$")
+COMPILED_VERSION = 1  # bump whenever _compile_event_ids changes
 
 
 def _iter_timeline_files(records_root: Path) -> Iterator[Path]:
@@ -38,43 +42,90 @@ def _relative(path: Path, base: Path) -> str:
 		return str(path)
 
 
-def collect_event_id_findings(records_root: Path, *, strict: bool = False) -> tuple[list[str], list[str]]:
+def _compile_event_ids(timeline_path: Path, store: RecordStore) -> list[tuple[Optional[int], str, Any]]:
+	"""Per-file outcome of the id checks as `(index, code, detail)` in file order.
+
+	`code` is "ok" (detail = the event id) or names the problem. Nothing here
+	depends on other files or on `strict`, so the result can be cached per
+	timeline; duplicates across files are found from the "ok" entries.
+	"""
+	entries: list[tuple[Optional[int], str, Any]] = []
+	try:
+		# Streamed one event at a time; only the entry list grows with the file.
+		for index, _offset, entry in store.iter_array(timeline_path):
+			if not isinstance(entry, dict):
+				entries.append((index, "not_object", None))
+				continue
+			event_id = entry.get("event_id")
+			if event_id is None:
+				entries.append((index, "missing", None))
+			elif not isinstance(event_id, str):
+				entries.append((index, "not_string", None))
+			elif not EVENT_ID_PATTERN.fullmatch(event_id):
+				entries.append((index, "pattern", event_id))
+			else:
+				entries.append((index, "ok", event_id))
+	except NotAJSONArrayError:
+		entries.append((None, "not_array", None))
+	except JSONStreamError as exc:
+		entries.append((None, "invalid_json", str(exc)))
+	return entries
+
+
+def collect_event_id_findings(
+	records_root: Path,
+	*,
+	strict: bool = False,
+	store: Optional[RecordStore] = None,
+	cache_root: Optional[Path] = None,
+	use_cache: bool = True,
+) -> tuple[list[str], list[str]]:
+	"""Check every timeline's event ids; return (errors, warnings).
+
+	Per-file results are compiled once per timeline content (and `COMPILED_VERSION`)
+	under *cache_root* (default: `.cache/compiled_timelines` next to *records_root*).
+	"""
+	store = store or RecordStore()
+	cache_root = cache_root or records_root.parent / ".cache" / "compiled_timelines"
 	errors: list[str] = []
 	warnings: list[str] = []
 	seen: dict[str, str] = {}
 
 	for timeline_path in _iter_timeline_files(records_root):
-		data = read_json(timeline_path)
 		rel_path = _relative(timeline_path, REPO_ROOT)
-
-		if not isinstance(data, list):
-			errors.append(f"{rel_path}: expected timeline JSON array")
-			continue
-
-		for index, entry in enumerate(data):
-			pointer = f"{rel_path}[{index}]"
-			if not isinstance(entry, dict):
-				errors.append(f"{pointer}: timeline entry must be an object")
-				continue
-
-			event_id = entry.get("event_id")
-			if event_id is None:
-				message = f"{pointer}: missing event_id"
+		if use_cache:
+			entries = load_compiled(
+				timeline_path,
+				compiled_cache_dir(cache_root, timeline_path),
+				name="validate_ids",
+				version=COMPILED_VERSION,
+				compile=partial(_compile_event_ids, timeline_path, store),
+			)
+		else:
+			entries = _compile_event_ids(timeline_path, store)
+
+		for index, code, detail in entries:
+			if code == "ok":
+				if detail in seen:
+					errors.append(f"{rel_path}[{index}]: duplicate event_id also seen at {seen[detail]}")
+				else:
+					seen[detail] = f"{rel_path}[{index}]"
+			elif code == "missing":
+				message = f"{rel_path}[{index}]: missing event_id"
 				if strict:
 					errors.append(message)
 				else:
 					warnings.append(message)
-				continue
-			if not isinstance(event_id, str):
-				errors.append(f"{pointer}: event_id must be a string")
-				continue
-			if not EVENT_ID_PATTERN.fullmatch(event_id):
-				errors.append(f"{pointer}: event_id '{event_id}' does not match {EVENT_ID_PATTERN.pattern}")
-				continue
-			if event_id in seen:
-				errors.append(f"{pointer}: duplicate event_id also seen at {seen[event_id]}")
-				continue
-			seen[event_id] = pointer
+			elif code == "not_object":
+				errors.append(f"{rel_path}[{index}]: timeline entry must be an object")
+			elif code == "not_string":
+				errors.append(f"{rel_path}[{index}]: event_id must be a string")
+			elif code == "pattern":
+				errors.append(f"{rel_path}[{index}]: event_id '{detail}' does not match {EVENT_ID_PATTERN.pattern}")
+			elif code == "not_array":
+				errors.append(f"{rel_path}: expected timeline JSON array")
+			else:
+				errors.append(f"{rel_path}: invalid JSON ({detail})")
 
 	return errors, warnings
 
@@ -92,12 +143,17 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 		action="store_true",
 		help="Treat missing event_id values as errors instead of warnings.",
 	)
+	parser.add_argument(
+		"--no-cache",
+		action="store_true",
+		help="Re-check every timeline instead of reusing .cache/compiled_timelines results.",
+	)
 	return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
 	args = parse_args(argv)
-	errors, warnings = collect_event_id_findings(args.records_root, strict=args.strict)
+	errors, warnings = collect_event_id_findings(args.records_root, strict=args.strict, use_cache=not args.no_cache)
 
 	for warning in warnings:
 		print(f"⚠️  {warning}")
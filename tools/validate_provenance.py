@@ -20,14 +20,19 @@ import re
 import sys
 from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
 	sys.path.insert(0, str(REPO_ROOT))
 
-from core.schema_utils import read_json  # noqa: E402  # imported after sys.path fix
+from core import instrumentation  # noqa: E402  # imported after sys.path fix
+from core.compiled_timeline import compiled_cache_dir, load_compiled  # noqa: E402
+from core.json_stream import JSONStreamError, NotAJSONArrayError  # noqa: E402  # imported after sys.path fix
+from core.record_store import RecordStore  # noqa: E402
+from core.record_walker import Pointer, RuleEngine, SharedWalk  # noqa: E402
 
 RECORDS_DIR = Path("records")
 CHARACTERS_DIR = RECORDS_DIR / "characters"
@@ -38,6 +43,9 @@ SOURCE_REF_ALLOWED_ROOTS = {
 }
 SCENE_ID_PATTERN = re.compile(r"^\d{2}\.\d{2}\.\d{2}$")
 MAX_QUOTE_LENGTH = 320
+TIMELINE_CACHE_ROOT = Path(".cache") / "compiled_timelines"
+COMPILED_VERSION = 1  # bump whenever the timeline checks below change
+INLINE_CHANNEL = "validate_provenance"
 
 
 @dataclass
@@ -121,24 +129,51 @@ def _check_source_ref_fields(
 	return errors, warnings
 
 
-def _validate_timeline_file(path: Path) -> tuple[list[Finding], list[Finding]]:
-	"""Validate a character timeline file structure and source_ref compliance."""
-	data = read_json(path)
-	errors, warnings = [], []
+def _validate_timeline_file(
+	path: Path, store: RecordStore, *, use_cache: bool = True
+) -> tuple[list[Finding], list[Finding]]:
+	"""Timeline findings, reused from `TIMELINE_CACHE_ROOT` while the file (and `COMPILED_VERSION`) is unchanged."""
+	if not use_cache:
+		return _check_timeline_file(path, store)
+	compiled = load_compiled(
+		path,
+		compiled_cache_dir(TIMELINE_CACHE_ROOT, path),
+		name="validate_provenance",
+		version=COMPILED_VERSION,
+		compile=partial(_compile_timeline_file, path, store),
+	)
+	normalized = _normalize_path(path)
+	errors = [Finding(normalized, message) for message in compiled["errors"]]
+	warnings = [Finding(normalized, message) for message in compiled["warnings"]]
+	return errors, warnings
 
-	if not isinstance(data, list):
-		errors.append(Finding(_normalize_path(path), "timeline must be a JSON array of events"))
-		return errors, warnings
 
-	for index, entry in enumerate(data):
-		if not isinstance(entry, dict):
-			errors.append(Finding(_normalize_path(path), f"event[{index}] must be an object"))
-			continue
+def _compile_timeline_file(path: Path, store: RecordStore) -> dict[str, list[str]]:
+	errors, warnings = _check_timeline_file(path, store)
+	return {"errors": [finding.message for finding in errors], "warnings": [finding.message for finding in warnings]}
+
 
-		entry_prefix = f"event[{index}]"
-		ev_errors, ev_warnings = _check_event_source_refs(entry, entry_prefix, path)
-		errors.extend(ev_errors)
-		warnings.extend(ev_warnings)
+def _check_timeline_file(path: Path, store: RecordStore) -> tuple[list[Finding], list[Finding]]:
+	"""Validate a character timeline file structure and source_ref compliance.
+
+	Events are streamed one at a time, so memory does not grow with the timeline.
+	"""
+	errors, warnings = [], []
+
+	try:
+		for index, _offset, entry in store.iter_array(path):
+			if not isinstance(entry, dict):
+				errors.append(Finding(_normalize_path(path), f"event[{index}] must be an object"))
+				continue
+
+			entry_prefix = f"event[{index}]"
+			ev_errors, ev_warnings = _check_event_source_refs(entry, entry_prefix, path)
+			errors.extend(ev_errors)
+			warnings.extend(ev_warnings)
+	except NotAJSONArrayError:
+		errors.append(Finding(_normalize_path(path), "timeline must be a JSON array of events"))
+	except JSONStreamError as exc:
+		errors.append(Finding(_normalize_path(path), f"timeline is not valid JSON ({exc})"))
 
 	return errors, warnings
 
@@ -168,8 +203,8 @@ def _check_event_source_refs(
 	return errors, warnings
 
 
-def _iter_canonical_files() -> Iterable[Path]:
-	for json_path in RECORDS_DIR.rglob("*.json"):
+def _iter_canonical_files(store: RecordStore) -> Iterable[Path]:
+	for json_path in store.glob(RECORDS_DIR, "*.json"):
 		name = json_path.name
 		if name.endswith((".meta.json", ".review.json", ".provenance.json")):
 			continue
@@ -181,37 +216,39 @@ def _iter_canonical_files() -> Iterable[Path]:
 		yield json_path
 
 
-def _discover_inline_source_refs(path: Path) -> list[str]:
-	data = read_json(path)
-	stack: list[tuple[Any, str]] = [(data, "<root>")]
-	citations: list[str] = []
+class _InlineBlocks:
+	"""Per-file locations of inline `source_ref` blocks (they belong in sidecars or timelines)."""
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		self.citations: list[str] = []
+
+
+def _record_inline_citation(value: Any, pointer: Pointer, blocks: _InlineBlocks) -> None:
+	blocks.citations.append(pointer.dotted(root="<root>"))
 
-	while stack:
-		node, location = stack.pop()
-		if isinstance(node, dict):
-			for key, value in node.items():
-				next_location = f"{location}.{key}" if location != "<root>" else key
-				if key == "source_ref":
-					citations.append(next_location)
-				stack.append((value, next_location))
-		elif isinstance(node, list):
-			for idx, item in enumerate(node):
-				stack.append((item, f"{location}[{idx}]"))
-	return citations
 
+def _register_rules(engine: RuleEngine) -> None:
+	# `source_ref` blocks are descended into so nested citations are reported too.
+	engine.on("source_ref", _record_inline_citation, descend=True, channel=INLINE_CHANNEL)
 
-def _validate_inline_source_refs() -> list[Finding]:
+
+def subscribe_inline_blocks(walk: SharedWalk, store: RecordStore) -> None:
+	"""Register the inline `source_ref` check on *walk*."""
+	_register_rules(walk.engine)
+	walk.subscribe(INLINE_CHANNEL, _iter_canonical_files(store), _InlineBlocks)
+
+
+def _validate_inline_source_refs(store: RecordStore, walk: SharedWalk) -> list[Finding]:
+	"""One finding per inline `source_ref` block in a canonical file."""
+	if not walk.subscribed(INLINE_CHANNEL):
+		subscribe_inline_blocks(walk, store)
 	findings: list[Finding] = []
-	for path in _iter_canonical_files():
-		citations = _discover_inline_source_refs(path)
-		if citations:
-			for location in citations:
-				findings.append(
-					Finding(
-						_normalize_path(path),
-						f"inline source_ref found at {location}; move to sidecar or timeline",
-					)
-				)
+	for path in _iter_canonical_files(store):
+		for location in walk.context(INLINE_CHANNEL, path).citations:
+			findings.append(
+				Finding(_normalize_path(path), f"inline source_ref found at {location}; move to sidecar or timeline")
+			)
 	return findings
 
 
@@ -222,24 +259,50 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
 		action="store_true",
 		help="Downgrade inline source_ref findings to warnings (temporary migration aid).",
 	)
+	parser.add_argument(
+		"--no-cache",
+		action="store_true",
+		help="Re-check every timeline instead of reusing .cache/compiled_timelines results.",
+	)
+	instrumentation.add_arguments(parser)
 	return parser.parse_args(argv)
 
 
-def main(argv: list[str] | None = None) -> int:
-	ns = parse_args(argv or sys.argv[1:])
+def collect_provenance_findings(
+	*,
+	allow_inline: bool = False,
+	store: Optional[RecordStore] = None,
+	use_cache: bool = True,
+	walk: Optional[SharedWalk] = None,
+) -> tuple[list[Finding], list[Finding]]:
+	"""Run every provenance check and return (errors, warnings).
+
+	Pass the suite's *walk* to reuse the document walks other validators already made.
+	"""
+	store = store or RecordStore()
+	walk = walk or SharedWalk(store.load)
 	errors: list[Finding] = []
 	warnings: list[Finding] = []
 
-	for timeline_path in _iter_timeline_files():
-		timeline_errors, timeline_warnings = _validate_timeline_file(timeline_path)
-		errors.extend(timeline_errors)
-		warnings.extend(timeline_warnings)
+	with instrumentation.phase("timelines"):
+		for timeline_path in _iter_timeline_files():
+			timeline_errors, timeline_warnings = _validate_timeline_file(timeline_path, store, use_cache=use_cache)
+			errors.extend(timeline_errors)
+			warnings.extend(timeline_warnings)
 
-	inline_findings = _validate_inline_source_refs()
-	if ns.allow_inline:
+	with instrumentation.phase("inline_source_refs"):
+		inline_findings = _validate_inline_source_refs(store, walk)
+	if allow_inline:
 		warnings.extend(inline_findings)
 	else:
 		errors.extend(inline_findings)
+	return errors, warnings
+
+
+def main(argv: list[str] | None = None) -> int:
+	ns = parse_args(argv or sys.argv[1:])
+	with instrumentation.session("validate_provenance", ns):
+		errors, warnings = collect_provenance_findings(allow_inline=ns.allow_inline, use_cache=not ns.no_cache)
 
 	for warning in warnings:
 		print(warning.render("WARN"), file=sys.stderr)
@@ -4,49 +4,94 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Iterator
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from core.schema_utils import read_json
+from core.record_store import RecordStore
+from core.record_walker import Pointer, RuleEngine, SharedWalk
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 RECORDS_ROOT = REPO_ROOT / "records"
 TAG_REGISTRY_PATH = REPO_ROOT / "tagging" / "tag_registry.json"
 SKIP_FILE_SUFFIXES = (".meta.json", ".review.json", ".provenance.json")
+TAG_CHANNEL = "validate_tags"
 
 
-def _iter_record_files(records_root: Path) -> Iterator[Path]:
-	for path in sorted(records_root.rglob("*.json")):
+def _iter_record_files(records_root: Path, store: RecordStore) -> Iterator[Path]:
+	for path in store.glob(records_root, "*.json"):
 		if any(path.name.endswith(suffix) for suffix in SKIP_FILE_SUFFIXES):
 			continue
 		yield path
 
 
-def _collect_tag_strings(data: Any) -> list[tuple[str, str]]:
-	collected: list[tuple[str, str]] = []
+class _TagUsage:
+	"""Per-file state handed to the `tags` rule: registry lookups plus findings."""
+
+	def __init__(
+		self,
+		record_file: Path,
+		by_id: dict[str, dict[str, Any]],
+		by_slug: dict[str, dict[str, Any]],
+		mode: str,
+	) -> None:
+		self.record_file = record_file
+		self.by_id = by_id
+		self.by_slug = by_slug
+		self.mode = mode
+		self.errors: list[str] = []
+		self.warnings: list[str] = []
+
+
+def _check_tags(value: Any, pointer: Pointer, usage: _TagUsage) -> None:
+	if not isinstance(value, list):
+		# Not a tag list: the walk descends to find nested `tags` keys underneath it.
+		return
+	for idx, raw_value in enumerate(value):
+		if not isinstance(raw_value, str):
+			usage.errors.append(
+				f"{usage.record_file}: {pointer.dotted()}[{idx}] contains non-string tag value {raw_value!r}"
+			)
+			continue
+		tag_value = raw_value.strip()
+		if not tag_value:
+			usage.errors.append(f"{usage.record_file}: {pointer.dotted()}[{idx}] contains empty tag string")
+			continue
+
+		reg_entry: dict[str, Any] | None = None
+		if tag_value in usage.by_id:
+			reg_entry = usage.by_id[tag_value]
+		elif tag_value in usage.by_slug:
+			reg_entry = usage.by_slug[tag_value]
+		elif tag_value.startswith("tag.") and tag_value.split(".")[-1] in usage.by_slug:
+			reg_entry = usage.by_slug[tag_value.split(".")[-1]]
+
+		if reg_entry is None:
+			usage.errors.append(f"{usage.record_file}: {pointer.dotted()}[{idx}] references unknown tag '{tag_value}'")
+			continue
+
+		if reg_entry.get("status") == "candidate":
+			message = (
+				f"{usage.record_file}: {pointer.dotted()}[{idx}] references candidate tag "
+				f"'{reg_entry.get('tag_id', tag_value)}'"
+			)
+			if usage.mode == "export":
+				usage.errors.append(message)
+			else:
+				usage.warnings.append(message)
 
-	def _walk(node: Any, pointer: str = "") -> None:
-		if isinstance(node, dict):
-			for key, value in node.items():
-				child_pointer = f"{pointer}.{key}" if pointer else key
-				if key == "tags" and isinstance(value, list):
-					for idx, item in enumerate(value):
-						collected.append((f"{child_pointer}[{idx}]", item))
-				else:
-					_walk(value, child_pointer)
-		elif isinstance(node, list):
-			for idx, item in enumerate(node):
-				child_pointer = f"{pointer}[{idx}]" if pointer else f"[{idx}]"
-				_walk(item, child_pointer)
 
-	_walk(data)
-	return collected
+def _register_rules(engine: RuleEngine) -> None:
+	engine.on("tags", _check_tags, descend=True, channel=TAG_CHANNEL)
 
 
-def _load_registry(path: Path) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+def _load_registry(
+	path: Path, store: RecordStore
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
 	by_id: dict[str, dict[str, Any]] = {}
 	by_slug: dict[str, dict[str, Any]] = {}
-	raw = read_json(path)
+	raw = store.load(path)
 	if not isinstance(raw, dict):
 		return by_id, by_slug
 
@@ -65,52 +110,41 @@ def _load_registry(path: Path) -> tuple[dict[str, dict[str, Any]], dict[str, dic
 	return by_id, by_slug
 
 
+def subscribe_tag_usage(
+	walk: SharedWalk, records_root: Path, registry_path: Path, mode: str, store: RecordStore
+) -> None:
+	"""Register this validator's `tags` checks on *walk* (a no-op when the registry is unusable)."""
+	by_id, by_slug = _load_registry(registry_path, store)
+	if by_id or by_slug:
+		factory = partial(_TagUsage, by_id=by_id, by_slug=by_slug, mode=mode)
+		_register_rules(walk.engine)
+		walk.subscribe(TAG_CHANNEL, _iter_record_files(records_root, store), factory)
+
+
 def validate_tags(
 	records_root: Path,
 	registry_path: Path,
 	mode: str = "draft",
+	*,
+	store: Optional[RecordStore] = None,
+	walk: Optional[SharedWalk] = None,
 ) -> tuple[list[str], list[str]]:
+	"""Check tag usage under *records_root*; pass the suite's *walk* to share its document walks."""
+	store = store or RecordStore()
+	walk = walk or SharedWalk(store.load)
 	errors: list[str] = []
 	warnings: list[str] = []
 
-	by_id, by_slug = _load_registry(registry_path)
-	if not by_id and not by_slug:
+	if not walk.subscribed(TAG_CHANNEL):
+		subscribe_tag_usage(walk, records_root, registry_path, mode, store)
+	if not walk.subscribed(TAG_CHANNEL):
 		errors.append(f"{registry_path}: tag registry is empty or invalid.")
 		return errors, warnings
 
-	for record_file in _iter_record_files(records_root):
-		data = read_json(record_file)
-		if data is None:
-			continue
-		collected = _collect_tag_strings(data)
-		for pointer, raw_value in collected:
-			if not isinstance(raw_value, str):
-				errors.append(f"{record_file}: {pointer} contains non-string tag value {raw_value!r}")
-				continue
-			tag_value = raw_value.strip()
-			if not tag_value:
-				errors.append(f"{record_file}: {pointer} contains empty tag string")
-				continue
-
-			reg_entry: dict[str, Any] | None = None
-			if tag_value in by_id:
-				reg_entry = by_id[tag_value]
-			elif tag_value in by_slug:
-				reg_entry = by_slug[tag_value]
-			elif tag_value.startswith("tag.") and tag_value.split(".")[-1] in by_slug:
-				reg_entry = by_slug[tag_value.split(".")[-1]]
-
-			if reg_entry is None:
-				errors.append(f"{record_file}: {pointer} references unknown tag '{tag_value}'")
-				continue
-
-			status = reg_entry.get("status")
-			if status == "candidate":
-				message = f"{record_file}: {pointer} references candidate tag '{reg_entry.get('tag_id', tag_value)}'"
-				if mode == "export":
-					errors.append(message)
-				else:
-					warnings.append(message)
+	for record_file in _iter_record_files(records_root, store):
+		usage = walk.context(TAG_CHANNEL, record_file)
+		errors.extend(usage.errors)
+		warnings.extend(usage.warnings)
 
 	return errors, warnings
 
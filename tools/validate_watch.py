@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Watch-mode daemon behind `validate_all_metadata.py --watch`.
+
+The daemon keeps compiled schema validators, a `RecordStore` of parsed
+records and an in-memory `ValidationManifest` alive between runs. When a file
+under `schemas/`, `records/` or `tagging/` changes, only the units whose
+content or dependencies changed are re-validated. The latest findings are
+served as JSON on localhost:
+
+* `GET /health` → `{"status": "ok", "generation": N}`
+* `GET /results[?path=records/skills.json]` → latest findings (optionally for one file)
+* `POST /validate[?path=...]` → re-check now (e.g. from an editor save hook), then respond
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from core.file_watcher import DEFAULT_POLL_INTERVAL, open_watcher
+from core.record_store import RecordStore
+from core.schema_registry import default_registry
+from core.schema_utils import clear_validator_cache
+from core.validation_manifest import ValidationManifest
+from tools.validate_all_metadata import RECORDS_ROOT, SCHEMA_ROOT, TAG_REGISTRY_PATH, collect_validation_errors
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEBOUNCE_SECONDS = 0.05
+WATCH_ROOTS = (SCHEMA_ROOT, RECORDS_ROOT, TAG_REGISTRY_PATH.parent)
+
+
+class ValidationDaemon:
+	"""Re-validate incrementally on demand and hold the latest result for readers."""
+
+	def __init__(self, *, manifest_path: Optional[Path] = None, jobs: int = 1) -> None:
+		self.jobs = jobs
+		self.store = RecordStore()
+		if manifest_path is not None:
+			self.manifest = ValidationManifest.load(manifest_path)
+		else:
+			self.manifest = ValidationManifest()
+		self._lock = threading.Lock()
+		self._schema_signature = _schema_signature()
+		self.result: dict[str, Any] = {"generation": 0, "ok": None, "errors": []}
+
+	def revalidate(self, changed: Optional[Iterable[Path]] = None) -> dict[str, Any]:
+		"""Re-check the tree; *changed* (when known) narrows which caches are dropped.
+
+		Unchanged files are still skipped via the manifest's mtime/size fast
+		path, so calling this with no hint is correct, just slightly slower.
+		"""
+		with self._lock:
+			changed_paths = sorted({Path(path) for path in changed}) if changed is not None else None
+			if changed_paths is None:
+				self.store.invalidate_listings()
+			else:
+				for path in changed_paths:
+					self.store.invalidate(path)
+				if changed_paths:
+					self.store.invalidate_listings()
+			schema_signature = _schema_signature()
+			if schema_signature != self._schema_signature:
+				# Referenced schema documents are cached by `$id`; drop them with the compiled validators.
+				default_registry().clear()
+				clear_validator_cache()
+				self._schema_signature = schema_signature
+
+			manifest = ValidationManifest(self.manifest.path, self.manifest.to_dict())
+			started = time.perf_counter()
+			errors = collect_validation_errors(jobs=self.jobs, manifest=manifest, store=self.store)
+			duration_ms = (time.perf_counter() - started) * 1000
+			manifest.save()
+			self.manifest = manifest
+			self.result = {
+				"generation": self.result["generation"] + 1,
+				"ok": not errors,
+				"errors": errors,
+				"changed": [str(path) for path in changed_paths or []],
+				"reused": manifest.reused,
+				"revalidated": manifest.computed,
+				"duration_ms": round(duration_ms, 2),
+			}
+			return self.result
+
+	def results(self, path: Optional[str] = None) -> dict[str, Any]:
+		result = self.result
+		if path is None:
+			return result
+		prefix = f"{Path(path)}:"
+		errors = [error for error in result["errors"] if error.startswith(prefix)]
+		return {**result, "path": path, "ok": not errors, "errors": errors}
+
+
+def _schema_signature() -> list[tuple[str, int, int]]:
+	signature = []
+	for path in sorted(SCHEMA_ROOT.rglob("*.json")):
+		stat = path.stat()
+		signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+	return signature
+
+
+def make_server(daemon: ValidationDaemon, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+	"""Build (but do not start) the localhost JSON API for *daemon*."""
+
+	class Handler(BaseHTTPRequestHandler):
+		def _respond(self, status: int, payload: dict[str, Any]) -> None:
+			body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+			self.send_response(status)
+			self.send_header("Content-Type", "application/json; charset=utf-8")
+			self.send_header("Content-Length", str(len(body)))
+			self.end_headers()
+			self.wfile.write(body)
+
+		def _path_filter(self) -> tuple[str, Optional[str]]:
+			url = urlparse(self.path)
+			return url.path, parse_qs(url.query).get("path", [None])[0]
+
+		def do_GET(self) -> None:  # noqa: N802 - http.server naming
+			route, path = self._path_filter()
+			if route == "/health":
+				self._respond(200, {"status": "ok", "generation": daemon.result["generation"]})
+			elif route == "/results":
+				self._respond(200, daemon.results(path))
+			else:
+				self._respond(404, {"error": f"unknown route {route}"})
+
+		def do_POST(self) -> None:  # noqa: N802 - http.server naming
+			route, path = self._path_filter()
+			if route != "/validate":
+				self._respond(404, {"error": f"unknown route {route}"})
+				return
+			daemon.revalidate([Path(path)] if path else None)
+			self._respond(200, daemon.results(path))
+
+		def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+			return
+
+	return ThreadingHTTPServer((host, port), Handler)
+
+
+def _summary(result: dict[str, Any]) -> str:
+	status = "✅ clean" if result["ok"] else f"❌ {len(result['errors'])} error(s)"
+	return (
+		f"[{result['generation']}] {status} — re-validated {result['revalidated']}, "
+		f"reused {result['reused']} in {result['duration_ms']} ms"
+	)
+
+
+def watch(
+	*,
+	host: str = DEFAULT_HOST,
+	port: int = DEFAULT_PORT,
+	jobs: int = 1,
+	manifest_path: Optional[Path] = None,
+	poll_interval: float = DEFAULT_POLL_INTERVAL,
+	force_polling: bool = False,
+) -> int:
+	daemon = ValidationDaemon(manifest_path=manifest_path, jobs=jobs)
+	server = make_server(daemon, host, port)
+	watcher = open_watcher(WATCH_ROOTS, poll_interval=poll_interval, force_polling=force_polling)
+	threading.Thread(target=server.serve_forever, name="validate-watch-http", daemon=True).start()
+	print(f"👀 Watching {', '.join(str(root) for root in WATCH_ROOTS)} ({type(watcher).__name__})")
+	print(f"🌐 Serving results on http://{host}:{server.server_port}/results")
+	print(_summary(daemon.revalidate()))
+	try:
+		while True:
+			changed = watcher.wait(None)
+			# Editors often write several files (or temp + rename) per save; coalesce the burst.
+			while burst := watcher.wait(DEBOUNCE_SECONDS):
+				changed |= burst
+			result = daemon.revalidate(changed)
+			print(_summary(result))
+			for error in result["errors"]:
+				print(f" - {error}")
+	except KeyboardInterrupt:
+		print("\n👋 Stopping watch mode.")
+	finally:
+		watcher.close()
+		server.shutdown()
+		server.server_close()
+	return 0